@@ -0,0 +1,159 @@
+"""Laporan waktu impor dan first paint per halaman dashboard.
+
+Dependensi berat (seaborn/matplotlib, folium, wordcloud) hanya diimpor oleh
+modul halaman di `dashboard/views/` yang membutuhkannya. Skrip ini mengukur
+penghematannya dengan proses Python baru untuk setiap pengukuran, sehingga
+tidak ada modul yang sudah termuat dari pengukuran sebelumnya:
+
+- startup: impor modul bersama yang diimpor `dashboard.py` di level atas,
+- impor halaman: impor modul halaman (beserta dependensinya) setelah startup,
+- eager: startup ditambah impor semua modul halaman, seperti sebelum
+  dashboard dipecah per halaman,
+- first paint: rerun pertama halaman dengan Streamlit AppTest di proses baru,
+  sekali dengan impor lazy dan sekali dengan semua modul halaman diimpor
+  lebih dulu (eager).
+
+    python benchmarks/imports.py --repeat 5
+
+Store dashboard yang ada (`dashboard/store/`) dipakai apa adanya; jalankan
+`python dashboard/ingest.py` lebih dulu agar waktu konversi tidak ikut terukur.
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+DASHBOARD_DIR = os.path.join(ROOT_DIR, "dashboard")
+SCRIPT_PATH = os.path.join(DASHBOARD_DIR, "dashboard.py")
+
+# Paket berat yang dilaporkan bila ikut termuat oleh modul halaman
+HEAVY_PACKAGES = ["matplotlib", "seaborn", "scipy", "folium", "branca", "jinja2", "wordcloud", "PIL"]
+
+
+def shared_modules():
+    """Modul yang diimpor `dashboard.py` di level atas (urut sesuai script)."""
+    with open(SCRIPT_PATH, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            modules.append(node.module)
+    return modules
+
+
+def _import_all(modules):
+    import importlib
+    start = time.perf_counter()
+    for module in modules:
+        importlib.import_module(module)
+    return time.perf_counter() - start
+
+
+def measure_imports(page):
+    """Waktu startup, impor halaman, dan impor semua halaman (dipanggil di proses baru)."""
+    sys.path.insert(0, DASHBOARD_DIR)
+    startup = _import_all(shared_modules())
+    import views
+    before = set(sys.modules)
+    start = time.perf_counter()
+    views.load(page)
+    page_seconds = time.perf_counter() - start
+    loaded = {name.split(".")[0] for name in set(sys.modules) - before}
+    rest = _import_all([f"views.{module}" for module in views.PAGES.values()])
+    return {"startup_seconds": startup, "page_seconds": page_seconds, "eager_seconds": startup + page_seconds + rest,
+            "heavy": [name for name in HEAVY_PACKAGES if name in loaded]}
+
+
+def measure_paint(page, eager, timeout):
+    """Waktu rerun pertama halaman `page` di proses baru (dipanggil di proses baru)."""
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, DASHBOARD_DIR)
+    at = AppTest.from_file(SCRIPT_PATH, default_timeout=timeout)
+    at.session_state["page"] = page
+    start = time.perf_counter()
+    if eager:
+        import views
+        _import_all(shared_modules() + [f"views.{module}" for module in views.PAGES.values()])
+    at.run()
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "exceptions": [str(e.value) for e in at.exception]}
+
+
+def _worker(*args):
+    command = [sys.executable, os.path.abspath(__file__), "--worker", *args]
+    output = subprocess.run(command, cwd=DASHBOARD_DIR, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def report(pages, repeat, timeout):
+    """Median setiap pengukuran per halaman dari `repeat` proses baru."""
+    rows = []
+    for page in pages:
+        print(f"  {page}", file=sys.stderr)
+        imports = [_worker("imports", page) for _ in range(repeat)]
+        lazy = [_worker("paint", page, "lazy", str(timeout)) for _ in range(repeat)]
+        eager = [_worker("paint", page, "eager", str(timeout)) for _ in range(repeat)]
+        rows.append({
+            "page": page,
+            "startup_seconds": statistics.median(r["startup_seconds"] for r in imports),
+            "page_seconds": statistics.median(r["page_seconds"] for r in imports),
+            "eager_seconds": statistics.median(r["eager_seconds"] for r in imports),
+            "heavy": imports[0]["heavy"],
+            "paint_lazy_seconds": statistics.median(r["seconds"] for r in lazy),
+            "paint_eager_seconds": statistics.median(r["seconds"] for r in eager),
+            "exceptions": lazy[0]["exceptions"] + eager[0]["exceptions"],
+        })
+    return rows
+
+
+def summarize(rows):
+    print(f"\n{'halaman':<28} {'startup':>8} {'+halaman':>9} {'eager':>8} {'hemat':>8} "
+          f"{'paint lazy':>11} {'paint eager':>12} {'hemat':>8}  dependensi berat")
+    for row in rows:
+        import_saving = row["eager_seconds"] - row["startup_seconds"] - row["page_seconds"]
+        paint_saving = row["paint_eager_seconds"] - row["paint_lazy_seconds"]
+        error = " ERROR" if row["exceptions"] else ""
+        print(f"{row['page']:<28} {row['startup_seconds']:7.2f}s {row['page_seconds']:8.2f}s "
+              f"{row['eager_seconds']:7.2f}s {import_saving:7.2f}s {row['paint_lazy_seconds']:10.2f}s "
+              f"{row['paint_eager_seconds']:11.2f}s {paint_saving:7.2f}s  {', '.join(row['heavy']) or '-'}{error}")
+    startup = statistics.median(row["startup_seconds"] for row in rows)
+    eager = statistics.median(row["eager_seconds"] for row in rows)
+    print(f"\nStartup proses Streamlit: {startup:.2f} s (eager {eager:.2f} s, hemat {eager - startup:.2f} s)")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, DASHBOARD_DIR)
+    import views
+
+    pages = list(views.PAGES)
+    parser = argparse.ArgumentParser(description="Laporan waktu impor dan first paint per halaman dashboard.")
+    parser.add_argument("--pages", nargs="+", default=pages, choices=pages)
+    parser.add_argument("--repeat", type=int, default=3, help="jumlah proses baru per pengukuran (diambil median)")
+    parser.add_argument("--timeout", type=float, default=600, help="batas waktu satu rerun (detik)")
+    parser.add_argument("--output", help="simpan hasil sebagai JSON")
+    parser.add_argument("--worker", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        kind, page, *rest = args.worker
+        if kind == "imports":
+            result = measure_imports(page)
+        else:
+            result = measure_paint(page, rest[0] == "eager", float(rest[1]))
+        print(json.dumps(result))
+        sys.exit(0)
+
+    rows = report(args.pages, args.repeat, args.timeout)
+    summarize(rows)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
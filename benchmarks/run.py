@@ -0,0 +1,268 @@
+"""Benchmark headless untuk setiap halaman dashboard.
+
+Setiap halaman dijalankan dengan Streamlit AppTest (tanpa browser) terhadap
+dataset order sintetis (lihat `synthetic.py`) untuk beberapa kombinasi
+filter sidebar. Untuk setiap kombinasi dicatat:
+
+- waktu rerun dingin (semua cache Streamlit dikosongkan) dan hangat,
+- puncak memori alokasi Python/NumPy selama rerun dingin (tracemalloc),
+- rincian waktu per elemen Streamlit (waktu sejak elemen sebelumnya).
+
+Hasil disimpan sebagai JSON di `benchmarks/results/` sehingga regresi bisa
+dibandingkan antar run:
+
+    python benchmarks/run.py --rows 100000 1000000 10000000
+    python benchmarks/run.py --rows 100000 --compare benchmarks/results/20250101-120000.json
+
+Setiap ukuran dataset dijalankan di proses terpisah dengan store Parquet
+sendiri (`benchmarks/data/<rows>/`), sehingga store dashboard tidak tersentuh.
+"""
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import synthetic
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+DASHBOARD_DIR = os.path.join(ROOT_DIR, "dashboard")
+SCRIPT_PATH = os.path.join(DASHBOARD_DIR, "dashboard.py")
+DATA_DIR = os.path.join(BENCH_DIR, "data")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+DEFAULT_ROWS = [100_000]
+PAGES = ["🚚 Pengiriman", "👤 Pelanggan", "🛍️ Produk dan Penjualan", "💳 Pembayaran", "📈 Analisis RFM"]
+SCENARIOS = ["semua data", "6 bulan terakhir", "3 kategori + credit_card", "status delivered"]
+
+# Rasio waktu terhadap baseline yang dianggap regresi
+REGRESSION_RATIO = 1.2
+
+
+class ElementProfiler:
+    """Catat waktu yang dihabiskan script sebelum setiap elemen Streamlit dikirim.
+
+    `DeltaGenerator._enqueue` dibungkus sekali; waktu sejak elemen sebelumnya
+    (atau sejak awal rerun) diatribusikan ke elemen yang baru dikirim, yaitu
+    perhitungan yang menghasilkan metrik/grafik/widget tersebut.
+    """
+
+    def __init__(self):
+        self.records = None
+        self._last = None
+        self._heading = ""
+
+    def install(self):
+        from streamlit.delta_generator import DeltaGenerator
+        original = DeltaGenerator._enqueue
+        profiler = self
+
+        def _enqueue(dg, delta_type, element_proto, *args, **kwargs):
+            if profiler.records is not None:
+                now = time.perf_counter()
+                profiler.records.append({"element": profiler.describe(delta_type, element_proto),
+                                         "seconds": now - profiler._last})
+                profiler._last = now
+            return original(dg, delta_type, element_proto, *args, **kwargs)
+
+        DeltaGenerator._enqueue = _enqueue
+
+    def describe(self, delta_type, element_proto):
+        label = getattr(element_proto, "label", "") or getattr(element_proto, "body", "")
+        label = " ".join(str(label).split())[:60]
+        if delta_type == "heading":
+            self._heading = label
+        # Elemen tanpa label (gambar grafik, peta, spinner cache) diberi judul bagian terakhir
+        return f"{delta_type}: {label}" if label else f"{delta_type} [{self._heading}]"
+
+    def start(self):
+        self.records = []
+        self._last = time.perf_counter()
+        self._heading = ""
+
+    def stop(self):
+        records, self.records = self.records, None
+        return records
+
+
+def _clear_caches():
+    import streamlit as st
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def _apply_scenario(at, scenario):
+    """Atur widget sidebar sesuai skenario; rerun di antara widget karena pilihan saling bergantung."""
+    if scenario == "6 bulan terakhir":
+        _, end = at.sidebar.slider[0].value
+        at.sidebar.slider[0].set_value((end - dt.timedelta(days=182), end)).run()
+    elif scenario == "3 kategori + credit_card":
+        at.sidebar.multiselect[0].set_value(at.sidebar.multiselect[0].options[:3]).run()
+        if "credit_card" in at.sidebar.multiselect[1].options:
+            at.sidebar.multiselect[1].set_value(["credit_card"]).run()
+    elif scenario == "status delivered":
+        at.sidebar.multiselect[2].set_value(["delivered"]).run()
+
+
+def _timed_run(at, profiler):
+    profiler.start()
+    start = time.perf_counter()
+    at.run()
+    seconds = time.perf_counter() - start
+    breakdown = profiler.stop()
+    breakdown.append({"element": "(akhir script)", "seconds": seconds - sum(r["seconds"] for r in breakdown)})
+    return seconds, breakdown
+
+
+def bench_page(page, scenario, profiler, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(SCRIPT_PATH, default_timeout=timeout)
+    at.run()
+    at.sidebar.selectbox[0].set_value(page).run()
+    _apply_scenario(at, scenario)
+
+    _clear_caches()
+    cold_seconds, cold_breakdown = _timed_run(at, profiler)
+    warm_seconds, warm_breakdown = _timed_run(at, profiler)
+
+    # Memori diukur di rerun dingin terpisah karena tracemalloc memperlambat eksekusi
+    _clear_caches()
+    tracemalloc.start()
+    at.run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "page": page,
+        "scenario": scenario,
+        "cold_seconds": cold_seconds,
+        "warm_seconds": warm_seconds,
+        "peak_memory_bytes": peak,
+        "exceptions": [str(e.value) for e in at.exception],
+        "cold_breakdown": cold_breakdown,
+        "warm_breakdown": warm_breakdown,
+    }
+
+
+def bench_dataset(rows, pages, scenarios, timeout):
+    """Jalankan semua halaman x skenario untuk satu dataset (dipanggil di proses worker)."""
+    sys.path.insert(0, DASHBOARD_DIR)
+    import config
+    import ingest
+
+    start = time.perf_counter()
+    ingest.build_store(config.BATCH_ROWS if config.STREAMING else None)
+    ingest_seconds = time.perf_counter() - start
+
+    profiler = ElementProfiler()
+    profiler.install()
+    runs = []
+    for page in pages:
+        for scenario in scenarios:
+            print(f"  {rows:,} baris | {page} | {scenario}", file=sys.stderr)
+            runs.append(bench_page(page, scenario, profiler, timeout))
+    return {"rows": rows, "execution_mode": config.EXECUTION_MODE, "ingest_seconds": ingest_seconds, "runs": runs}
+
+
+def _dataset_path(rows):
+    return os.path.join(DATA_DIR, str(rows), "main_data.csv")
+
+
+def run_worker(rows, args):
+    """Jalankan `bench_dataset` di proses baru dengan store milik dataset tersebut."""
+    path = _dataset_path(rows)
+    if not os.path.exists(path):
+        print(f"Membuat dataset sintetis {rows:,} baris...", file=sys.stderr)
+        synthetic.generate(rows, path)
+
+    env = dict(os.environ, DASHBOARD_MAIN_DATA=path, DASHBOARD_STORE_DIR=os.path.join(os.path.dirname(path), "store"),
+               DASHBOARD_EXECUTION_MODE=args.mode)
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        output = f.name
+    try:
+        command = [sys.executable, os.path.abspath(__file__), "--worker", str(rows), "--worker-output", output,
+                   "--pages", *args.pages, "--scenarios", *args.scenarios, "--timeout", str(args.timeout)]
+        subprocess.run(command, env=env, check=True)
+        with open(output) as f:
+            return json.load(f)
+    finally:
+        os.remove(output)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(result, baseline):
+    """Cetak rasio waktu terhadap baseline per (ukuran, halaman, skenario); True jika ada regresi."""
+    previous = {(d["rows"], r["page"], r["scenario"]): r for d in baseline["datasets"] for r in d["runs"]}
+    regressed = False
+    for dataset in result["datasets"]:
+        for run in dataset["runs"]:
+            old = previous.get((dataset["rows"], run["page"], run["scenario"]))
+            if old is None:
+                continue
+            for field in ["cold_seconds", "warm_seconds", "peak_memory_bytes"]:
+                ratio = run[field] / old[field] if old[field] else float("nan")
+                flag = "REGRESI" if ratio > REGRESSION_RATIO else ""
+                regressed |= bool(flag)
+                print(f"{dataset['rows']:>12,} | {run['page']} | {run['scenario']} | {field}: "
+                      f"{old[field]:.3f} -> {run[field]:.3f} ({ratio:.2f}x) {flag}")
+    return regressed
+
+
+def summarize(result):
+    for dataset in result["datasets"]:
+        print(f"\n{dataset['rows']:,} baris ({dataset['execution_mode']}), ingest {dataset['ingest_seconds']:.2f} s")
+        for run in dataset["runs"]:
+            error = " ERROR" if run["exceptions"] else ""
+            print(f"  {run['page']:<28} {run['scenario']:<26} dingin {run['cold_seconds']:7.2f} s  "
+                  f"hangat {run['warm_seconds']:7.2f} s  memori {run['peak_memory_bytes'] / 2 ** 20:8.1f} MiB{error}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark halaman dashboard dengan data sintetis.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="ukuran dataset (jumlah baris)")
+    parser.add_argument("--pages", nargs="+", default=PAGES, choices=PAGES)
+    parser.add_argument("--scenarios", nargs="+", default=SCENARIOS, choices=SCENARIOS)
+    parser.add_argument("--mode", choices=["memory", "streaming"], default="memory", help="mode eksekusi dashboard")
+    parser.add_argument("--timeout", type=float, default=3600, help="batas waktu satu rerun (detik)")
+    parser.add_argument("--output", help="file JSON hasil (default: benchmarks/results/<waktu>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="bandingkan dengan hasil benchmark sebelumnya")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with open(args.worker_output, "w") as f:
+            json.dump(bench_dataset(args.worker, args.pages, args.scenarios, args.timeout), f)
+        sys.exit(0)
+
+    result = {
+        "created": dt.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "datasets": [run_worker(rows, args) for rows in args.rows],
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{dt.datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    summarize(result)
+    print(f"\nHasil disimpan di {output}")
+    if args.compare:
+        with open(args.compare) as f:
+            sys.exit(1 if compare(result, json.load(f)) else 0)
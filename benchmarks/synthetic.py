@@ -0,0 +1,137 @@
+"""Generator data order sintetis untuk benchmark dashboard.
+
+Menghasilkan CSV dengan kolom yang sama seperti `dashboard/main_data.csv`
+(kolom yang dipakai dashboard). CSV ditulis per chunk sehingga dataset
+10 juta baris pun bisa dibuat tanpa menampung semuanya di memori.
+
+    python benchmarks/synthetic.py --rows 1000000 --output benchmarks/data/1000000/main_data.csv
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# Rata-rata jumlah baris (item) per order dan order per pelanggan
+ROWS_PER_ORDER = 1.15
+ORDERS_PER_CUSTOMER = 1.05
+
+START = np.datetime64("2016-09-04T00:00:00")
+SPAN_SECONDS = 730 * 86400
+
+CATEGORIES = [
+    "cama_mesa_banho", "beleza_saude", "esporte_lazer", "moveis_decoracao", "informatica_acessorios",
+    "utilidades_domesticas", "relogios_presentes", "telefonia", "ferramentas_jardim", "automotivo",
+    "brinquedos", "cool_stuff", "perfumaria", "bebes", "eletronicos", "papelaria", "fashion_bolsas_e_acessorios",
+    "pet_shop", "moveis_escritorio", "consoles_games", "malas_acessorios", "construcao_ferramentas_construcao",
+    "eletrodomesticos", "instrumentos_musicais", "eletroportateis", "casa_construcao", "livros_interesse_geral",
+    "alimentos", "moveis_sala", "casa_conforto",
+]
+# Kategori awal lebih sering muncul (distribusi menurun linear)
+CATEGORIES_P = np.linspace(2, 0.2, len(CATEGORIES)) / np.linspace(2, 0.2, len(CATEGORIES)).sum()
+ORDER_STATUS = ["delivered", "shipped", "canceled", "unavailable", "invoiced", "processing"]
+ORDER_STATUS_P = [0.97, 0.011, 0.006, 0.006, 0.004, 0.003]
+PAYMENT_TYPES = ["credit_card", "boleto", "voucher", "debit_card"]
+PAYMENT_TYPES_P = [0.74, 0.19, 0.05, 0.02]
+REVIEW_SCORE_P = [0.11, 0.03, 0.08, 0.19, 0.59]
+
+# Pusat kota (lat, lng, bobot) untuk lokasi pelanggan
+CITIES = np.array([
+    (-23.55, -46.63, 0.40), (-22.91, -43.17, 0.14), (-19.92, -43.94, 0.07), (-30.03, -51.23, 0.05),
+    (-25.43, -49.27, 0.05), (-15.79, -47.88, 0.05), (-12.97, -38.50, 0.04), (-8.05, -34.88, 0.04),
+    (-3.73, -38.52, 0.04), (-16.69, -49.26, 0.04), (-1.46, -48.50, 0.04), (-3.12, -60.02, 0.04),
+])
+
+REVIEW_WORDS = ("produto chegou antes prazo muito bom recomendo entrega rapida otimo qualidade "
+                "ruim atrasou nao recebi veio errado gostei excelente loja parabens bem embalado").split()
+
+
+def _hash(values, salt):
+    """Hash splitmix64 deterministik: atribut per order/pelanggan sama di chunk mana pun."""
+    x = values.astype("uint64") + np.uint64(salt * 0x9E3779B97F4A7C15 % 2 ** 64)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _uniform(values, salt):
+    return (_hash(values, salt) >> np.uint64(11)).astype("float64") / 2 ** 53
+
+
+def _ids(values, salt):
+    # ID heksadesimal 32 karakter seperti di dataset Olist (dua hash 64-bit)
+    high = pd.Series(_hash(values, salt)).map("{:016x}".format)
+    low = pd.Series(_hash(values, salt + 1000)).map("{:016x}".format)
+    return (high + low).to_numpy()
+
+
+def chunk(start, rows, total_rows, seed=0):
+    """Baris `start` s.d. `start + rows` dari dataset sintetis berukuran `total_rows`."""
+    rng = np.random.default_rng([seed, start])
+    row = np.arange(start, start + rows)
+    order = (row / ROWS_PER_ORDER).astype("int64")
+    customers = max(1, int(total_rows / ROWS_PER_ORDER / ORDERS_PER_CUSTOMER))
+    customer = (_hash(order, seed + 1) % np.uint64(customers)).astype("int64")
+
+    purchase = START + (_uniform(order, seed + 2) * SPAN_SECONDS).astype("timedelta64[s]")
+    approved = purchase + (_uniform(order, seed + 3) * 2 * 86400).astype("timedelta64[s]")
+    delivered = purchase + (2 * 86400 + _uniform(order, seed + 4) * 30 * 86400).astype("timedelta64[s]")
+    estimated = purchase.astype("datetime64[D]") + (10 + _uniform(order, seed + 5) * 25).astype("timedelta64[D]")
+
+    city = np.searchsorted(np.cumsum(CITIES[:, 2]), _uniform(customer, seed + 6) * CITIES[:, 2].sum())
+    lat = CITIES[city, 0] + (_uniform(customer, seed + 7) - 0.5) * 2
+    lng = CITIES[city, 1] + (_uniform(customer, seed + 8) - 0.5) * 2
+
+    review_score = rng.choice(np.arange(1, 6), rows, p=REVIEW_SCORE_P)
+    words = rng.choice(REVIEW_WORDS, (rows, 5))
+    messages = pd.Series([" ".join(w) for w in words], dtype="object").where(rng.random(rows) < 0.4)
+
+    df = pd.DataFrame({
+        "order_id": _ids(order, seed + 9),
+        "customer_id": _ids(order, seed + 10),
+        "order_status": np.array(ORDER_STATUS)[
+            np.searchsorted(np.cumsum(ORDER_STATUS_P), _uniform(order, seed + 11) * sum(ORDER_STATUS_P))],
+        "order_purchase_timestamp": purchase,
+        "order_approved_at": approved,
+        "order_delivered_customer_date": delivered,
+        "order_estimated_delivery_date": estimated.astype("datetime64[s]"),
+        "product_id": _ids(rng.integers(0, 30000, rows), seed + 12),
+        "seller_id": _ids(rng.integers(0, 3000, rows), seed + 13),
+        "price": rng.gamma(2, 60, rows).round(2),
+        "freight_value": rng.gamma(2, 10, rows).round(2),
+        "payment_type": rng.choice(PAYMENT_TYPES, rows, p=PAYMENT_TYPES_P),
+        "payment_value": rng.gamma(2, 80, rows).round(2),
+        "review_score": review_score,
+        "review_comment_message": messages,
+        "review_creation_date": delivered.astype("datetime64[D]").astype("datetime64[s]"),
+        "customer_unique_id": _ids(customer, seed + 14),
+        "customer_lat": lat.round(4),
+        "customer_lng": lng.round(4),
+        "product_category_name": rng.choice(CATEGORIES, rows, p=CATEGORIES_P),
+    })
+    # Sebagian kecil order belum diterima pelanggan
+    undelivered = df["order_status"] != "delivered"
+    df.loc[undelivered, "order_delivered_customer_date"] = pd.NaT
+    return df
+
+
+def generate(rows, path, seed=0, chunk_rows=500_000):
+    """Tulis dataset sintetis `rows` baris ke `path` (CSV)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    for start in range(0, rows, chunk_rows):
+        df = chunk(start, min(chunk_rows, rows - start), rows, seed)
+        df.to_csv(tmp_path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Buat data order sintetis untuk benchmark.")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate(args.rows, args.output, args.seed)
+    print(f"{args.rows:,} baris ditulis ke {args.output}")
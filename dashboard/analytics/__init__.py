@@ -0,0 +1,19 @@
+"""Library analitik dashboard: fungsi murni tanpa Streamlit.
+
+Setiap fungsi menerima cube agregat (`ingest.read_cube()`) dan/atau sumber
+baris order beserta filter sidebar (`date_range`, `selections`), lalu
+mengembalikan hasil kecil (skalar, Series, atau DataFrame) yang siap
+digambar. `dashboard.py` hanya merender hasil fungsi-fungsi ini, sehingga
+perhitungannya bisa di-memoize per fungsi, dihitung di muka, atau diprofil
+di luar Streamlit.
+
+Sumber baris order (`orders`) dapat berupa DataFrame yang sudah difilter
+atau fungsi `spec -> hasil` yang menghitung agregat `streaming.Aggregate`,
+misalnya `functools.partial(streaming.run, date_range=..., selections=...)`.
+"""
+from .customers import customer_heatmap, customer_trend, median_orders_per_customer, review_terms, review_trend
+from .delivery import (delay_histogram, delivery_heatmap, delivery_kpis, freight_late, late_by_day, late_review,
+                       review_delivery, seller_late_ranking)
+from .payments import payment_stats
+from .products import daily_orders, hourly_orders, price_histogram, product_kpis, product_sales, sales_trend
+from .segments import rfm_segments
@@ -0,0 +1,9 @@
+"""Utilitas bersama modul analytics."""
+import pandas as pd
+
+
+def aggregate(orders, spec):
+    """Hitung agregat `spec` (lihat `streaming.Aggregate`) dari sumber baris order."""
+    if isinstance(orders, pd.DataFrame):
+        return spec.compute(orders)
+    return orders(spec)
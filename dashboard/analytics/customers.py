@@ -0,0 +1,51 @@
+"""Analisis pelanggan: transaksi, sebaran lokasi, dan kepuasan berdasarkan ulasan."""
+import cube
+import geo
+import instrument
+import rollup
+import sketches
+import streaming
+import terms
+
+
+@instrument.timer
+def median_orders_per_customer(sketch_index, date_range=None, selections=None):
+    """Median jumlah order per pelanggan, dari sketch pelanggan `ingest.read_sketches()`."""
+    return sketches.customer_orders(sketch_index, date_range, selections).median()
+
+
+@instrument.timer
+def customer_trend(sketch_index, date_range=None, selections=None):
+    """Jumlah pelanggan baru (pembelian pertama di seluruh riwayat) dan lama per bulan pembelian."""
+    trend = streaming.CustomerTrend()
+    return trend.finalize(trend.counts(*sketches.customer_months(sketch_index, date_range, selections)))
+
+
+@instrument.timer
+def customer_heatmap(kpi_cube, date_range=None, selections=None, zoom=5):
+    """Titik [lat, lng, jumlah transaksi] per sel grid lokasi pelanggan."""
+    cells = cube.query(kpi_cube["geo"], date_range, selections, by="customer_cell")
+    return geo.heatmap_points(cells, lambda c: c["order_count"], zoom)
+
+
+@instrument.timer
+def review_trend(rollups, kpi_cube, date_range=None, selections=None, points=200):
+    """Rata-rata review score per periode tanggal review dan rata-rata keseluruhannya.
+
+    Tren dibaca dari piramida rollup `ingest.read_rollups()` pada resolusi
+    yang dipilih dari panjang `date_range`, diperkecil ke paling banyak
+    `points` titik; rata-rata keseluruhan dari cube. Mengembalikan (tren,
+    level, rata-rata keseluruhan).
+    """
+    level = rollup.choose_level(date_range, points)
+    sums = rollup.query(rollups, "review", level, date_range, selections)
+    trend = cube.ratio(sums["review_score_sum"], sums["review_score_count"]).dropna()
+    totals = cube.query(kpi_cube["base"], date_range, selections)
+    overall = cube.ratio(totals["review_score_sum"], totals["review_score_count"])
+    return rollup.downsample(trend, points), level, overall
+
+
+@instrument.timer
+def review_terms(term_index, date_range=None, selections=None, size=100, backend=None):
+    """`size` kata paling sering muncul di ulasan (belum diterjemahkan), dari indeks kata `ingest.read_terms()`."""
+    return terms.top_terms(term_index, date_range, selections, size, backend=backend)
@@ -0,0 +1,92 @@
+"""Analisis pengiriman: waktu pengiriman, keterlambatan, dan sebarannya."""
+import pandas as pd
+
+import binning
+import cube
+import geo
+import instrument
+import schema
+import sketches
+
+
+@instrument.timer
+def delivery_kpis(kpi_cube, sketch_index, date_range=None, selections=None, backend=None):
+    """Rata-rata waktu pengiriman, total pesanan, rata-rata nilai pesanan, dan persentase keterlambatan.
+
+    Total pesanan dihitung eksak dari sketch `ingest.read_sketches()`.
+    """
+    totals = cube.query(kpi_cube["base"], date_range, selections, backend=backend)
+    return {
+        "average_delivery_days": cube.ratio(totals["delivery_days_sum"], totals["delivery_days_count"]),
+        "total_orders": sketches.distinct_orders(sketch_index, date_range, selections),
+        "average_order_value": cube.ratio(totals["payment_value_sum"], totals["payment_value_count"]),
+        "late_percentage": cube.ratio(totals["late_count"], totals["order_count"]) * 100,
+    }
+
+
+@instrument.timer
+def delivery_heatmap(kpi_cube, date_range=None, selections=None, zoom=5):
+    """Titik [lat, lng, rata-rata durasi pengiriman] per sel grid lokasi pelanggan."""
+    cells = cube.query(kpi_cube["geo"], date_range, selections, by="customer_cell")
+    return geo.heatmap_points(cells, lambda c: cube.ratio(c["delivery_days_sum"], c["delivery_days_count"]), zoom)
+
+
+def _late_percentage(cells):
+    late = cells.rename(columns={"order_count": "total_orders", "late_count": "late_orders"})
+    late = late[["total_orders", "late_orders"]]
+    late["late_percentage"] = (late["late_orders"] / late["total_orders"]) * 100
+    return late
+
+
+@instrument.timer
+def seller_late_ranking(kpi_cube, sellers, date_range=None, selections=None, min_orders=100, top=5, backend=None):
+    """Seller dengan persentase keterlambatan tertinggi di antara seller dengan lebih dari `min_orders` order.
+
+    `sellers` adalah dimensi seller; ID seller hanya digabungkan ke baris teratas.
+    """
+    cells = cube.query(kpi_cube["seller"], date_range, selections, by="seller_key", backend=backend)
+    ranking = _late_percentage(cells).reset_index()
+    ranking = ranking[ranking["total_orders"] > min_orders]
+    ranking = ranking.sort_values("late_percentage", ascending=False).head(top)
+    return schema.label(ranking, "seller_key", sellers, ["seller_id"])
+
+
+@instrument.timer
+def delay_histogram(histograms, date_range=None, selections=None, bins=30):
+    """Histogram selisih hari antara tanggal diterima dan estimasi beserta kurva KDE-nya, sebagai (counts, edges, (x, y)).
+
+    `histograms` adalah bin halus dari `ingest.read_bins()`.
+    """
+    return binning.query(histograms, "delay_days", date_range, selections, bins)
+
+
+@instrument.timer
+def review_delivery(kpi_cube, date_range=None, selections=None, backend=None):
+    """Rata-rata durasi pengiriman (hari) per review score."""
+    cells = cube.query(kpi_cube["review"], date_range, selections, by="review_score", backend=backend)
+    return cube.ratio(cells["delivery_days_sum"], cells["delivery_days_count"])
+
+
+@instrument.timer
+def late_by_day(kpi_cube, date_range=None, selections=None, backend=None):
+    """Persentase keterlambatan per hari pesanan diterima, urut Senin-Minggu."""
+    cells = cube.query(kpi_cube["delivery_day"], date_range, selections, by="delivery_day", backend=backend)
+    late = _late_percentage(cells)
+    late = late.reset_index()
+    late["delivery_day"] = pd.Categorical(late["delivery_day"], categories=cube.DAYS_OF_WEEK, ordered=True)
+    return late.sort_values("delivery_day")
+
+
+@instrument.timer
+def late_review(kpi_cube, date_range=None, selections=None, backend=None):
+    """Rata-rata review score untuk pesanan tepat waktu dan terlambat."""
+    cells = cube.query(kpi_cube["late"], date_range, selections, by="late_delivery", backend=backend)
+    return cube.ratio(cells["review_score_sum"], cells["review_score_count"]).rename("review_score").reset_index()
+
+
+@instrument.timer
+def freight_late(kpi_cube, date_range=None, selections=None, backend=None):
+    """Persentase keterlambatan per kategori ongkos kirim (0-10, 10-20, 20-50, 50-100, 100+)."""
+    cells = cube.query(kpi_cube["freight"], date_range, selections, by="freight_category", backend=backend)
+    cells = cells.reindex(cube.FREIGHT_LABELS, fill_value=0)
+    return _late_percentage(cells).rename_axis("freight_category").reset_index()
@@ -0,0 +1,19 @@
+"""Analisis pembayaran: waktu proses, metode, dan tingkat pembatalan."""
+import cube
+import instrument
+
+
+@instrument.timer
+def payment_stats(kpi_cube, date_range=None, selections=None, backend=None):
+    """Ringkasan per metode pembayaran.
+
+    Kolom: `total_orders`, `canceled_orders`, `cancellation_rate` (%), dan
+    `payment_processing_time` (rata-rata menit dari pembelian sampai disetujui).
+    """
+    cells = cube.query(kpi_cube["base"], date_range, selections, by="payment_type", backend=backend)
+    cells.index = cells.index.astype(str)
+    stats = cells.rename(columns={"order_count": "total_orders", "canceled_count": "canceled_orders"})
+    stats = stats[["total_orders", "canceled_orders"]]
+    stats["cancellation_rate"] = (stats["canceled_orders"] / stats["total_orders"]) * 100
+    stats["payment_processing_time"] = cube.ratio(cells["payment_minutes_sum"], cells["payment_minutes_count"])
+    return stats
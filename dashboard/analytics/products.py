@@ -0,0 +1,65 @@
+"""Analisis produk dan penjualan: kategori, harga, dan pola waktu pembelian."""
+import pandas as pd
+
+import binning
+import cube
+import instrument
+import rollup
+
+
+@instrument.timer
+def product_sales(kpi_cube, date_range=None, selections=None, backend=None):
+    """Jumlah produk terjual per kategori, urut menurun (kategori tanpa penjualan dibuang)."""
+    sales = cube.query(kpi_cube["base"], date_range, selections, by="product_category_name",
+                       backend=backend)["category_count"]
+    sales = sales[sales > 0].sort_values(ascending=False)
+    sales.index = sales.index.astype(str)
+    return sales
+
+
+@instrument.timer
+def product_kpis(kpi_cube, date_range=None, selections=None, backend=None):
+    """Rata-rata harga produk dan rata-rata produk terjual per hari."""
+    totals = cube.query(kpi_cube["base"], date_range, selections, backend=backend)
+    sales_by_day = cube.query(kpi_cube["base"], date_range, selections, by="purchase_day", backend=backend)
+    return {
+        "average_price": cube.ratio(totals["price_sum"], totals["price_count"]),
+        "average_daily_sales": sales_by_day["product_count"].mean(),
+    }
+
+
+@instrument.timer
+def price_histogram(histograms, date_range=None, selections=None, bins=100):
+    """Histogram harga produk beserta kurva KDE-nya, sebagai (counts, edges, (x, y)), dari bin halus `ingest.read_bins()`."""
+    return binning.query(histograms, "price", date_range, selections, bins)
+
+
+@instrument.timer
+def hourly_orders(kpi_cube, date_range=None, selections=None, backend=None):
+    """Jumlah pesanan per jam pembelian (kolom `purchase_hour`, `order_id`)."""
+    counts = cube.query(kpi_cube["hour"], date_range, selections, by="purchase_hour",
+                        backend=backend)["order_count"]
+    return counts.rename("order_id").reset_index()
+
+
+@instrument.timer
+def daily_orders(kpi_cube, date_range=None, selections=None, backend=None):
+    """Jumlah pesanan per hari dalam seminggu, urut Senin-Minggu (kolom `purchase_day`, `order_id`)."""
+    sales_by_day = cube.query(kpi_cube["base"], date_range, selections, by="purchase_day", backend=backend)
+    purchase_day = pd.Categorical(sales_by_day.index.day_name(), categories=cube.DAYS_OF_WEEK, ordered=True)
+    counts = sales_by_day["order_count"].groupby(purchase_day, observed=False).sum()
+    return counts.rename_axis("purchase_day").rename("order_id").reset_index()
+
+
+@instrument.timer
+def sales_trend(rollups, date_range=None, selections=None, points=200):
+    """Jumlah pesanan dan pendapatan per periode pembelian, dari piramida rollup `ingest.read_rollups()`.
+
+    Resolusi dipilih dari panjang `date_range`, lalu paling banyak `points`
+    periode dipilih dengan LTTB pada deret jumlah pesanan. Mengembalikan
+    (DataFrame `order_count`, `payment_value_sum` per awal periode; level).
+    """
+    level = rollup.choose_level(date_range, points)
+    sums = rollup.query(rollups, "sales", level, date_range, selections)
+    x = sums.index.to_numpy(dtype="datetime64[ns]").view("int64")
+    return sums.iloc[rollup.lttb(x, sums["order_count"].to_numpy(), points)], level
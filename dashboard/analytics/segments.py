@@ -0,0 +1,18 @@
+"""Segmentasi pelanggan berdasarkan analisis RFM."""
+import instrument
+import rfm
+import streaming
+
+from .common import aggregate
+
+
+@instrument.timer
+def rfm_segments(orders=None, state=None):
+    """Jumlah pelanggan per segmen RFM.
+
+    `state` adalah state RFM yang sudah jadi (mis. hasil ingest untuk seluruh
+    riwayat); jika tidak diberikan, state dibangun dari `orders`.
+    """
+    if state is None:
+        state = aggregate(orders, streaming.RFMState())
+    return rfm.segment_counts(state)
@@ -0,0 +1,310 @@
+"""Backend query untuk agregasi dashboard: pandas (default), DuckDB, atau Polars.
+
+Backend dipilih lewat `DASHBOARD_BACKEND` (lihat `config.py`) dan
+menjalankan dua jenis query halaman:
+
+- `sum_cells`: penjumlahan sel tabel agregat (cube, indeks kata) yang lolos
+  filter sidebar, opsional per satu dimensi. Semua KPI berbasis cube
+  (keterlambatan per seller, kategori ongkos kirim, waktu proses pembayaran,
+  pembatalan, ...) dihitung lewat `cube.query`, yang memanggil fungsi ini.
+- `aggregate`: agregat baris mentah (`streaming.Aggregate`). DuckDB dan
+  Polars menghitung sendiri rata-rata rating (`Mean`) dan state RFM
+  (`RFMState`), dari frame hasil filter (mode memory) atau langsung dari
+  store Parquet dengan filter di-pushdown (mode streaming); agregat lain
+  dihitung dengan pandas.
+
+DuckDB dan Polars memakai semua core dan baru diimpor saat backend-nya
+dipakai. Bila paketnya tidak terpasang, dashboard kembali ke pandas.
+
+Kesamaan hasil setiap backend yang terpasang dengan pandas:
+
+    python dashboard/backends.py --verify
+"""
+import argparse
+import os
+import sys
+import warnings
+import weakref
+
+import numpy as np
+import pandas as pd
+
+import config
+import filters
+
+DATE_COLUMN = "purchase_day"
+
+
+def _as_index(frame, cells, by):
+    """Hasil group-by engine lain dalam bentuk yang sama dengan `groupby(by, observed=True)` pandas."""
+    values = frame[by]
+    if isinstance(cells[by].dtype, pd.CategoricalDtype):
+        index = pd.CategoricalIndex(values, dtype=cells[by].dtype, name=by)
+    else:
+        index = pd.Index(values.astype(cells[by].dtype), name=by)
+    return frame.drop(columns=by).set_axis(index).sort_index()
+
+
+def _date_bounds(date_range):
+    start, end = date_range
+    return pd.Timestamp(start), pd.Timestamp(end) + pd.Timedelta(days=1)
+
+
+class PandasBackend:
+    """Backend bawaan: pandas satu thread di proses Streamlit."""
+    name = "pandas"
+
+    def sum_cells(self, cells, date_range=None, selections=None, by=None, measures=None):
+        cells = filters.apply_mask(cells, filters.compile_mask(cells, date_range, selections, date_column=DATE_COLUMN))
+        if by is None:
+            return cells[measures].sum()
+        return cells.groupby(by, observed=True)[measures].sum()
+
+    def aggregate(self, spec, date_range=None, selections=None, frame=None):
+        """Agregat dari frame hasil filter (mode memory) atau per batch dari store Parquet."""
+        if frame is not None:
+            return spec.compute(frame)
+        # Impor di sini: streaming mengimpor ingest, yang mengimpor cube (pemakai modul ini)
+        import streaming
+        return streaming.run(spec, date_range, selections)
+
+
+class DuckDBBackend(PandasBackend):
+    """DuckDB: SQL multi-thread atas DataFrame (tanpa salinan) dan store Parquet."""
+    name = "duckdb"
+
+    def __init__(self):
+        import duckdb
+        self.connection = duckdb.connect()
+
+    def _where(self, date_range, selections, date_column):
+        clauses, params = [], []
+        if date_range is not None:
+            clauses.append(f"{date_column} >= ? AND {date_column} < ?")
+            params += [value.to_pydatetime() for value in _date_bounds(date_range)]
+        for column, values in (selections or {}).items():
+            if values:
+                clauses.append(f"CAST({column} AS VARCHAR) IN ({', '.join('?' * len(values))})")
+                params += [str(value) for value in values]
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _query(self, sql, params, **tables):
+        # Cursor per query: koneksi DuckDB tidak boleh dipakai bersamaan oleh beberapa thread sesi
+        cursor = self.connection.cursor()
+        try:
+            for name, table in tables.items():
+                cursor.register(name, table)
+            return cursor.execute(sql, params).df()
+        finally:
+            cursor.close()
+
+    def sum_cells(self, cells, date_range=None, selections=None, by=None, measures=None):
+        where, params = self._where(date_range, selections, DATE_COLUMN)
+        sums = ", ".join(f'COALESCE(SUM("{m}"), 0)::DOUBLE AS "{m}"' for m in measures)
+        if by is None:
+            return self._query(f"SELECT {sums} FROM cells{where}", params, cells=cells).iloc[0].astype("float64")
+        where += f"{' AND' if where else ' WHERE'} {by} IS NOT NULL"
+        frame = self._query(f"SELECT {by}, {sums} FROM cells{where} GROUP BY {by}", params, cells=cells)
+        return _as_index(frame, cells, by)
+
+    def _scan(self, select, date_range, selections, frame=None, group_by=None):
+        import ingest
+        if frame is not None:
+            # Mode memory: frame sudah difilter
+            where, params, tables = "", [], {"source": frame}
+            source = "source"
+        else:
+            where, params = self._where(date_range, selections, filters.DATE_COLUMN)
+            if date_range is not None:
+                # Partisi bulan di luar rentang dilewati tanpa dibuka
+                start, end = (pd.Timestamp(value) for value in date_range)
+                where += f" AND {filters.PARTITION_COLUMN} BETWEEN ? AND ?"
+                params += [f"{start:%Y-%m}", f"{end:%Y-%m}"]
+            tables = {}
+            # Path store sebagai parameter, bukan literal SQL (path boleh berisi tanda kutip)
+            pattern = os.path.join(ingest.store_path(ingest.ORDERS_DIR), "**", "*.parquet")
+            source = "read_parquet(?, hive_partitioning = true)"
+            params = [pattern] + params
+        sql = f"SELECT {select} FROM {source}{where}"
+        if group_by is not None:
+            sql += f"{' AND' if where else ' WHERE'} {group_by} IS NOT NULL GROUP BY {group_by}"
+        return self._query(sql, params, **tables)
+
+    def aggregate(self, spec, date_range=None, selections=None, frame=None):
+        import streaming
+        if isinstance(spec, streaming.Mean):
+            value = spec.inputs[0]
+            row = self._scan(f"SUM({value})::DOUBLE AS total, COUNT({value}) AS count",
+                             date_range, selections, frame).iloc[0]
+            return row["total"] / row["count"] if row["count"] else np.nan
+        if isinstance(spec, streaming.RFMState):
+            state = self._scan("customer_code, MAX(order_purchase_timestamp) AS last_purchase, "
+                               "COUNT(order_id) AS frequency, COALESCE(SUM(payment_value), 0)::DOUBLE AS monetary",
+                               date_range, selections, frame, group_by="customer_code")
+            return _rfm_state(state)
+        return super().aggregate(spec, date_range, selections, frame)
+
+
+class PolarsBackend(PandasBackend):
+    """Polars: lazy frame multi-thread atas tabel sel dan store Parquet."""
+    name = "polars"
+
+    def __init__(self):
+        import polars
+        self.pl = polars
+        # Tabel sel dikonversi sekali per objek DataFrame: tabel cube dan indeks kata adalah objek
+        # yang sama di setiap rerun (`loaders.load_cube`/`load_terms`, st.cache_resource), dan
+        # konversinya ikut dibuang saat versi datanya dikeluarkan dari cache
+        self._frames = {}
+
+    def _lazy(self, cells):
+        key = id(cells)
+        if key not in self._frames:
+            self._frames[key] = self.pl.from_pandas(cells).lazy()
+            weakref.finalize(cells, self._frames.pop, key, None)
+        return self._frames[key]
+
+    def _filter(self, frame, date_range, selections, date_column):
+        pl = self.pl
+        if date_range is not None:
+            start, end = _date_bounds(date_range)
+            frame = frame.filter((pl.col(date_column) >= start) & (pl.col(date_column) < end))
+        for column, values in (selections or {}).items():
+            if values:
+                frame = frame.filter(pl.col(column).cast(pl.String).is_in([str(value) for value in values]))
+        return frame
+
+    def sum_cells(self, cells, date_range=None, selections=None, by=None, measures=None):
+        pl = self.pl
+        frame = self._filter(self._lazy(cells), date_range, selections, DATE_COLUMN)
+        sums = [pl.col(m).sum().cast(pl.Float64) for m in measures]
+        if by is None:
+            return frame.select(sums).collect().to_pandas().iloc[0].astype("float64")
+        frame = frame.filter(pl.col(by).is_not_null()).group_by(by).agg(sums).collect().to_pandas()
+        if isinstance(cells[by].dtype, pd.CategoricalDtype):
+            frame[by] = frame[by].astype(str)
+        return _as_index(frame, cells, by)
+
+    def _scan(self, spec, date_range, selections, frame=None):
+        import ingest
+        if frame is not None:
+            # Mode memory: frame sudah difilter
+            return self.pl.from_pandas(frame[spec.inputs]).lazy()
+        pattern = os.path.join(ingest.store_path(ingest.ORDERS_DIR), "**", "*.parquet")
+        frame = self.pl.scan_parquet(pattern, hive_partitioning=True)
+        return self._filter(frame, date_range, selections, filters.DATE_COLUMN)
+
+    def aggregate(self, spec, date_range=None, selections=None, frame=None):
+        import streaming
+        pl = self.pl
+        if isinstance(spec, streaming.Mean):
+            value = pl.col(spec.inputs[0]).cast(pl.Float64)
+            row = self._scan(spec, date_range, selections, frame).select(
+                value.sum().alias("total"), value.count().alias("count")).collect().row(0, named=True)
+            return row["total"] / row["count"] if row["count"] else np.nan
+        if isinstance(spec, streaming.RFMState):
+            state = self._scan(spec, date_range, selections, frame).filter(
+                pl.col("customer_code").is_not_null()).group_by("customer_code").agg(
+                pl.col("order_purchase_timestamp").max().alias("last_purchase"),
+                pl.col("order_id").count().alias("frequency"),
+                pl.col("payment_value").cast(pl.Float64).sum().alias("monetary"),
+            ).collect().to_pandas()
+            return _rfm_state(state)
+        return super().aggregate(spec, date_range, selections, frame)
+
+
+def _rfm_state(frame):
+    """State RFM dengan tipe dan index yang sama seperti `rfm.build_state`."""
+    return pd.DataFrame({
+        "last_purchase": frame["last_purchase"].astype("datetime64[ns]").to_numpy(),
+        "frequency": frame["frequency"].astype("int64").to_numpy(),
+        "monetary": frame["monetary"].astype("float64").to_numpy(),
+    }, index=pd.Index(frame["customer_code"].astype("Int32"), name="customer_code"))
+
+
+BACKENDS = {
+    "pandas": PandasBackend,
+    "duckdb": DuckDBBackend,
+    "polars": PolarsBackend,
+}
+
+_current = None
+
+
+def get_backend(name):
+    return BACKENDS[name]()
+
+
+def current():
+    """Backend aktif sesuai `DASHBOARD_BACKEND`; pandas bila paket backend tidak terpasang."""
+    global _current
+    if _current is None:
+        try:
+            _current = get_backend(config.BACKEND)
+        except ImportError as error:
+            warnings.warn(f"Backend {config.BACKEND} tidak tersedia ({error}); memakai pandas.")
+            _current = PandasBackend()
+    return _current
+
+
+def page_queries(backend, date_range, selections):
+    """Hasil query halaman dashboard yang dijalankan `backend`."""
+    import analytics
+    import ingest
+    import rfm
+    import streaming
+
+    kpi_cube = ingest.read_cube()
+    sellers = ingest.read_dimension("sellers")
+    view = {"date_range": date_range, "selections": selections, "backend": backend}
+    return {
+        "delivery_kpis": analytics.delivery_kpis(kpi_cube, ingest.read_sketches(), **view),
+        "seller_late_ranking": analytics.seller_late_ranking(kpi_cube, sellers, min_orders=10, top=5, **view),
+        "review_delivery": analytics.review_delivery(kpi_cube, **view),
+        "late_by_day": analytics.late_by_day(kpi_cube, **view),
+        "late_review": analytics.late_review(kpi_cube, **view),
+        "freight_late": analytics.freight_late(kpi_cube, **view),
+        "payment_stats": analytics.payment_stats(kpi_cube, **view),
+        "product_sales": analytics.product_sales(kpi_cube, **view),
+        "product_kpis": analytics.product_kpis(kpi_cube, **view),
+        "hourly_orders": analytics.hourly_orders(kpi_cube, **view),
+        "daily_orders": analytics.daily_orders(kpi_cube, **view),
+        "top_terms": analytics.review_terms(ingest.read_terms(), size=100, **view),
+        "average_rating": backend.aggregate(streaming.Mean("review_score"), date_range, selections),
+        "rfm_segments": rfm.segment_counts(backend.aggregate(streaming.RFMState(), date_range, selections)),
+    }
+
+
+def verify(scenarios, names):
+    """Bandingkan query halaman setiap backend dengan pandas; True jika semuanya sama."""
+    import validation
+
+    ok = True
+    for name in names:
+        try:
+            backend = get_backend(name)
+        except ImportError as error:
+            print(f"[LEWAT] {name}: {error}")
+            continue
+        for scenario, (date_range, selections) in scenarios.items():
+            expected = page_queries(PandasBackend(), date_range, selections)
+            actual = page_queries(backend, date_range, selections)
+            for query in expected:
+                same = validation.same(expected[query], actual[query])
+                ok &= same
+                print(f"[{'OK' if same else 'BEDA'}] {name} | {scenario}: {query}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backend query dashboard.")
+    parser.add_argument("--verify", action="store_true", help="bandingkan hasil setiap backend dengan pandas")
+    parser.add_argument("--backends", nargs="+", default=[name for name in BACKENDS if name != "pandas"],
+                        choices=sorted(BACKENDS))
+    args = parser.parse_args()
+
+    if args.verify:
+        import ingest
+        import validation
+        ingest.ensure_store()
+        sys.exit(0 if verify(validation.scenarios(), args.backends) else 1)
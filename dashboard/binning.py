@@ -0,0 +1,140 @@
+"""Histogram berbin halus yang dihitung sekali saat ingest.
+
+Setiap kolom di `COLUMNS` dipotong menjadi bin halus selebar tetap (harga
+per 1 BRL, keterlambatan per 1 hari; bin ke-k berpusat di k * lebar). Jumlah
+nilai, nilai terkecil, dan nilai terbesar per bin disimpan per sel filter
+sidebar (hari pembelian, kategori produk, metode pembayaran, status pesanan),
+seperti cuboid di `cube.py`, sehingga bisa digabung per batch ingest dan saat
+order ditambahkan.
+
+Histogram untuk filter apa pun diperoleh dengan menjumlahkan sel yang lolos
+filter per bin halus, lalu mengelompokkan bin halus ke bin grafik dengan tepi
+yang sama seperti `np.histogram` pada nilai mentah (dari nilai terkecil dan
+terbesar). Untuk kolom bilangan bulat selebar bin halus 1 (keterlambatan)
+hasilnya persis sama; bin halus yang memotong tepi bin grafik dibagi
+proporsional. Kurva KDE dihitung dengan menghaluskan jumlah per bin halus
+(binned KDE), sehingga biayanya tidak bergantung pada jumlah baris.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+import cube
+import filters
+import instrument
+
+# Kolom -> lebar bin halus
+COLUMNS = {
+    "price": 1.0,
+    "delay_days": 1.0,
+}
+MEASURES = {"value_count": "sum", "value_min": "min", "value_max": "max"}
+
+
+def build_bins(df):
+    """Bin halus setiap kolom di `COLUMNS` per sel filter dari frame order."""
+    bins = {}
+    for column, width in COLUMNS.items():
+        values = df[column].astype("float64")
+        valid = values.notna()
+        frame = pd.DataFrame({
+            "purchase_day": df.loc[valid, "order_purchase_timestamp"].dt.normalize(),
+            "product_category_name": df.loc[valid, "product_category_name"],
+            "payment_type": df.loc[valid, "payment_type"],
+            "order_status": df.loc[valid, "order_status"],
+            "bin": np.floor(values[valid] / width + 0.5).astype("int64"),
+            "value_count": 1,
+            "value_min": values[valid],
+            "value_max": values[valid],
+        })
+        keys = cube.FILTER_DIMS + ["bin"]
+        bins[column] = frame.groupby(keys, observed=True, dropna=False, sort=False).agg(MEASURES).reset_index()
+    return bins
+
+
+def merge_bins(bins, other):
+    """Gabungkan dua kumpulan bin halus (misalnya per batch ingest)."""
+    keys = cube.FILTER_DIMS + ["bin"]
+    merged = {}
+    for column in COLUMNS:
+        cells = pd.concat([bins[column], other[column]], ignore_index=True)
+        for col in keys:
+            if isinstance(bins[column][col].dtype, pd.CategoricalDtype):
+                cells[col] = cells[col].astype("category")
+        merged[column] = cells.groupby(keys, observed=True, dropna=False, sort=False).agg(MEASURES).reset_index()
+    return merged
+
+
+def fine_bins(cells, date_range=None, selections=None):
+    """Jumlah, nilai terkecil, dan terbesar per bin halus pada filter aktif (urut bin)."""
+    instrument.add_rows(len(cells))
+    cells = filters.apply_mask(cells, filters.compile_mask(cells, date_range, selections, date_column="purchase_day"))
+    return cells.groupby("bin").agg(MEASURES)
+
+
+def histogram(fine, bins):
+    """(counts, edges) dengan tepi bin seperti `np.histogram(values, bins)` dari bin halus `fine_bins`."""
+    fine = fine[fine["value_count"] > 0]
+    if fine.empty:
+        return np.histogram(np.array([]), bins=bins)
+    edges = np.histogram_bin_edges(np.array([fine["value_min"].min(), fine["value_max"].max()]), bins)
+    counts = np.zeros(bins, dtype="float64")
+    low, high, count = (fine[col].to_numpy(dtype="float64") for col in ["value_min", "value_max", "value_count"])
+    # Posisi bin grafik; bin terakhir tertutup di kanan seperti np.histogram
+    first = np.clip(np.searchsorted(edges, low, side="right") - 1, 0, bins - 1)
+    last = np.clip(np.searchsorted(edges, high, side="right") - 1, 0, bins - 1)
+    inside = first == last
+    np.add.at(counts, first[inside], count[inside])
+    # Bin halus yang memotong tepi bin grafik dibagi sebanding panjang irisannya
+    for lo, hi, n, start, stop in zip(low[~inside], high[~inside], count[~inside], first[~inside], last[~inside]):
+        overlap = np.minimum(edges[start + 1:stop + 2], hi) - np.maximum(edges[start:stop + 1], lo)
+        counts[start:stop + 1] += n * overlap / overlap.sum()
+    return counts, edges
+
+
+def density(fine, width, edges):
+    """Kurva KDE Gaussian (bandwidth Scott) dari bin halus, berskala jumlah per bin grafik seperti `kde=True` seaborn.
+
+    Mengembalikan (x, y); kosong bila tidak ada nilai atau semua nilai sama.
+    """
+    fine = fine[fine["value_count"] > 0]
+    count = fine["value_count"].to_numpy(dtype="float64")
+    total = count.sum()
+    if total < 2:
+        return np.array([]), np.array([])
+    # Jumlah per bin halus pada grid rapat dari bin terkecil sampai terbesar
+    positions = fine.index.to_numpy(dtype="int64")
+    grid = np.zeros(positions.max() - positions.min() + 1)
+    grid[positions - positions.min()] = count
+    centers = (positions.min() + np.arange(grid.size)) * width
+    mean = np.average(centers, weights=grid)
+    std = np.sqrt(np.average((centers - mean) ** 2, weights=grid))
+    if std == 0:
+        return np.array([]), np.array([])
+    bandwidth = std * total ** (-1 / 5)
+    # Konvolusi dengan kernel Gaussian (dalam satuan bin halus), diperpanjang 3 bandwidth di kedua sisi
+    sigma = bandwidth / width
+    reach = int(np.ceil(3 * sigma))
+    kernel = np.exp(-0.5 * (np.arange(-reach, reach + 1) / sigma) ** 2)
+    smoothed = np.convolve(np.pad(grid, reach), kernel / kernel.sum(), mode="same")
+    x = (positions.min() - reach + np.arange(smoothed.size)) * width
+    return x, smoothed * (edges[1] - edges[0]) / width
+
+
+def query(bins, column, date_range=None, selections=None, size=30):
+    """Histogram `size` bin dan kurva KDE kolom `column` pada filter aktif: (counts, edges, (x, y))."""
+    fine = fine_bins(bins[column], date_range, selections)
+    counts, edges = histogram(fine, size)
+    return counts, edges, density(fine, COLUMNS[column], edges)
+
+
+def write_bins(bins, directory):
+    os.makedirs(directory, exist_ok=True)
+    for column, cells in bins.items():
+        cells.to_parquet(os.path.join(directory, f"{column}.parquet"), engine="pyarrow", index=False)
+
+
+def read_bins(directory):
+    return {column: pd.read_parquet(os.path.join(directory, f"{column}.parquet"), engine="pyarrow")
+            for column in COLUMNS}
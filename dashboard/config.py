@@ -0,0 +1,51 @@
+"""Konfigurasi dashboard, dibaca dari environment variable.
+
+DASHBOARD_EXECUTION_MODE
+    "memory" (default): data hasil filter dimuat sebagai satu DataFrame.
+    "streaming": agregat dihitung per batch dari store Parquet sehingga
+    pemakaian memori tetap terbatas untuk riwayat yang lebih besar dari RAM.
+DASHBOARD_BATCH_ROWS
+    Jumlah baris per batch pada mode streaming dan saat ingest bertahap.
+DASHBOARD_FIGURE_CACHE_MB
+    Batas memori cache gambar grafik yang dipakai bersama antar sesi.
+DASHBOARD_ROW_INDEX_CACHE_MB
+    Batas memori seluruh cache indeks baris hasil filter sidebar pada mode
+    memory: kode kategori, bitmap filter, dan posisi baris (default 32,
+    lihat `rowindex.py`).
+DASHBOARD_ASYNC_RENDER
+    "1" untuk render progresif: KPI tampil dulu, grafik dan peta dirender di
+    thread pool lalu menyusul (lihat `progressive.py`). Default "0".
+DASHBOARD_RENDER_WORKERS
+    Jumlah thread render pada mode render progresif (default 4).
+DASHBOARD_TREND_POINTS
+    Anggaran titik grafik tren (default 200); resolusi hari/minggu/bulan dan
+    downsampling dipilih agar titik yang digambar tidak melebihi angka ini
+    (lihat `rollup.py`).
+DASHBOARD_BACKEND
+    Engine query agregasi halaman (lihat `backends.py`): "pandas" (default),
+    "duckdb", atau "polars". Bila paketnya tidak terpasang dipakai pandas.
+DASHBOARD_PROFILE
+    Instrumentasi hot path (lihat `instrument.py`): kosong (default) berarti
+    mati, atau kombinasi "log", "prometheus", "overlay" dipisah koma.
+DASHBOARD_PROFILE_LOG
+    File tujuan log JSON instrumentasi (default: stderr).
+DASHBOARD_PROFILE_PROMETHEUS
+    File tujuan metrik Prometheus (default: dashboard/metrics.prom).
+DASHBOARD_MAIN_DATA, DASHBOARD_STORE_DIR
+    Lokasi main_data.csv dan store Parquet (dibaca di `ingest.py`).
+"""
+import os
+
+EXECUTION_MODE = os.environ.get("DASHBOARD_EXECUTION_MODE", "memory")
+STREAMING = EXECUTION_MODE == "streaming"
+BATCH_ROWS = int(os.environ.get("DASHBOARD_BATCH_ROWS", 1_000_000))
+FIGURE_CACHE_BYTES = int(float(os.environ.get("DASHBOARD_FIGURE_CACHE_MB", 64)) * 1024 * 1024)
+ROW_INDEX_CACHE_BYTES = int(float(os.environ.get("DASHBOARD_ROW_INDEX_CACHE_MB", 32)) * 1024 * 1024)
+ASYNC_RENDER = os.environ.get("DASHBOARD_ASYNC_RENDER", "0") == "1"
+RENDER_WORKERS = int(os.environ.get("DASHBOARD_RENDER_WORKERS", 4))
+TREND_POINTS = int(os.environ.get("DASHBOARD_TREND_POINTS", 200))
+BACKEND = os.environ.get("DASHBOARD_BACKEND", "pandas")
+PROFILE_SINKS = {sink.strip() for sink in os.environ.get("DASHBOARD_PROFILE", "").split(",") if sink.strip()}
+PROFILE_LOG = os.environ.get("DASHBOARD_PROFILE_LOG")
+PROFILE_PROMETHEUS = os.environ.get("DASHBOARD_PROFILE_PROMETHEUS",
+                                    os.path.join(os.path.dirname(os.path.abspath(__file__)), "metrics.prom"))
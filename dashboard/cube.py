@@ -0,0 +1,177 @@
+"""Cube agregat untuk KPI pengiriman, pembayaran, dan produk.
+
+Cube dibangun sekali saat ingest dan disimpan di `store/cube/`. Setiap
+cuboid dikelompokkan menurut dimensi filter sidebar (hari pembelian,
+kategori produk, metode pembayaran, status pesanan) ditambah satu dimensi
+milik grafik tertentu (seller, review score, kategori ongkos kirim, sel
+grid lokasi pelanggan, ...).
+Semua measure bersifat aditif (jumlah baris, jumlah terlambat, total hari
+pengiriman, total nilai pembayaran, ...), sehingga jawaban untuk kombinasi
+filter apa pun cukup diperoleh dengan menjumlahkan sel cube yang lolos filter.
+"""
+import os
+
+import pandas as pd
+
+import backends
+import geo
+import instrument
+
+FILTER_DIMS = ["purchase_day", "product_category_name", "payment_type", "order_status"]
+
+# Nama cuboid -> dimensi tambahan di luar dimensi filter
+CUBOIDS = {
+    "base": [],
+    "seller": ["seller_key"],
+    "review": ["review_score"],
+    "late": ["late_delivery"],
+    "delivery_day": ["delivery_day"],
+    "freight": ["freight_category"],
+    "hour": ["purchase_hour"],
+    "geo": ["customer_cell"],
+}
+
+# Kolom store yang dibaca cube (termasuk kolom turunan dari ingest.derive_columns)
+SOURCE_COLUMNS = [
+    "order_id",
+    "order_purchase_timestamp",
+    "delivery_duration",
+    "late_delivery",
+    "delivery_day",
+    "freight_category",
+    "payment_processing_time",
+    "product_key",
+    "product_category_name",
+    "payment_type",
+    "order_status",
+    "seller_key",
+    "review_score",
+    "price",
+    "payment_value",
+    "customer_lat",
+    "customer_lng",
+]
+
+DAYS_OF_WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+FREIGHT_BINS = [0, 10, 20, 50, 100, 500]
+FREIGHT_LABELS = ["0-10", "10-20", "20-50", "50-100", "100+"]
+
+MEASURES = [
+    "order_count",
+    "product_count",
+    "category_count",
+    "late_count",
+    "canceled_count",
+    "delivery_days_sum",
+    "delivery_days_count",
+    "review_score_sum",
+    "review_score_count",
+    "payment_value_sum",
+    "payment_value_count",
+    "price_sum",
+    "price_count",
+    "payment_minutes_sum",
+    "payment_minutes_count",
+]
+
+
+def _measures(df):
+    delivery_days = df["delivery_duration"].astype("float64")
+    payment_minutes = df["payment_processing_time"].astype("float64")
+
+    # Nilai per baris; rata-rata ditulis ulang sebagai pasangan *_sum / *_count
+    measures = pd.DataFrame({
+        "order_count": df["order_id"].notna(),
+        "product_count": df["product_key"].notna(),
+        "category_count": df["product_category_name"].notna(),
+        "late_count": df["late_delivery"],
+        "canceled_count": df["order_status"] == "canceled",
+        "delivery_days_sum": delivery_days.fillna(0),
+        "delivery_days_count": delivery_days.notna(),
+        "review_score_sum": df["review_score"].astype("float64").fillna(0),
+        "review_score_count": df["review_score"].notna(),
+        "payment_value_sum": df["payment_value"].astype("float64").fillna(0),
+        "payment_value_count": df["payment_value"].notna(),
+        "price_sum": df["price"].astype("float64").fillna(0),
+        "price_count": df["price"].notna(),
+        "payment_minutes_sum": payment_minutes.fillna(0),
+        "payment_minutes_count": payment_minutes.notna(),
+    }, index=df.index)
+    return measures[MEASURES].astype("float64")
+
+
+def _dimensions(df):
+    return pd.DataFrame({
+        "purchase_day": df["order_purchase_timestamp"].dt.normalize(),
+        "product_category_name": df["product_category_name"],
+        "payment_type": df["payment_type"],
+        "order_status": df["order_status"],
+        "seller_key": df["seller_key"],
+        "review_score": df["review_score"],
+        "late_delivery": df["late_delivery"],
+        "delivery_day": df["delivery_day"],
+        "freight_category": df["freight_category"],
+        "purchase_hour": df["order_purchase_timestamp"].dt.hour,
+        "customer_cell": geo.cell_ids(df["customer_lat"], df["customer_lng"]),
+    }, index=df.index)
+
+
+def build_cube(df):
+    """Bangun semua cuboid dari frame order (setelah `ingest.derive_columns`)."""
+    measures = _measures(df)
+    dims = _dimensions(df)
+    cube = {}
+    for name, extra in CUBOIDS.items():
+        keys = FILTER_DIMS + extra
+        frame = pd.concat([dims[keys], measures], axis=1)
+        # Baris dengan nilai filter kosong (NaN) tetap dihitung dalam total
+        cells = frame.groupby(keys, observed=True, dropna=False, sort=False)[MEASURES].sum().reset_index()
+        if extra:
+            cells = cells.dropna(subset=extra)
+        cube[name] = cells.reset_index(drop=True)
+    return cube
+
+
+def merge_cubes(cube, other):
+    """Gabungkan dua cube (misalnya cube lama dan cube dari order baru) dengan menjumlahkan sel yang sama."""
+    merged = {}
+    for name, extra in CUBOIDS.items():
+        keys = FILTER_DIMS + extra
+        cells = pd.concat([cube[name], other[name]], ignore_index=True)
+        for col in keys:
+            if isinstance(cube[name][col].dtype, pd.CategoricalDtype):
+                cells[col] = cells[col].astype("category")
+        merged[name] = cells.groupby(keys, observed=True, dropna=False, sort=False)[MEASURES].sum().reset_index()
+    return merged
+
+
+def write_cube(cube, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, cells in cube.items():
+        cells.to_parquet(os.path.join(directory, f"{name}.parquet"), engine="pyarrow", index=False)
+
+
+def read_cube(directory):
+    return {name: pd.read_parquet(os.path.join(directory, f"{name}.parquet"), engine="pyarrow")
+            for name in CUBOIDS}
+
+
+def query(cells, date_range=None, selections=None, by=None, measures=MEASURES, backend=None):
+    """Jumlahkan measure pada sel cube yang lolos filter sidebar.
+
+    Tanpa `by` hasilnya satu Series total; dengan `by` hasilnya DataFrame per
+    nilai dimensi `by`. Tabel sel lain dengan dimensi filter yang sama
+    (misalnya indeks kata di `terms.py`) dapat dijumlahkan dengan `measures`-nya sendiri.
+    Query dijalankan `backend` (pandas, DuckDB, atau Polars; lihat `backends.py`),
+    atau backend aktif bila None.
+    """
+    instrument.add_rows(len(cells))
+    backend = backend or backends.current()
+    return backend.sum_cells(cells, date_range, selections, by=by, measures=measures)
+
+
+def ratio(numerator, denominator):
+    """Rata-rata dari dua measure aditif; NaN jika penyebutnya nol, seperti mean pada data kosong."""
+    if isinstance(denominator, pd.Series):
+        return numerator / denominator.where(denominator != 0)
+    return numerator / denominator if denominator else float("nan")
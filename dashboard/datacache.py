@@ -0,0 +1,84 @@
+"""Cache tabel order yang dipakai bersama oleh semua proses dashboard di satu host.
+
+Tabel order dari store Parquet ditulis sekali per versi data (lihat
+`ingest.data_version`) sebagai file Arrow IPC (Feather v2) tanpa kompresi,
+diurutkan menurut waktu pembelian, di `mapped/orders-<versi>.arrow`. Setiap
+proses Streamlit membuka file itu dengan memory map: isi file hanya ada satu
+kali di page cache sistem operasi, berapa pun jumlah proses worker-nya, dan
+rentang tanggal cukup diambil sebagai potongan (slice) tanpa menyalin data.
+
+File versi baru ditulis ke file sementara lalu dipasang dengan `os.replace`,
+sehingga pembaca tidak pernah melihat file setengah jadi. Pembaca yang masih
+memegang versi lama tetap bisa membacanya sampai berpindah ke versi baru.
+"""
+import os
+
+import numpy as np
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+
+import filters
+import ingest
+
+MAPPED_DIR = os.path.join(os.path.dirname(os.path.abspath(ingest.STORE_DIR)), "mapped")
+
+
+def mapped_path(data_version):
+    return os.path.join(MAPPED_DIR, f"orders-{data_version}.arrow")
+
+
+def publish(data_version):
+    """Tulis file Arrow untuk versi data ini jika belum ada; mengembalikan path-nya."""
+    path = mapped_path(data_version)
+    if os.path.exists(path):
+        return path
+    os.makedirs(MAPPED_DIR, exist_ok=True)
+    orders_dir = ingest.store_path(ingest.ORDERS_DIR, data_version)
+    table = ds.dataset(orders_dir, format="parquet", partitioning="hive").to_table()
+    # Satu dictionary per kolom kategori dan satu chunk per kolom, urut waktu pembelian (NaT di awal)
+    table = table.sort_by([(filters.DATE_COLUMN, "ascending")], null_placement="at_start")
+    table = table.unify_dictionaries().combine_chunks()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    _remove_stale(data_version)
+    return path
+
+
+def _remove_stale(data_version):
+    """Hapus file versi lama (pada Windows file yang masih dibuka proses lain dilewati)."""
+    current = os.path.basename(mapped_path(data_version))
+    for name in os.listdir(MAPPED_DIR):
+        if name != current and name.startswith("orders-") and name.endswith(".arrow"):
+            try:
+                os.remove(os.path.join(MAPPED_DIR, name))
+            except OSError:
+                pass
+
+
+class MappedOrders:
+    """Tabel order memory-mapped untuk satu versi data."""
+
+    def __init__(self, path):
+        self.table = feather.read_table(path, memory_map=True)
+        timestamps = self.table[filters.DATE_COLUMN].to_numpy()
+        self._timestamps = timestamps.astype("datetime64[ns]").view("int64")
+
+    @classmethod
+    def open(cls, data_version):
+        return cls(publish(data_version))
+
+    def bounds(self, date_range=None):
+        """Potongan baris [awal, akhir) untuk rentang tanggal, lewat pencarian biner pada tabel terurut."""
+        if date_range is None:
+            return 0, self.table.num_rows
+        start, stop = np.searchsorted(self._timestamps, filters.date_bounds_ns(date_range))
+        return int(start), int(stop)
+
+    def read(self, columns=None, date_range=None):
+        """Seperti `ingest.read_orders` dengan filter rentang tanggal."""
+        start, stop = self.bounds(date_range)
+        table = self.table.slice(start, stop - start)
+        if columns is not None:
+            table = table.select(list(columns))
+        return table.to_pandas()
@@ -0,0 +1,80 @@
+"""Cache gambar grafik (PNG/SVG) yang dipakai bersama antar sesi.
+
+Setiap grafik diberi kunci dari (id grafik, status filter, versi data).
+Gambar matplotlib/seaborn hanya dirender ketika kuncinya belum ada di cache;
+hasil render disimpan sebagai bytes dengan eviksi LRU dan batas total
+memori. Figure dibuat lewat API objek (tidak terdaftar di `pyplot`) sehingga
+langsung dibebaskan setelah dirender dan tidak menumpuk di memori proses
+Streamlit. matplotlib baru diimpor saat grafik pertama dibuat.
+"""
+import collections
+import hashlib
+import io
+import threading
+
+# Opsi savefig yang sama dengan st.pyplot
+SAVEFIG_OPTIONS = {"bbox_inches": "tight", "dpi": 200}
+
+
+def figure_key(chart_id, filter_state, data_version, image_format="png"):
+    """Kunci konten untuk satu grafik pada satu status filter dan versi data."""
+    return hashlib.sha1(repr((chart_id, filter_state, data_version, image_format)).encode("utf-8")).hexdigest()
+
+
+def subplots(**kwargs):
+    """Seperti `plt.subplots`, tetapi lewat API objek sehingga aman dipanggil dari thread render."""
+    from matplotlib.figure import Figure
+
+    fig = Figure(**kwargs)
+    return fig, fig.subplots()
+
+
+def render(fig, image_format="png"):
+    """Render figure ke bytes."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=image_format, **SAVEFIG_OPTIONS)
+    return buffer.getvalue()
+
+
+class FigureCache:
+    """Cache LRU berisi bytes gambar dengan batas total ukuran `max_bytes`."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = self.misses = 0
+        self._images = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._images.move_to_end(key)
+            return image
+
+    def put(self, key, image):
+        with self._lock:
+            if key in self._images:
+                self.size -= len(self._images.pop(key))
+            if len(image) > self.max_bytes:
+                return
+            self._images[key] = image
+            self.size += len(image)
+            while self.size > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self.size -= len(evicted)
+
+    def get_or_render(self, key, draw, image_format="png"):
+        """Gambar dari cache, atau panggil `draw()` (mengembalikan Figure) lalu simpan hasil rendernya."""
+        image = self.get(key)
+        if image is None:
+            image = render(draw(), image_format)
+            self.put(key, image)
+        return image
+
+    def __len__(self):
+        return len(self._images)
@@ -0,0 +1,101 @@
+"""Mesin filter sidebar.
+
+Semua pilihan filter (rentang tanggal, kategori produk, metode pembayaran,
+status pesanan) dikompilasi menjadi satu predikat vectorised:
+
+- rentang tanggal dibandingkan sebagai int64 nanodetik, bukan lewat `.dt.date`
+  yang membuat objek `date` Python untuk setiap baris;
+- multiselect dibandingkan lewat lookup table pada kode kategori;
+- rentang tanggal dan pilihan kategori juga bisa di-pushdown ke pembaca
+  Parquet (`arrow_filters`) sehingga baris di luar filter tidak pernah dibaca.
+
+Hasil akhirnya adalah satu mask boolean yang diterapkan sekali, tanpa
+`order.copy()` untuk filter yang kosong.
+"""
+import numpy as np
+import pandas as pd
+
+DATE_COLUMN = "order_purchase_timestamp"
+PARTITION_COLUMN = "purchase_month"
+
+
+def date_bounds_ns(date_range):
+    """Batas [awal hari pertama, awal hari setelah hari terakhir) dalam int64 nanodetik."""
+    start, end = date_range
+    return pd.Timestamp(start).value, (pd.Timestamp(end) + pd.Timedelta(days=1)).value
+
+
+def arrow_filters(date_range=None, selections=None):
+    """Predikat pushdown dalam format `filters` pyarrow, atau None jika tidak ada filter."""
+    predicates = []
+    if date_range is not None:
+        start, end = (pd.Timestamp(value) for value in date_range)
+        # Partisi bulan di luar rentang dilewati tanpa dibuka
+        predicates += [
+            (PARTITION_COLUMN, ">=", f"{start:%Y-%m}"),
+            (PARTITION_COLUMN, "<=", f"{end:%Y-%m}"),
+            (DATE_COLUMN, ">=", start),
+            (DATE_COLUMN, "<", end + pd.Timedelta(days=1)),
+        ]
+    for column, values in (selections or {}).items():
+        if values:
+            predicates.append((column, "in", list(values)))
+    return predicates or None
+
+
+def _category_mask(series, values):
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.isin(values).to_numpy()
+    # Lookup table per kode kategori; slot 0 untuk kode -1 (NaN)
+    positions = series.cat.categories.get_indexer(list(values))
+    lookup = np.zeros(len(series.cat.categories) + 1, dtype=bool)
+    lookup[positions[positions >= 0] + 1] = True
+    return lookup[series.cat.codes.to_numpy() + 1]
+
+
+def _and(mask, other):
+    return other if mask is None else mask & other
+
+
+def compile_mask(df, date_range=None, selections=None, mask=None, date_column=DATE_COLUMN):
+    """Gabungkan filter aktif menjadi satu mask boolean.
+
+    `mask` yang sudah ada di-AND dengan filter baru. None berarti semua baris
+    lolos, sehingga filter tanpa pilihan tidak memakan biaya apa pun.
+    """
+    if date_range is not None:
+        start, end = date_bounds_ns(date_range)
+        ts = df[date_column].to_numpy(dtype="datetime64[ns]").view("int64")
+        mask = _and(mask, (ts >= start) & (ts < end))
+    for column, values in (selections or {}).items():
+        if values:
+            mask = _and(mask, _category_mask(df[column], values))
+    return mask
+
+
+def available_options(series, mask=None):
+    """Nilai kategori yang masih muncul pada baris yang lolos mask (boolean atau posisi baris)."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        values = series if mask is None else series.iloc[mask]
+        return list(values.dropna().unique())
+    codes = series.cat.codes.to_numpy()
+    if mask is not None:
+        codes = codes[mask]
+    present = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories)) > 0
+    return list(series.cat.categories[present])
+
+
+def apply_mask(df, mask):
+    """Terapkan mask sekali; tanpa mask frame dikembalikan apa adanya (tanpa salinan).
+
+    Selain mask boolean, `mask` boleh berupa posisi baris terurut (lihat `rowindex.py`).
+    """
+    if mask is None:
+        return df
+    if mask.dtype == bool:
+        if mask.all():
+            return df
+        mask = np.flatnonzero(mask)
+    elif len(mask) == len(df):
+        return df
+    return df.take(mask)
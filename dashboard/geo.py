@@ -0,0 +1,78 @@
+"""Binning spasial untuk HeatMap folium.
+
+Koordinat pelanggan dipetakan ke grid quadtree di atas proyeksi Web
+Mercator (proyeksi yang dipakai folium). Pada level `L` dunia dibagi menjadi
+2^L x 2^L sel; sel induk di level `L - k` diperoleh dengan menggeser indeks
+sebanyak `k` bit. Sel di level `BASE_LEVEL` disimpan di cuboid `geo` pada
+cube agregat (lihat `cube.py`), sehingga untuk setiap kombinasi filter
+HeatMap cukup menerima titik pusat sel yang berbobot, bukan semua titik
+pelanggan. Resolusi grid mengikuti level zoom peta dan jumlah titik dibatasi
+`MAX_POINTS` berapa pun besar datanya.
+"""
+import numpy as np
+import pandas as pd
+
+# Level grid yang disimpan di cube (~600 m per sel di ekuator)
+BASE_LEVEL = 16
+
+# Lebar satu sel di layar (piksel) pada level zoom yang sedang dipakai
+CELL_PIXELS = 8
+TILE_PIXELS = 256
+
+# Batas jumlah titik yang dikirim ke HeatMap
+MAX_POINTS = 4000
+
+# Batas lintang proyeksi Web Mercator
+MAX_LATITUDE = 85.05112878
+
+
+def cell_ids(lat, lng, level=BASE_LEVEL):
+    """Indeks sel (y * 2^level + x) untuk setiap koordinat; <NA> jika koordinat kosong."""
+    lat = np.clip(np.asarray(lat, dtype="float64"), -MAX_LATITUDE, MAX_LATITUDE)
+    lng = np.asarray(lng, dtype="float64")
+    size = 2 ** level
+    x = np.floor((lng + 180) / 360 * size)
+    y = np.floor((1 - np.log(np.tan(np.radians(lat)) + 1 / np.cos(np.radians(lat))) / np.pi) / 2 * size)
+    x, y = np.clip(x, 0, size - 1), np.clip(y, 0, size - 1)
+    return pd.array(y * size + x, dtype="Int64")
+
+
+def cell_centers(ids, level):
+    """Koordinat (lat, lng) pusat setiap sel."""
+    ids = np.asarray(ids, dtype="int64")
+    size = 2 ** level
+    y, x = np.divmod(ids, size)
+    lng = (x + 0.5) / size * 360 - 180
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + 0.5) / size))))
+    return lat, lng
+
+
+def level_for_zoom(zoom):
+    """Level grid dengan sel selebar `CELL_PIXELS` piksel pada level zoom peta."""
+    return min(BASE_LEVEL, int(zoom) + int(np.log2(TILE_PIXELS // CELL_PIXELS)))
+
+
+def coarsen(cells, level, from_level=BASE_LEVEL):
+    """Jumlahkan measure sel (indeks = id sel di `from_level`) ke sel induknya di `level`."""
+    shift = 2 ** (from_level - level)
+    ids = cells.index.to_numpy(dtype="int64")
+    y, x = np.divmod(ids, 2 ** from_level)
+    parents = (y // shift) * 2 ** level + x // shift
+    return cells.groupby(parents).sum()
+
+
+def heatmap_points(cells, weight, zoom, max_points=MAX_POINTS):
+    """Titik [lat, lng, bobot] untuk HeatMap dari sel cube.
+
+    `cells` adalah hasil `cube.query(..., by="customer_cell")` dan `weight`
+    fungsi yang menghitung bobot dari measure sel (misalnya rata-rata durasi
+    pengiriman). Grid dibuat lebih kasar bila jumlah sel melebihi `max_points`.
+    """
+    level = level_for_zoom(zoom)
+    binned = coarsen(cells, level)
+    while len(binned) > max_points and level > 0:
+        level -= 1
+        binned = coarsen(cells, level)
+    values = pd.Series(np.asarray(weight(binned), dtype="float64"), index=binned.index).dropna()
+    lat, lng = cell_centers(values.index, level)
+    return np.column_stack([lat, lng, values.to_numpy()])
@@ -0,0 +1,531 @@
+"""Ingest CSV ke penyimpanan kolumnar (Parquet).
+
+Jalankan sekali setelah data baru tersedia:
+
+    python dashboard/ingest.py
+
+Order harian dapat ditambahkan tanpa membangun ulang seluruh store:
+
+    python dashboard/ingest.py --append order_baru.csv
+
+`main_data.csv` dan tabel sumber di `data/` dikonversi menjadi Parquet dengan
+tipe yang sudah benar (datetime64, category, float32), sehingga dashboard
+tidak perlu mem-parsing teks CSV dan `pd.to_datetime` di setiap cold start.
+Kolom turunan pengiriman (durasi, keterlambatan, hari terima, kategori ongkos
+kirim, lama proses pembayaran) juga dihitung sekali di sini, begitu pula
+indeks frekuensi kata ulasan untuk WordCloud (lihat `terms.py`), histogram
+berbin halus (lihat `binning.py`), sketch jumlah order dan pelanggan unik
+(lihat `sketches.py`), dan piramida rollup deret waktu untuk grafik tren
+(lihat `rollup.py`).
+
+Store memakai skema bintang (lihat `schema.py`): ID pelanggan, produk, dan
+seller di tabel order diganti kunci int32, sedangkan ID aslinya beserta
+atribut dari `data/` disimpan di tabel dimensi `dims/`.
+
+Setiap versi store berada di direktori sendiri, `store/<versi>/`, dengan
+versi = hash manifest-nya. Builder (build ulang maupun `--append`) bekerja
+di bawah kunci file `store/.lock`, menulis ke direktori sementara, lalu
+memublikasikannya dengan mengganti pointer `store/CURRENT` lewat
+`os.replace`. Pembaca selalu membuka versi yang ditunjuk pointer, sehingga
+tidak pernah melihat store setengah jadi dan tetap melayani versi lama
+sampai pointer berganti. Versi sebelumnya disimpan satu generasi untuk
+pembaca yang masih membukanya; versi yang lebih lama dihapus.
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import pandas as pd
+
+import binning
+import config
+import cube
+import rfm
+import rollup
+import schema
+import sketches
+import terms
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Lokasi data dan store dapat diganti lewat environment (misalnya untuk benchmark)
+MAIN_DATA_PATH = os.environ.get("DASHBOARD_MAIN_DATA", os.path.join(BASE_DIR, "main_data.csv"))
+SOURCE_DIR = os.path.join(BASE_DIR, os.pardir, "data")
+STORE_DIR = os.environ.get("DASHBOARD_STORE_DIR", os.path.join(BASE_DIR, "store"))
+# Pointer ke direktori versi yang sedang dipublikasikan, dan kunci file builder
+CURRENT_PATH = os.path.join(STORE_DIR, "CURRENT")
+LOCK_PATH = os.path.join(STORE_DIR, ".lock")
+# Isi setiap direktori versi (lihat `store_path`)
+ORDERS_DIR = "orders"
+CUBE_DIR = "cube"
+TERMS_DIR = "terms"
+BINS_DIR = "bins"
+SKETCHES_DIR = "sketches"
+ROLLUPS_DIR = "rollups"
+RFM_STATE_PATH = "rfm_state.parquet"
+DIMS_DIR = "dims"
+MANIFEST_PATH = "manifest.json"
+# Isi STORE_DIR di luar direktori versi yang tidak dihapus saat membersihkan versi lama
+PERSISTENT_ENTRIES = {"CURRENT", ".lock", "precomputed"}
+
+# Naikkan jika format store berubah agar store lama dibangun ulang
+STORE_VERSION = 15
+
+# Kolom partisi tabel order (bulan pembelian, format YYYY-MM)
+PARTITION_COLUMN = "purchase_month"
+
+# Tipe kolom main_data.csv
+TIMESTAMP_COLUMNS = [
+    "order_purchase_timestamp",
+    "order_approved_at",
+    "order_delivered_carrier_date",
+    "order_delivered_customer_date",
+    "order_estimated_delivery_date",
+    "shipping_limit_date",
+    "review_creation_date",
+    "review_answer_timestamp",
+]
+CATEGORY_COLUMNS = [
+    "order_status",
+    "payment_type",
+    "product_category_name",
+    "product_category_name_english",
+    "customer_city",
+    "customer_state",
+    "seller_city",
+    "seller_state",
+]
+FLOAT32_COLUMNS = [
+    "price",
+    "freight_value",
+    "payment_value",
+    "customer_lat",
+    "customer_lng",
+    "seller_lat",
+    "seller_lng",
+    "product_weight_g",
+    "product_length_cm",
+    "product_height_cm",
+    "product_width_cm",
+]
+ID_COLUMNS = [
+    "order_id",
+    "customer_id",
+    "customer_unique_id",
+    "product_id",
+    "seller_id",
+    "review_id",
+    "customer_zip_code_prefix",
+    "seller_zip_code_prefix",
+]
+
+# Kolom turunan pengiriman/pembayaran yang dihitung sekali saat ingest
+DERIVED_COLUMNS = [
+    "delivery_duration",
+    "delay_days",
+    "late_delivery",
+    "delivery_day",
+    "freight_category",
+    "payment_processing_time",
+]
+
+def _source_files():
+    files = {"orders": MAIN_DATA_PATH}
+    for name, (filename, _) in schema.SOURCE_TABLES.items():
+        files[name] = os.path.join(SOURCE_DIR, filename)
+    return {name: path for name, path in files.items() if os.path.exists(path)}
+
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _apply_dtypes(df):
+    for col in TIMESTAMP_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    if "review_score" in df.columns and df["review_score"].notna().all():
+        df["review_score"] = df["review_score"].astype("int8")
+    return df
+
+
+def derive_columns(df):
+    """Tambahkan kolom turunan (lihat `DERIVED_COLUMNS`) ke frame order dengan tipe ringkas."""
+    purchase = df["order_purchase_timestamp"]
+    delivered = df["order_delivered_customer_date"]
+    # Selisih hari (durasi pengiriman dan keterlambatan terhadap estimasi) sebagai int16 nullable
+    df["delivery_duration"] = (delivered - purchase).dt.days.astype("Int16")
+    df["delay_days"] = (delivered - df["order_estimated_delivery_date"]).dt.days.astype("Int16")
+    df["late_delivery"] = delivered > df["order_estimated_delivery_date"]
+    df["delivery_day"] = pd.Categorical(delivered.dt.day_name(), categories=cube.DAYS_OF_WEEK)
+    df["freight_category"] = pd.cut(df["freight_value"], bins=cube.FREIGHT_BINS, labels=cube.FREIGHT_LABELS)
+    # Lama proses pembayaran (menit sejak pembelian sampai disetujui)
+    df["payment_processing_time"] = ((df["order_approved_at"] - purchase).dt.total_seconds() / 60).astype("float32")
+    return df
+
+
+def read_csv(path):
+    """Baca CSV dengan kolom ID sebagai string lalu terapkan tipe kolumnar."""
+    return next(iter_csv(path))
+
+
+def iter_csv(path, batch_rows=None):
+    """Seperti `read_csv`, tetapi per batch `batch_rows` baris (satu batch jika None)."""
+    header = pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns
+    dtype = {col: str for col in ID_COLUMNS if col in header}
+    if batch_rows is None:
+        yield _apply_dtypes(pd.read_csv(path, dtype=dtype, encoding="utf-8-sig"))
+        return
+    with pd.read_csv(path, dtype=dtype, encoding="utf-8-sig", chunksize=batch_rows) as reader:
+        for chunk in reader:
+            chunk = _apply_dtypes(chunk)
+            # Tipe review_score harus sama di semua batch, padahal ada/tidaknya NaN berbeda per batch
+            if "review_score" in chunk.columns:
+                chunk["review_score"] = chunk["review_score"].astype("float32")
+            yield chunk
+
+
+def _read_source_tables(sources):
+    return {name: read_csv(sources[name]) for name in schema.SOURCE_TABLES if name in sources}
+
+
+def _write_orders(df, root):
+    df[PARTITION_COLUMN] = df["order_purchase_timestamp"].dt.strftime("%Y-%m")
+    df.to_parquet(os.path.join(root, ORDERS_DIR), engine="pyarrow", index=False,
+                  partition_cols=[PARTITION_COLUMN])
+
+
+def _try_lock(f, blocking):
+    if fcntl is not None:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            return True
+        except BlockingIOError:
+            return False
+    # msvcrt.locking hanya mencoba ulang 10 detik; builder lain bisa berjalan lebih lama
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+            time.sleep(1)
+
+
+@contextlib.contextmanager
+def _store_lock(blocking=True):
+    """Kunci builder antar proses; menghasilkan False jika `blocking=False` dan kunci dipegang builder lain."""
+    os.makedirs(STORE_DIR, exist_ok=True)
+    with open(LOCK_PATH, "a+") as f:
+        f.seek(0)
+        locked = _try_lock(f, blocking)
+        try:
+            yield locked
+        finally:
+            if locked and fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            elif locked:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _new_root():
+    root = os.path.join(STORE_DIR, f"{os.getpid()}-{time.time_ns()}.tmp")
+    os.makedirs(root)
+    return root
+
+
+def _publish(root):
+    """Pasang direktori versi yang sudah lengkap sebagai versi aktif (dipanggil di bawah `_store_lock`)."""
+    with open(os.path.join(root, MANIFEST_PATH), "rb") as f:
+        version = hashlib.sha1(f.read()).hexdigest()
+    previous = current_version()
+    target = os.path.join(STORE_DIR, version)
+    if os.path.exists(target):
+        # Isi yang sama sudah pernah dipublikasikan
+        shutil.rmtree(root)
+    else:
+        os.rename(root, target)
+    tmp_path = f"{CURRENT_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, CURRENT_PATH)
+    # Versi sebelumnya dipertahankan untuk pembaca yang masih membukanya; sisa builder
+    # yang gagal aman dihapus karena kunci sedang dipegang
+    for name in os.listdir(STORE_DIR):
+        if name not in PERSISTENT_ENTRIES and name not in (version, previous):
+            path = os.path.join(STORE_DIR, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+    return version
+
+
+def build_store(batch_rows=None):
+    """Konversi semua CSV sumber ke Parquet dan publikasikan sebagai versi store baru.
+
+    Dengan `batch_rows`, main_data.csv dibaca per batch: setiap batch langsung
+    ditulis ke Parquet, sedangkan cube dan state RFM digabung per batch,
+    sehingga CSV yang lebih besar dari RAM tetap bisa di-ingest.
+    """
+    with _store_lock():
+        return _build_store(batch_rows)
+
+
+def _build_store(batch_rows):
+    sources = _source_files()
+    if "orders" not in sources:
+        raise FileNotFoundError(f"{MAIN_DATA_PATH} tidak ditemukan")
+
+    root = _new_root()
+
+    order_cube = rfm_state = review_terms = order_bins = order_sketches = trend_rollups = None
+    dims = schema.empty_dimensions()
+    purchase_bounds = []
+    for orders in iter_csv(sources["orders"], batch_rows):
+        orders = derive_columns(orders)
+        dims = schema.update_dimensions(dims, orders)
+        purchase = orders["order_purchase_timestamp"]
+        purchase_bounds += [purchase.min(), purchase.max()]
+        batch_cube, batch_state = cube.build_cube(orders), rfm.build_state(orders)
+        order_cube = batch_cube if order_cube is None else cube.merge_cubes(order_cube, batch_cube)
+        rfm_state = batch_state if rfm_state is None else rfm.merge_states(rfm_state, batch_state)
+        batch_terms = terms.build_terms(orders)
+        review_terms = batch_terms if review_terms is None else terms.merge_terms(review_terms, batch_terms)
+        batch_bins = binning.build_bins(orders)
+        order_bins = batch_bins if order_bins is None else binning.merge_bins(order_bins, batch_bins)
+        batch_sketches = sketches.build_sketches(orders)
+        order_sketches = (batch_sketches if order_sketches is None
+                          else sketches.merge_sketches(order_sketches, batch_sketches))
+        batch_rollups = rollup.build_rollups(orders)
+        trend_rollups = batch_rollups if trend_rollups is None else rollup.merge_rollups(trend_rollups, batch_rollups)
+        _write_orders(schema.fact_table(orders), root)
+    cube.write_cube(order_cube, os.path.join(root, CUBE_DIR))
+    terms.write_terms(review_terms, os.path.join(root, TERMS_DIR))
+    binning.write_bins(order_bins, os.path.join(root, BINS_DIR))
+    sketches.write_sketches(order_sketches, os.path.join(root, SKETCHES_DIR))
+    rollup.write_rollups(trend_rollups, os.path.join(root, ROLLUPS_DIR))
+    rfm.write_state(rfm_state, os.path.join(root, RFM_STATE_PATH))
+    schema.write_dimensions(schema.join_attributes(dims, _read_source_tables(sources)), os.path.join(root, DIMS_DIR))
+    purchase_bounds = pd.Series(purchase_bounds, dtype="datetime64[ns]")
+
+    manifest = {
+        "version": STORE_VERSION,
+        "sources": {name: _fingerprint(path) for name, path in sources.items()},
+        "purchase_date_range": [f"{purchase_bounds.min():%Y-%m-%d}", f"{purchase_bounds.max():%Y-%m-%d}"],
+    }
+    _write_manifest(manifest, root)
+    _publish(root)
+    return manifest
+
+
+def _link_or_copy(src, dst):
+    # File Parquet order tidak pernah ditulis ulang (append hanya menambah file), jadi aman dibagi lewat hard link
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def append_orders(path):
+    """Tambahkan order baru ke store secara inkremental.
+
+    Order baru ditulis sebagai file Parquet tambahan di partisi bulannya, sel
+    cube, indeks kata, bin histogram, sketch jumlah unik, dan rollup deret waktu digabung dengan
+    milik order baru, state RFM diperbarui hanya
+    untuk pelanggan yang muncul di order baru, dan ID pelanggan/produk/seller
+    baru mendapat kunci berikutnya di tabel dimensinya. Hasilnya ditulis ke
+    versi store baru (file Parquet order lama dibagi lewat hard link), lalu
+    dipublikasikan seperti `build_store`.
+    """
+    orders = derive_columns(read_csv(path))
+    purchase = orders["order_purchase_timestamp"]
+    with _store_lock():
+        if not store_is_fresh():
+            _build_store(None)
+        root = _new_root()
+        shutil.copytree(store_path(ORDERS_DIR), os.path.join(root, ORDERS_DIR), copy_function=_link_or_copy)
+        manifest = read_manifest()
+        dims = schema.update_dimensions({name: read_dimension(name) for name in schema.DIMENSIONS}, orders)
+        schema.write_dimensions(schema.join_attributes(dims, _read_source_tables(_source_files())),
+                                os.path.join(root, DIMS_DIR))
+
+        cube.write_cube(cube.merge_cubes(read_cube(), cube.build_cube(orders)), os.path.join(root, CUBE_DIR))
+        terms.write_terms(terms.merge_terms(read_terms(), terms.build_terms(orders)), os.path.join(root, TERMS_DIR))
+        binning.write_bins(binning.merge_bins(read_bins(), binning.build_bins(orders)), os.path.join(root, BINS_DIR))
+        sketches.write_sketches(sketches.merge_sketches(read_sketches(), sketches.build_sketches(orders)),
+                                os.path.join(root, SKETCHES_DIR))
+        rollup.write_rollups(rollup.merge_rollups(read_rollups(), rollup.build_rollups(orders)),
+                             os.path.join(root, ROLLUPS_DIR))
+        rfm.write_state(rfm.update_state(read_rfm_state(), orders), os.path.join(root, RFM_STATE_PATH))
+        _write_orders(schema.fact_table(orders), root)
+
+        start, end = manifest["purchase_date_range"]
+        manifest["purchase_date_range"] = [min(start, f"{purchase.min():%Y-%m-%d}"),
+                                           max(end, f"{purchase.max():%Y-%m-%d}")]
+        manifest.setdefault("appended", []).append({"path": os.path.abspath(path), **_fingerprint(path)})
+        _write_manifest(manifest, root)
+        _publish(root)
+    return manifest
+
+
+def _write_manifest(manifest, root):
+    with open(os.path.join(root, MANIFEST_PATH), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def current_version():
+    """Versi store yang sedang dipublikasikan (isi `store/CURRENT`), atau None jika belum ada."""
+    try:
+        with open(CURRENT_PATH) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def store_path(name, version=None):
+    """Path `name` (misalnya `CUBE_DIR`) di direktori versi `version`, default versi yang sedang dipublikasikan."""
+    return os.path.join(STORE_DIR, version or data_version(), name)
+
+
+def read_manifest(version=None):
+    with open(store_path(MANIFEST_PATH, version)) as f:
+        return json.load(f)
+
+
+def data_version():
+    """Versi isi store (hash manifest); berubah saat store dibangun ulang dari CSV lain atau order ditambahkan."""
+    version = current_version()
+    if version is None:
+        raise FileNotFoundError(f"Store di {STORE_DIR} belum dibangun; jalankan `python dashboard/ingest.py`")
+    return version
+
+
+def store_is_fresh():
+    """True jika store ada dan dibuat dari versi CSV sumber yang sama."""
+    if current_version() is None:
+        return False
+    manifest = read_manifest()
+    current = {name: _fingerprint(path) for name, path in _source_files().items()}
+    return manifest.get("version") == STORE_VERSION and manifest.get("sources") == current
+
+
+_builder = None
+_builder_lock = threading.Lock()
+
+
+def _refresh_store(batch_rows):
+    # Hanya satu builder di semua proses; proses yang tidak mendapat kunci tetap memakai versi lama
+    with _store_lock(blocking=False) as locked:
+        if locked and not store_is_fresh():
+            _build_store(batch_rows)
+
+
+def ensure_store(wait=True):
+    """Pastikan store dibangun dari CSV sumber terbaru.
+
+    Dengan `wait=False` (dashboard), store yang sudah ada tetapi basi
+    dibangun ulang oleh satu thread di latar belakang; pemanggil langsung
+    kembali dan tetap memakai versi lama sampai versi baru dipublikasikan.
+    Hanya bila belum ada versi sama sekali pemanggil menunggu build selesai.
+    """
+    if store_is_fresh():
+        return
+    batch_rows = config.BATCH_ROWS if config.STREAMING else None
+    if wait or current_version() is None:
+        with _store_lock():
+            if not store_is_fresh():
+                _build_store(batch_rows)
+        return
+    global _builder
+    with _builder_lock:
+        if _builder is None or not _builder.is_alive():
+            _builder = threading.Thread(target=_refresh_store, args=(batch_rows,), name="store-builder", daemon=True)
+            _builder.start()
+
+
+def purchase_date_range(version=None):
+    """Tanggal pembelian pertama dan terakhir, dibaca dari manifest tanpa memuat data."""
+    start, end = read_manifest(version)["purchase_date_range"]
+    return pd.Timestamp(start).date(), pd.Timestamp(end).date()
+
+
+def read_orders(columns=None, filters=None, version=None):
+    """Baca tabel order dari store.
+
+    Hanya kolom yang diminta yang dibaca (column projection), dan `filters`
+    (format pyarrow, lihat `filters.arrow_filters`) di-pushdown ke pembaca
+    sehingga partisi dan row group di luar filter dilewati.
+    """
+    return pd.read_parquet(store_path(ORDERS_DIR, version), engine="pyarrow", columns=columns, filters=filters)
+
+
+def read_cube(version=None):
+    """Baca semua cuboid agregat (lihat `cube.py`)."""
+    return cube.read_cube(store_path(CUBE_DIR, version))
+
+
+def read_terms(version=None):
+    """Indeks frekuensi kata ulasan (lihat `terms.py`)."""
+    return terms.read_terms(store_path(TERMS_DIR, version))
+
+
+def read_bins(version=None):
+    """Histogram berbin halus per sel filter (lihat `binning.py`)."""
+    return binning.read_bins(store_path(BINS_DIR, version))
+
+
+def read_sketches(version=None):
+    """Sketch jumlah order dan pelanggan unik per sel filter (lihat `sketches.py`)."""
+    return sketches.read_sketches(store_path(SKETCHES_DIR, version))
+
+
+def read_rollups(version=None):
+    """Piramida rollup deret waktu hari/minggu/bulan (lihat `rollup.py`)."""
+    return rollup.read_rollups(store_path(ROLLUPS_DIR, version))
+
+
+def read_rfm_state(version=None):
+    """State RFM per pelanggan untuk seluruh riwayat order (lihat `rfm.py`)."""
+    return rfm.read_state(store_path(RFM_STATE_PATH, version))
+
+
+def read_dimension(name, columns=None, version=None):
+    """Tabel dimensi (lihat `schema.py`); baris ke-i milik kunci surrogate i."""
+    return schema.read_dimension(store_path(DIMS_DIR, version), name, columns)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Konversi CSV sumber ke store Parquet dashboard.")
+    parser.add_argument("--append", metavar="CSV", help="tambahkan order baru ke store yang sudah ada")
+    parser.add_argument("--batch-rows", type=int, help="baca main_data.csv per batch (untuk CSV yang lebih besar dari RAM)")
+    args = parser.parse_args()
+
+    if args.append:
+        append_orders(args.append)
+        print(f"Order dari {args.append} ditambahkan ke {STORE_DIR}")
+    else:
+        manifest = build_store(args.batch_rows)
+        print(f"Store ditulis ke {STORE_DIR}")
+        for name in manifest["sources"]:
+            print(f"  - {name}")
@@ -0,0 +1,208 @@
+"""Instrumentasi hot path dashboard: waktu, baris yang diproses, dan alokasi memori per langkah.
+
+Aktifkan dengan `DASHBOARD_PROFILE` (lihat `config.py`), berisi satu atau
+lebih tujuan dipisah koma:
+
+- `log`: satu baris JSON per rerun (semua langkah) ke stderr atau
+  `DASHBOARD_PROFILE_LOG`;
+- `prometheus`: metrik kumulatif per langkah dalam format teks Prometheus,
+  ditulis ke `DASHBOARD_PROFILE_PROMETHEUS` setelah setiap rerun (untuk
+  textfile collector node_exporter);
+- `overlay`: tabel langkah rerun terakhir di sidebar dashboard.
+
+Langkah dibuka dengan `timed(nama)` atau dekorator `timer`; kode di dalamnya
+melaporkan jumlah baris yang dibaca lewat `add_rows`. Langkah boleh
+bersarang: baris dan puncak memori langkah anak ikut dihitung di induknya.
+Alokasi memori diukur dengan tracemalloc, yang hanya dinyalakan bila
+instrumentasi aktif; karena tracemalloc berlaku per proses, angka memori
+bisa tercampur bila beberapa sesi rerun bersamaan.
+
+Tanpa `DASHBOARD_PROFILE`, `timer` mengembalikan fungsi aslinya, `timed`
+mengembalikan context manager kosong, dan `add_rows` langsung kembali.
+"""
+import collections
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+import config
+
+ENABLED = bool(config.PROFILE_SINKS)
+OVERLAY = "overlay" in config.PROFILE_SINKS
+
+
+class _NoopStep:
+    rows = bytes = seconds = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopStep()
+_local = threading.local()
+_lock = threading.Lock()
+# Metrik kumulatif per nama langkah: [jumlah, total detik, total baris, puncak bytes]
+_totals = collections.defaultdict(lambda: [0, 0.0, 0, 0])
+
+
+class Step:
+    """Satu langkah terukur; dipakai lewat `timed`."""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def __enter__(self):
+        stack = _stack()
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1]._peak = max(stack[-1]._peak, peak)
+        tracemalloc.reset_peak()
+        self.depth = len(stack)
+        self._base = self._peak = current
+        stack.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self._start
+        stack = _stack()
+        stack.pop()
+        self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+        self.bytes = self._peak - self._base
+        if stack:
+            parent = stack[-1]
+            parent.rows += self.rows
+            parent._peak = max(parent._peak, self._peak)
+        tracemalloc.reset_peak()
+        records = getattr(_local, "records", None)
+        if records is not None:
+            records.append(self)
+        return False
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def timed(name):
+    """Context manager yang mengukur satu langkah (no-op bila instrumentasi mati)."""
+    if not ENABLED:
+        return _NOOP
+    return Step(name)
+
+
+def timer(func):
+    """Dekorator: ukur setiap panggilan `func` sebagai langkah bernama `modul.fungsi`."""
+    if not ENABLED:
+        return func
+    name = f"{func.__module__}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with Step(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def add_rows(rows):
+    """Catat jumlah baris yang diproses langkah yang sedang berjalan."""
+    if not ENABLED:
+        return
+    stack = _stack()
+    if stack:
+        stack[-1].rows += int(rows)
+
+
+def record(step):
+    """Catat langkah yang diukur di thread lain (mis. thread render) ke rerun yang sedang berjalan."""
+    records = getattr(_local, "records", None)
+    if ENABLED and records is not None:
+        records.append(step)
+
+
+def begin_rerun():
+    """Mulai mencatat langkah untuk satu rerun script."""
+    if not ENABLED:
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _local.records = []
+    _local.stack = []
+    _local.rerun_start = time.perf_counter()
+
+
+def end_rerun(page):
+    """Selesaikan rerun, kirim ke tujuan yang aktif, dan kembalikan daftar langkahnya (urut waktu mulai)."""
+    if not ENABLED or getattr(_local, "records", None) is None:
+        return []
+    steps = sorted(_local.records, key=lambda step: step._start)
+    _local.records = None
+    record = {
+        "time": time.time(),
+        "page": page,
+        "seconds": time.perf_counter() - _local.rerun_start,
+        "steps": [{"name": s.name, "depth": s.depth, "seconds": s.seconds, "rows": s.rows, "bytes": s.bytes}
+                  for s in steps],
+    }
+    with _lock:
+        for step in steps:
+            totals = _totals[step.name]
+            totals[0] += 1
+            totals[1] += step.seconds
+            totals[2] += step.rows
+            totals[3] = max(totals[3], step.bytes)
+    if "log" in config.PROFILE_SINKS:
+        _write_log(record)
+    if "prometheus" in config.PROFILE_SINKS:
+        _write_prometheus()
+    return record["steps"]
+
+
+def _write_log(record):
+    line = json.dumps(record, ensure_ascii=False)
+    if config.PROFILE_LOG:
+        with _lock, open(config.PROFILE_LOG, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    else:
+        print(line, file=sys.stderr, flush=True)
+
+
+def prometheus_text():
+    """Metrik kumulatif semua langkah sejak proses dimulai, dalam format teks Prometheus."""
+    lines = [
+        "# HELP dashboard_step_seconds Waktu per langkah dashboard.",
+        "# TYPE dashboard_step_seconds summary",
+    ]
+    with _lock:
+        totals = sorted(_totals.items())
+    for name, (count, seconds, _, _) in totals:
+        lines += [f'dashboard_step_seconds_sum{{step="{name}"}} {seconds:.6f}',
+                  f'dashboard_step_seconds_count{{step="{name}"}} {count}']
+    lines += ["# HELP dashboard_step_rows_total Jumlah baris yang diproses per langkah.",
+              "# TYPE dashboard_step_rows_total counter"]
+    lines += [f'dashboard_step_rows_total{{step="{name}"}} {rows}' for name, (_, _, rows, _) in totals]
+    lines += ["# HELP dashboard_step_peak_bytes Puncak alokasi memori per langkah.",
+              "# TYPE dashboard_step_peak_bytes gauge"]
+    lines += [f'dashboard_step_peak_bytes{{step="{name}"}} {peak}' for name, (_, _, _, peak) in totals]
+    return "\n".join(lines) + "\n"
+
+
+def _write_prometheus():
+    path = config.PROFILE_PROMETHEUS
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
@@ -0,0 +1,96 @@
+"""Loader data dashboard yang di-cache Streamlit.
+
+Dipakai oleh `dashboard.py` dan modul halaman di `views/`. Semua loader
+menerima `data_version` (lihat `ingest.data_version`) sebagai bagian kunci
+cache, sehingga data baru langsung terpakai tanpa restart.
+"""
+import pandas as pd
+import streamlit as st
+
+import backends
+import config
+import datacache
+import figures
+import filters
+import ingest
+import precompute
+import rowindex
+
+
+@st.cache_resource(max_entries=2)
+def load_mapped_orders(data_version):
+    # Tabel order memory-mapped (Arrow IPC): satu salinan read-only untuk semua proses di host ini
+    return datacache.MappedOrders.open(data_version)
+
+@st.cache_resource(max_entries=2)
+def load_row_index(data_version):
+    # Cache LRU bitmap filter dan indeks baris hasil filter, dipakai bersama semua sesi (lihat rowindex.py)
+    return rowindex.RowIndex(load_mapped_orders(data_version), config.ROW_INDEX_CACHE_BYTES)
+
+@st.cache_resource(max_entries=2)
+def load_orders(columns, data_version):
+    # Proyeksi kolom dari tabel memory-mapped: satu frame pandas per versi data,
+    # dipakai bersama semua sesi di proses ini (jangan diubah in-place)
+    return load_mapped_orders(data_version).read(columns)
+
+def load_data(columns, date_range, data_version):
+    # Potongan baris rentang tanggal dari frame per versi (batas dari pencarian biner pada tabel
+    # terurut); iloc pada potongan berurutan tidak menyalin data, jadi tidak perlu di-cache per rentang
+    start, stop = load_mapped_orders(data_version).bounds(date_range)
+    frame = load_orders(columns, data_version).iloc[start:stop]
+    frame.index = pd.RangeIndex(len(frame))
+    return frame
+
+@st.cache_resource(max_entries=2)
+def load_cube(data_version):
+    # Cuboid agregat (read-only), dipakai bersama semua sesi; objek tabelnya tetap sama antar rerun
+    # sehingga konversi per tabel di backend query (lihat backends.py) cukup sekali per versi data
+    return ingest.read_cube(data_version)
+
+@st.cache_resource(max_entries=2)
+def load_terms(data_version):
+    # Indeks frekuensi kata ulasan (read-only), dipakai bersama semua sesi
+    return ingest.read_terms(data_version)
+
+@st.cache_resource(max_entries=8)
+def load_dimension(name, data_version):
+    # Tabel dimensi (read-only, lihat schema.py), digabungkan hanya ke hasil agregat yang butuh atributnya
+    return ingest.read_dimension(name, version=data_version)
+
+@st.cache_resource(max_entries=2)
+def load_bins(data_version):
+    # Histogram berbin halus per sel filter (read-only, lihat binning.py)
+    return ingest.read_bins(data_version)
+
+@st.cache_resource(max_entries=2)
+def load_sketches(data_version):
+    # Sketch jumlah order dan pelanggan unik per sel filter (read-only, lihat sketches.py)
+    return ingest.read_sketches(data_version)
+
+@st.cache_resource(max_entries=2)
+def load_rollups(data_version):
+    # Piramida rollup deret waktu untuk grafik tren (read-only, lihat rollup.py)
+    return ingest.read_rollups(data_version)
+
+@st.cache_data
+def load_rfm_state(data_version):
+    return ingest.read_rfm_state(data_version)
+
+@st.cache_data(max_entries=64)
+def load_aggregate(_spec, spec_key, date_range, selections, data_version, _order=None):
+    # Agregat per status filter: dari frame hasil filter (mode memory)
+    # atau dari store Parquet (mode streaming) lewat backend aktif (lihat backends.py),
+    # kecuali sudah dihitung di muka oleh precompute.py
+    precomputed = precompute.read_result(_spec, date_range, selections, data_version)
+    if precomputed is not None:
+        return precomputed
+    return backends.current().aggregate(_spec, date_range, selections, frame=_order)
+
+@st.cache_resource
+def load_figure_cache():
+    # Satu cache gambar grafik untuk semua sesi
+    return figures.FigureCache(config.FIGURE_CACHE_BYTES)
+
+@st.cache_data
+def load_date_range(data_version):
+    return ingest.purchase_date_range(data_version)
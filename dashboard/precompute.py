@@ -0,0 +1,139 @@
+"""Hitung di muka agregat baris mentah untuk filter yang sering dipakai setelah data diperbarui.
+
+Satu-satunya agregat halaman yang masih membutuhkan baris mentah adalah
+state RFM per pelanggan pada filter aktif (halaman Analisis RFM; tanpa
+filter dipakai state hasil ingest). Tanpa langkah ini state tersebut baru
+dihitung oleh pengguna pertama yang memilih filternya, di satu core.
+Scheduler ini membagi filter-filter yang sering dipakai (`common_views`:
+seluruh rentang tanggal dengan satu metode pembayaran, satu status pesanan,
+atau satu kategori produk terlaris) ke `ProcessPoolExecutor`:
+
+    python dashboard/precompute.py --workers 4
+
+Worker tidak menerima DataFrame dari proses induk. Setiap worker memindai
+store Parquet langsung lewat pyarrow (`streaming.run`), hanya untuk kolom
+yang dibutuhkan agregatnya, lalu menulis hasilnya (kecil) ke cache hasil di
+`store/precomputed/<versi data>/`. `dashboard.py` membaca cache ini sebelum
+menghitung agregat sendiri.
+
+KPI yang dibaca dari cube (rata-rata rating, keterlambatan per seller, review
+vs durasi pengiriman, keterlambatan per hari, kategori ongkos kirim, waktu
+proses pembayaran, pembatalan), histogram harga/keterlambatan (lihat
+`binning.py`), total pesanan, order per pelanggan, dan tren pelanggan (lihat
+`sketches.py`), serta tren review (lihat `rollup.py`) sudah dimaterialisasi
+saat ingest sehingga tidak perlu dijadwalkan di sini.
+"""
+import argparse
+import concurrent.futures
+import hashlib
+import os
+import pickle
+import shutil
+import time
+
+import ingest
+import streaming
+
+PRECOMPUTED_DIR = os.path.join(ingest.STORE_DIR, "precomputed")
+
+# Agregat baris mentah yang dipakai halaman dashboard (parameter harus sama dengan di analytics/)
+PAGE_AGGREGATES = [
+    streaming.RFMState(),
+]
+# Jumlah kategori produk terlaris yang masing-masing dihitung di muka
+TOP_CATEGORIES = 10
+
+
+def result_key(spec, date_range, selections):
+    """Kunci hasil satu agregat pada satu status filter (urutan pilihan multiselect diabaikan)."""
+    selections = {name: sorted(values) for name, values in (selections or {}).items() if values}
+    state = (spec.cache_key, tuple(date_range) if date_range else None, sorted(selections.items()))
+    return hashlib.sha1(repr(state).encode("utf-8")).hexdigest()
+
+
+def _result_path(spec, date_range, selections, data_version):
+    return os.path.join(PRECOMPUTED_DIR, data_version, f"{result_key(spec, date_range, selections)}.pkl")
+
+
+def read_result(spec, date_range, selections, data_version):
+    """Hasil yang sudah dihitung di muka, atau None jika belum ada."""
+    try:
+        with open(_result_path(spec, date_range, selections, data_version), "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_result(result, spec, date_range, selections, data_version):
+    path = _result_path(spec, date_range, selections, data_version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Tulis ke file sementara lalu ganti, agar pembaca tidak pernah melihat file setengah jadi
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def _compute(spec, date_range, selections, data_version):
+    """Dijalankan di proses worker: pindai store, hitung agregat, tulis ke cache hasil."""
+    start = time.perf_counter()
+    write_result(streaming.run(spec, date_range, selections), spec, date_range, selections, data_version)
+    return time.perf_counter() - start
+
+
+def _remove_stale(data_version):
+    """Hapus hasil milik versi data lama."""
+    if not os.path.isdir(PRECOMPUTED_DIR):
+        return
+    for name in os.listdir(PRECOMPUTED_DIR):
+        if name != data_version:
+            shutil.rmtree(os.path.join(PRECOMPUTED_DIR, name), ignore_errors=True)
+
+
+def common_views(top_categories=TOP_CATEGORIES):
+    """Status filter yang sering dipakai: seluruh rentang tanggal dengan satu nilai satu dimensi filter.
+
+    Nilai dan urutannya dibaca dari cube (jumlah order per nilai), tanpa memindai tabel order.
+    """
+    date_range = ingest.purchase_date_range()
+    cells = ingest.read_cube()["base"]
+    views = []
+    for column, limit in [("payment_type", None), ("order_status", None), ("product_category_name", top_categories)]:
+        counts = cells.groupby(column, observed=True)["order_count"].sum()
+        for value in counts[counts > 0].sort_values(ascending=False).index[:limit]:
+            views.append((date_range, {column: [str(value)]}))
+    return views
+
+
+def precompute(views=None, aggregates=PAGE_AGGREGATES, workers=None):
+    """Hitung setiap agregat untuk setiap status filter `views` secara paralel.
+
+    `views` adalah daftar (date_range, selections); default-nya `common_views()`.
+    Mengembalikan durasi per (agregat, view) dalam detik.
+    """
+    ingest.ensure_store()
+    data_version = ingest.data_version()
+    _remove_stale(data_version)
+    if views is None:
+        views = common_views()
+
+    durations = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_compute, spec, date_range, selections, data_version):
+                   (spec.cache_key, f"{date_range} {selections}")
+                   for date_range, selections in views for spec in aggregates}
+        for future in concurrent.futures.as_completed(futures):
+            durations[futures[future]] = future.result()
+    return durations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hitung di muka agregat halaman dashboard.")
+    parser.add_argument("--workers", type=int, help="jumlah proses worker (default: jumlah CPU)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    durations = precompute(workers=args.workers)
+    for (spec_key, view), seconds in sorted(durations.items(), key=lambda item: -item[1]):
+        print(f"{seconds:8.2f} s  {spec_key}  {view}")
+    print(f"{len(durations)} agregat selesai dalam {time.perf_counter() - start:.2f} s, disimpan di {PRECOMPUTED_DIR}")
@@ -0,0 +1,87 @@
+"""Render halaman secara progresif: KPI tampil dulu, grafik berat menyusul.
+
+Dengan `DASHBOARD_ASYNC_RENDER=1` (lihat `config.py`), pekerjaan berat
+sebuah halaman (render grafik matplotlib/seaborn termasuk KDE, layout
+WordCloud, HTML peta folium) tidak lagi dijalankan di tengah script. Di
+tempatnya dipasang placeholder, pekerjaannya dikirim ke thread pool
+bersama, dan script berlanjut ke elemen berikutnya sehingga `st.metric` dan
+elemen murah lainnya langsung tampil. Di akhir script, `Jobs.finish` mengisi
+placeholder sesuai urutan selesainya pekerjaan.
+
+Setiap rerun membuat `Jobs` baru untuk sesinya dan membatalkan milik rerun
+sebelumnya (token generasi): pekerjaan yang belum mulai tidak dijalankan,
+dan hasil pekerjaan yang sudah berjalan tidak ditampilkan (tetapi tetap masuk
+cache gambar, lihat `figures.py`).
+
+Pekerjaan di thread pool tidak boleh memanggil `st.*` dan harus memakai API
+objek matplotlib (`figures.subplots`), bukan state global `pyplot`.
+"""
+import concurrent.futures
+import threading
+
+import config
+import instrument
+
+EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=config.RENDER_WORKERS, thread_name_prefix="render")
+
+PLACEHOLDER_TEXT = "⏳ Memuat..."
+
+
+class Jobs:
+    """Pekerjaan render satu rerun satu sesi."""
+
+    def __init__(self, asynchronous=config.ASYNC_RENDER):
+        self.asynchronous = asynchronous
+        self._cancelled = threading.Event()
+        self._pending = []
+
+    def submit(self, name, compute, display, placeholder):
+        """Jalankan `compute()` lalu `display(placeholder, hasil)`.
+
+        Tanpa mode async keduanya langsung dijalankan. Dengan mode async
+        `placeholder` (mis. `st.empty()`) diisi teks tunggu dan `compute`
+        dijalankan di thread pool; `display` menyusul di `finish`.
+        """
+        if not self.asynchronous:
+            with instrument.timed(name):
+                display(placeholder, compute())
+            return
+        placeholder.caption(PLACEHOLDER_TEXT)
+        future = EXECUTOR.submit(self._run, name, compute)
+        self._pending.append((future, placeholder, display))
+
+    def _run(self, name, compute):
+        if self._cancelled.is_set():
+            return None
+        with instrument.timed(name) as step:
+            result = compute()
+        return step, result
+
+    def finish(self):
+        """Isi placeholder sesuai urutan selesainya pekerjaan (dipanggil di akhir script)."""
+        futures = {future: (placeholder, display) for future, placeholder, display in self._pending}
+        for future in concurrent.futures.as_completed(futures):
+            if self._cancelled.is_set():
+                return
+            outcome = future.result()
+            if outcome is None:
+                continue
+            step, result = outcome
+            instrument.record(step)
+            placeholder, display = futures[future]
+            display(placeholder, result)
+
+    def cancel(self):
+        self._cancelled.set()
+        for future, _, _ in self._pending:
+            future.cancel()
+
+
+def begin(session_state):
+    """`Jobs` baru untuk rerun ini; pekerjaan rerun sebelumnya di sesi yang sama dibatalkan."""
+    previous = session_state.get("_render_jobs")
+    if previous is not None:
+        previous.cancel()
+    jobs = Jobs()
+    session_state["_render_jobs"] = jobs
+    return jobs
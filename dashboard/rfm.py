@@ -0,0 +1,126 @@
+"""Mesin RFM (Recency, Frequency, Monetary) dengan state per pelanggan.
+
+State per pelanggan hanya berisi tiga kolom aditif: tanggal pembelian
+terakhir, jumlah transaksi, dan total belanja. State ini dibangun sekali
+saat ingest, diperbarui secara inkremental ketika order baru ditambahkan
+(`update_state`), dan skor/segmen dihitung ulang secara vectorised dari
+state tersebut. Pemetaan skor RFM ke segmen memakai lookup array berisi
+125 entri (5 x 5 x 5) sebagai ganti pencarian linear per pelanggan.
+
+Tambahkan order baru ke store (cube dan state RFM ikut diperbarui):
+
+    python dashboard/ingest.py --append order_baru.csv
+"""
+import numpy as np
+import pandas as pd
+
+SEGMENT_MAPPING = {
+    "Champions": ["555", "554", "544", "545", "454", "455", "445"],
+    "Loyal": ["543", "444", "435", "355", "354", "345", "344", "335"],
+    "Potential Loyalist": ["553", "551", "552", "541", "542", "533", "532", "531", "452", "451",
+                        "442", "441", "431", "453", "433", "432", "423", "353", "352", "351",
+                        "342", "341", "333", "323"],
+    "New Customers": ["512", "511", "422", "421", "412", "411", "311"],
+    "Promising": ["525", "524", "523", "522", "521", "515", "514", "513", "425", "424", "413",
+                "414", "415", "315", "314", "313"],
+    "Need Attention": ["535", "534", "443", "434", "343", "334", "325", "324"],
+    "About to Sleep": ["331", "321", "312", "221", "213", "231", "241", "251"],
+    "Cannot Lose Them but Losing": ["155", "154", "144", "214", "215", "115", "114", "113"],
+    "At Risk": ["255", "254", "245", "244", "253", "252", "243", "242", "235", "234", "225",
+                "224", "153", "152", "145", "143", "142", "135", "134", "133", "125", "124"],
+    "Hibernating Customers": ["332", "322", "233", "232", "223", "222", "132", "123", "122",
+                            "212", "211"],
+    "Losing but Engaged": ["111", "112", "121", "131", "141", "151"],
+    "Lost Customers": ["111", "112", "121", "131", "141", "151"]
+}
+
+# Batas kanan bin skor Frequency dan Monetary (skor 1 untuk nilai <= batas pertama, dst.)
+FREQUENCY_EDGES = [1, 2, 5, 10]
+MONETARY_EDGES = [50, 100, 200, 500]
+
+
+def _build_segment_lookup():
+    # Indeks lookup = (R-1)*25 + (F-1)*5 + (M-1); segmen pertama yang cocok menang
+    lookup = np.full(125, "Other", dtype=object)
+    assigned = np.zeros(125, dtype=bool)
+    for segment, scores in SEGMENT_MAPPING.items():
+        for score in scores:
+            r, f, m = (int(digit) for digit in score)
+            index = (r - 1) * 25 + (f - 1) * 5 + (m - 1)
+            if not assigned[index]:
+                lookup[index] = segment
+                assigned[index] = True
+    return lookup
+
+
+SEGMENT_LOOKUP = _build_segment_lookup()
+
+
+def build_state(df):
+    """State per pelanggan dari frame order (customer_code, order_purchase_timestamp, order_id, payment_value).
+
+    Index state adalah kunci pelanggan (lihat `schema.py`), bukan `customer_unique_id`.
+    """
+    customers = df["customer_code"]
+    grouped = df.groupby(customers, sort=False)
+    return pd.DataFrame({
+        "last_purchase": grouped["order_purchase_timestamp"].max(),
+        "frequency": grouped["order_id"].count(),
+        "monetary": df["payment_value"].astype("float64").groupby(customers, sort=False).sum(),
+    })
+
+
+def merge_states(state, other):
+    """Gabungkan dua state pelanggan (misalnya dari dua batch order yang berbeda)."""
+    merged = pd.concat([state, other]).groupby(level=0, sort=False).agg(
+        {"last_purchase": "max", "frequency": "sum", "monetary": "sum"})
+    return merged.rename_axis(state.index.name)
+
+
+def update_state(state, new_orders):
+    """Gabungkan state lama dengan order baru tanpa membaca ulang seluruh riwayat."""
+    return merge_states(state, build_state(new_orders))
+
+
+def _bin_scores(values, edges):
+    # Sama dengan pd.cut(..., include_lowest=True) pada interval tertutup kanan, tanpa error
+    # "bins must increase monotonically" ketika nilai maksimum lebih kecil dari batas terakhir
+    return np.searchsorted(edges, values, side="left") + 1
+
+
+def score(state):
+    """Hitung Recency/Frequency/Monetary, skor R/F/M, dan segmen untuk setiap pelanggan."""
+    if state.empty:
+        return pd.DataFrame(columns=["Recency", "Frequency", "Monetary", "R_Score", "F_Score", "M_Score", "Segment"])
+
+    latest_date = state["last_purchase"].max()
+    recency = (latest_date - state["last_purchase"]).dt.days.to_numpy()
+
+    # Skor Recency: kuantil 5 bagian seperti pd.qcut, nilai kecil (baru belanja) mendapat skor 5
+    quantiles = np.quantile(recency, [0.2, 0.4, 0.6, 0.8])
+    r_score = 5 - np.searchsorted(quantiles, recency, side="left")
+    f_score = _bin_scores(state["frequency"].to_numpy(), FREQUENCY_EDGES)
+    m_score = _bin_scores(state["monetary"].to_numpy(), MONETARY_EDGES)
+
+    index = (r_score - 1) * 25 + (f_score - 1) * 5 + (m_score - 1)
+    return pd.DataFrame({
+        "Recency": recency,
+        "Frequency": state["frequency"].to_numpy(),
+        "Monetary": state["monetary"].to_numpy(),
+        "R_Score": r_score,
+        "F_Score": f_score,
+        "M_Score": m_score,
+        "Segment": SEGMENT_LOOKUP[index],
+    }, index=state.index)
+
+
+def segment_counts(state):
+    return score(state)["Segment"].value_counts()
+
+
+def read_state(path):
+    return pd.read_parquet(path, engine="pyarrow")
+
+
+def write_state(state, path):
+    state.to_parquet(path, engine="pyarrow")
@@ -0,0 +1,170 @@
+"""Piramida rollup deret waktu (hari/minggu/bulan) untuk grafik tren.
+
+Setiap deret di `SERIES` (rata-rata review per tanggal review; jumlah
+pesanan dan pendapatan per tanggal pembelian) dijumlahkan saat ingest ke tiga
+level periode. Sel setiap level dikelompokkan menurut periode pembelian,
+kategori produk, metode pembayaran, status pesanan, dan periode sumbu-x
+deretnya, sehingga bisa digabung per batch ingest dan saat order ditambahkan.
+
+Saat query, periode yang seluruhnya berada di dalam rentang tanggal dibaca
+dari level yang diminta, sedangkan hari di tepi rentang dibaca dari level
+hari; hasilnya sama persis dengan mengelompokkan baris mentah. Resolusi
+dipilih otomatis dari panjang rentang tanggal (`choose_level`), lalu deret
+diperkecil ke anggaran titik tetap dengan LTTB (`downsample`), sehingga
+biaya query dan plot tidak bertambah seiring riwayat bertambah panjang.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+import filters
+import instrument
+
+# Level -> frekuensi periode pandas (minggu Senin-Minggu) dan perkiraan panjangnya dalam hari
+LEVELS = {"day": ("D", 1), "week": ("W-SUN", 7), "month": ("M", 30.44)}
+# Nama deret -> (kolom waktu sumbu x, measure aditif)
+SERIES = {
+    "review": ("review_creation_date", ["review_score_sum", "review_score_count"]),
+    "sales": ("order_purchase_timestamp", ["order_count", "payment_value_sum"]),
+}
+# Nama level untuk judul grafik
+LEVEL_LABELS = {"day": "Hari", "week": "Minggu", "month": "Bulan"}
+FILTER_COLUMNS = ["product_category_name", "payment_type", "order_status"]
+KEYS = ["purchase_period", *FILTER_COLUMNS, "period"]
+
+# Level dipilih bila jumlah periodenya paling banyak OVERSAMPLE x anggaran titik; sisanya diperkecil LTTB
+OVERSAMPLE = 4
+
+
+def period_start(values, level):
+    """Awal periode `level` untuk setiap nilai datetime (NaT tetap NaT)."""
+    values = np.asarray(values, dtype="datetime64[ns]")
+    if level == "month":
+        return values.astype("datetime64[M]").astype("datetime64[ns]")
+    days = values.astype("datetime64[D]")
+    if level == "week":
+        # 1970-01-01 jatuh pada hari Kamis; geser ke Senin di minggu yang sama
+        offset = (days.astype("int64") + 3) % 7
+        days = np.where(np.isnat(days), days, days - offset.astype("timedelta64[D]"))
+    return days.astype("datetime64[ns]")
+
+
+def _measures(df):
+    return pd.DataFrame({
+        "review_score_sum": df["review_score"].astype("float64").fillna(0),
+        "review_score_count": df["review_score"].notna().astype("float64"),
+        "order_count": df["order_id"].notna().astype("float64"),
+        "payment_value_sum": df["payment_value"].astype("float64").fillna(0),
+    }, index=df.index)
+
+
+def build_rollups(df):
+    """Tabel rollup setiap deret dan level dari frame order."""
+    measures = _measures(df)
+    rollups = {}
+    for level in LEVELS:
+        purchase_period = period_start(df["order_purchase_timestamp"], level)
+        for series, (time_column, columns) in SERIES.items():
+            frame = pd.concat([df[FILTER_COLUMNS], measures[columns]], axis=1).assign(
+                purchase_period=purchase_period, period=period_start(df[time_column], level))
+            cells = frame.groupby(KEYS, observed=True, dropna=False, sort=False)[columns].sum().reset_index()
+            rollups[f"{series}_{level}"] = cells.dropna(subset=["period"]).reset_index(drop=True)
+    return rollups
+
+
+def merge_rollups(rollups, other):
+    """Gabungkan dua kumpulan rollup (misalnya per batch ingest) dengan menjumlahkan sel yang sama."""
+    merged = {}
+    for name, cells in rollups.items():
+        columns = SERIES[name.rsplit("_", 1)[0]][1]
+        frame = pd.concat([cells, other[name]], ignore_index=True)
+        for col in FILTER_COLUMNS:
+            if isinstance(cells[col].dtype, pd.CategoricalDtype):
+                frame[col] = frame[col].astype("category")
+        merged[name] = frame.groupby(KEYS, observed=True, dropna=False, sort=False)[columns].sum().reset_index()
+    return merged
+
+
+def choose_level(date_range, points):
+    """Level paling halus yang jumlah periodenya pada `date_range` tidak lebih dari `OVERSAMPLE * points`."""
+    if date_range is None:
+        return "month"
+    days = (pd.Timestamp(date_range[1]) - pd.Timestamp(date_range[0])).days + 1
+    for level, (_, length) in LEVELS.items():
+        if days / length <= OVERSAMPLE * points:
+            return level
+    return "month"
+
+
+def _select(cells, date_range, selections):
+    instrument.add_rows(len(cells))
+    mask = filters.compile_mask(cells, date_range, selections, date_column="purchase_period")
+    return filters.apply_mask(cells, mask)
+
+
+def query(rollups, series, level, date_range=None, selections=None):
+    """Jumlah measure deret `series` per periode `level` pada filter aktif (index: awal periode, urut)."""
+    columns = SERIES[series][1]
+    cells = rollups[f"{series}_{level}"]
+    if date_range is None or level == "day":
+        parts = [_select(cells, date_range, selections)]
+    else:
+        start, end = (pd.Timestamp(value) for value in date_range)
+        freq = LEVELS[level][0]
+        # Periode penuh: awalnya >= start dan berakhir paling lambat di hari `end`
+        first = pd.Period(start, freq).start_time
+        first = first if first == start else (pd.Period(start, freq) + 1).start_time
+        stop = pd.Period(end + pd.Timedelta(days=1), freq).start_time
+        if first >= stop:
+            parts = [_select(rollups[f"{series}_day"], date_range, selections)]
+        else:
+            parts = [_select(cells, (first, stop - pd.Timedelta(days=1)), selections)]
+            # Hari di tepi rentang yang tidak mengisi satu periode penuh
+            for edge in [(start, first - pd.Timedelta(days=1)), (stop, end)]:
+                if edge[0] <= edge[1]:
+                    parts.append(_select(rollups[f"{series}_day"], edge, selections))
+    frame = pd.concat([part[["period", *columns]] for part in parts], ignore_index=True)
+    frame["period"] = period_start(frame["period"], level)
+    return frame.groupby("period")[columns].sum().sort_index()
+
+
+def lttb(x, y, points):
+    """Indeks titik terpilih algoritma Largest-Triangle-Three-Buckets (titik pertama dan terakhir selalu ikut)."""
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+    x, y = np.asarray(x, dtype="float64"), np.asarray(y, dtype="float64")
+    # Titik di antara titik pertama dan terakhir dibagi rata ke points - 2 bucket
+    bounds = np.floor(np.linspace(1, n - 1, points - 1)).astype("int64")
+    selected = np.empty(points, dtype="int64")
+    selected[0], selected[-1] = 0, n - 1
+    for i in range(points - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        # Titik acuan berikutnya: rata-rata bucket berikutnya (atau titik terakhir)
+        if i + 2 < len(bounds):
+            next_x, next_y = x[hi:bounds[i + 2]].mean(), y[hi:bounds[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        a = selected[i]
+        area = np.abs((x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a]))
+        selected[i + 1] = lo + np.argmax(area)
+    return selected
+
+
+def downsample(series, points):
+    """Perkecil deret ber-index waktu ke paling banyak `points` titik dengan LTTB."""
+    x = series.index.to_numpy(dtype="datetime64[ns]").view("int64")
+    return series.iloc[lttb(x, series.to_numpy(dtype="float64"), points)]
+
+
+def write_rollups(rollups, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, cells in rollups.items():
+        cells.to_parquet(os.path.join(directory, f"{name}.parquet"), engine="pyarrow", index=False)
+
+
+def read_rollups(directory):
+    return {f"{series}_{level}": pd.read_parquet(os.path.join(directory, f"{series}_{level}.parquet"),
+                                                 engine="pyarrow")
+            for series in SERIES for level in LEVELS}
@@ -0,0 +1,184 @@
+"""Cache indeks baris hasil filter sidebar (mode memory).
+
+Tabel order memory-mapped (`datacache.MappedOrders`) terurut menurut waktu
+pembelian, sehingga rentang tanggal selalu berupa potongan baris [awal,
+akhir) yang didapat dengan pencarian biner. Pilihan multiselect dijawab
+dari bitmap terkompresi (`np.packbits`, 1 bit per baris tabel):
+
+- bitmap per nilai (satu kategori produk, satu metode pembayaran, ...);
+- bitmap per dimensi = OR bitmap nilai-nilai yang dipilih;
+- hasil filter = AND bitmap setiap dimensi, dipotong ke rentang tanggal.
+
+Hasil filter disimpan sebagai array int32 terurut berisi posisi baris di
+frame `loaders.load_data` untuk rentang tanggal tersebut, dengan kunci
+signature filter yang dinormalisasi (`signature`). Semua entri berbagi satu
+cache LRU dengan batas memori, sehingga bolak-balik antar kombinasi filter
+yang sering dipakai tidak membangun mask ulang, dan kombinasi baru cukup
+menggabungkan bitmap yang sudah ada tanpa memindai kolom kategori lagi.
+"""
+import collections
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+def signature(date_range=None, selections=None):
+    """Kunci filter yang dinormalisasi: urutan pilihan dan filter kosong tidak berpengaruh."""
+    dates = None if date_range is None else tuple(pd.Timestamp(value).date() for value in date_range)
+    chosen = tuple(sorted((column, tuple(sorted(map(str, values))))
+                          for column, values in (selections or {}).items() if values))
+    return dates, chosen
+
+
+def _nbytes(entry):
+    if isinstance(entry, tuple):
+        codes, categories = entry
+        return codes.nbytes + categories.memory_usage(deep=True)
+    return entry.nbytes
+
+
+class RowIndex:
+    """Cache LRU bitmap filter dan indeks baris hasil filter untuk satu `MappedOrders`, dibatasi `max_bytes`.
+
+    Kode kategori kolom filter (bahan bitmap per nilai) ikut disimpan di LRU
+    yang sama, sehingga seluruh isi indeks berada dalam batas `max_bytes`.
+    """
+
+    def __init__(self, mapped, max_bytes):
+        self.mapped = mapped
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return True, self._entries[key]
+
+    def _put(self, key, entry):
+        with self._lock:
+            if key in self._entries:
+                self.size -= _nbytes(self._entries.pop(key))
+            if _nbytes(entry) > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.size += _nbytes(entry)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= _nbytes(evicted)
+
+    def _column_codes(self, column):
+        # Kode kategori seluruh tabel (-1 untuk NaN) dan nilai dictionary-nya
+        key = ("codes", column)
+        found, entry = self._get(key)
+        if not found:
+            values = self.mapped.table[column].combine_chunks()
+            if not pa.types.is_dictionary(values.type):
+                values = pc.dictionary_encode(values)
+            codes = pc.fill_null(values.indices, -1).to_numpy(zero_copy_only=False)
+            entry = codes, pd.Index([str(value) for value in values.dictionary.to_pylist()])
+            self._put(key, entry)
+        return entry
+
+    def value_bitmap(self, column, value):
+        """Bitmap baris seluruh tabel dengan `column == value`."""
+        key = ("value", column, value)
+        found, bits = self._get(key)
+        if not found:
+            codes, categories = self._column_codes(column)
+            code = categories.get_indexer([value])[0]
+            bits = np.packbits(codes == code) if code >= 0 else np.zeros((len(codes) + 7) // 8, np.uint8)
+            self._put(key, bits)
+        return bits
+
+    def dimension_bitmap(self, column, values):
+        """Bitmap baris seluruh tabel dengan `column` salah satu dari `values` (tuple terurut)."""
+        if len(values) == 1:
+            return self.value_bitmap(column, values[0])
+        key = ("dimension", column, values)
+        found, bits = self._get(key)
+        if not found:
+            bits = self.value_bitmap(column, values[0])
+            for value in values[1:]:
+                bits = bits | self.value_bitmap(column, value)
+            self._put(key, bits)
+        return bits
+
+    def rows(self, date_range=None, selections=None):
+        """Posisi baris (int32 terurut) frame `load_data` pada `date_range` yang lolos `selections`.
+
+        None berarti semua baris lolos, seperti mask kosong di `filters.compile_mask`.
+        """
+        key = ("rows", signature(date_range, selections))
+        chosen = key[1][1]
+        if not chosen:
+            return None
+        found, rows = self._get(key)
+        if not found:
+            bits = None
+            for column, values in chosen:
+                dimension = self.dimension_bitmap(column, values)
+                bits = dimension if bits is None else bits & dimension
+            start, stop = self.mapped.bounds(date_range)
+            # Buka bitmap hanya pada byte yang mencakup potongan rentang tanggal
+            mask = np.unpackbits(bits[start // 8:(stop + 7) // 8])[start % 8:start % 8 + stop - start]
+            rows = np.flatnonzero(mask).astype(np.int32)
+            self._put(key, rows)
+        return rows
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def verify(index, combinations, seed=0):
+    """Bandingkan `rows` dengan `filters.compile_mask` pada kombinasi filter acak; True jika semuanya sama."""
+    import filters
+
+    rng = np.random.default_rng(seed)
+    frame = index.mapped.read()
+    start_date, end_date = frame[filters.DATE_COLUMN].min().date(), frame[filters.DATE_COLUMN].max().date()
+    days = (end_date - start_date).days
+    ok = True
+    for _ in range(combinations):
+        first, last = np.sort(rng.integers(0, days + 1, size=2))
+        date_range = (start_date + pd.Timedelta(days=int(first)), start_date + pd.Timedelta(days=int(last)))
+        selections = {}
+        for column in ["product_category_name", "payment_type", "order_status"]:
+            values = list(frame[column].cat.categories)
+            selections[column] = list(rng.choice(values, size=rng.integers(0, 4), replace=False))
+        view = index.mapped.read(date_range=date_range)
+        expected = filters.apply_mask(view, filters.compile_mask(view, selections=selections))
+        actual = filters.apply_mask(view, index.rows(date_range, selections))
+        same = expected.equals(actual)
+        ok &= same
+        if not same:
+            print(f"[BEDA] {date_range} {selections}")
+    print(f"{combinations} kombinasi, {len(index)} entri cache ({index.size / 1024:.0f} KiB), "
+          f"hit {index.hits}, miss {index.misses}")
+    return ok
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    import datacache
+    import ingest
+
+    parser = argparse.ArgumentParser(description="Cache indeks baris hasil filter.")
+    parser.add_argument("--verify", type=int, metavar="N", help="bandingkan N kombinasi filter acak dengan mask biasa")
+    parser.add_argument("--max-mb", type=float, default=1)
+    args = parser.parse_args()
+    if args.verify:
+        ingest.ensure_store()
+        index = RowIndex(datacache.MappedOrders.open(ingest.data_version()), int(args.max_mb * 1024 * 1024))
+        sys.exit(0 if verify(index, args.verify) else 1)
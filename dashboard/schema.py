@@ -0,0 +1,115 @@
+"""Skema bintang store: tabel fakta order yang ramping dan tabel dimensi.
+
+`main_data.csv` mengulang ID heksadesimal 32 karakter (pelanggan, produk,
+seller) di setiap baris. Saat ingest setiap ID diganti kunci surrogate int32
+yang menunjuk ke baris tabel dimensinya, sehingga tabel fakta hanya berisi
+angka dan kolom kategori (dictionary encoding). Kunci bersifat stabil: ID
+baru dari order yang ditambahkan mendapat kunci berikutnya tanpa mengubah
+kunci lama, sehingga cube dan state yang dikunci dengannya tetap bisa
+digabung.
+
+Tabel dimensi disimpan di `store/dims/`:
+
+- customers: `customer_unique_id`, `first_purchase` (pembelian pertama);
+- products: `product_id` dan atribut dari `data/products_dataset.csv`;
+- sellers: `seller_id` dan atribut dari `data/sellers_dataset.csv`;
+- categories: nama kategori beserta terjemahan bahasa Inggrisnya.
+
+Atribut dimensi hanya digabungkan ke hasil agregat yang membutuhkannya
+(lihat `label`), bukan ke setiap baris order.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+# Nama dimensi -> (kolom ID asli, kolom kunci surrogate di tabel fakta)
+DIMENSIONS = {
+    "customers": ("customer_unique_id", "customer_code"),
+    "products": ("product_id", "product_key"),
+    "sellers": ("seller_id", "seller_key"),
+}
+
+# Tabel sumber di folder data/ yang menjadi atribut dimensi (nama dimensi -> (file, kolom gabung))
+SOURCE_TABLES = {
+    "products": ("products_dataset.csv", "product_id"),
+    "sellers": ("sellers_dataset.csv", "seller_id"),
+    "categories": ("product_category_name_translation.csv", "product_category_name"),
+}
+
+
+def empty_dimensions():
+    dims = {name: pd.DataFrame({id_column: pd.Series(dtype="object")})
+            for name, (id_column, _) in DIMENSIONS.items()}
+    dims["customers"]["first_purchase"] = pd.Series(dtype="datetime64[ns]")
+    return dims
+
+
+def _assign_keys(dimension, ids):
+    """Tambahkan ID baru ke dimensi; kembalikan (dimensi, kunci Int32 per baris, NA untuk ID kosong)."""
+    id_column = dimension.columns[0]
+    known = pd.Index(dimension[id_column])
+    new = pd.Index(ids.dropna().unique()).difference(known, sort=False)
+    if len(new):
+        dimension = pd.concat([dimension, pd.DataFrame({id_column: new})], ignore_index=True)
+        known = pd.Index(dimension[id_column])
+    keys = known.get_indexer(ids)
+    return dimension, pd.arrays.IntegerArray(np.maximum(keys, 0).astype("int32"), keys < 0)
+
+
+def update_dimensions(dims, orders):
+    """Beri kunci surrogate ke order (kolom `*_code`/`*_key`) dan perbarui tabel dimensi.
+
+    Kolom ID asli tetap ada di `orders` sampai ditulis (lihat `fact_table`).
+    """
+    dims = dict(dims)
+    for name, (id_column, key_column) in DIMENSIONS.items():
+        dims[name], orders[key_column] = _assign_keys(dims[name], orders[id_column])
+
+    # Pembelian pertama = yang paling awal di antara dimensi lama dan order baru
+    customers = dims["customers"]
+    first = orders.groupby("customer_code", observed=True)["order_purchase_timestamp"].min()
+    position = first.index.to_numpy(dtype="int64")
+    current = customers["first_purchase"].iloc[position].reset_index(drop=True)
+    customers.loc[position, "first_purchase"] = pd.concat(
+        [current, first.reset_index(drop=True)], axis=1).min(axis=1).to_numpy()
+    return dims
+
+
+def fact_table(orders):
+    """Tabel fakta yang ditulis ke store: order tanpa kolom ID dimensi."""
+    return orders.drop(columns=[id_column for id_column, _ in DIMENSIONS.values()])
+
+
+def join_attributes(dims, sources):
+    """Gabungkan atribut dari tabel sumber `data/` (sudah dibaca sebagai frame) ke dimensi."""
+    dims = dict(dims)
+    for name, (_, on) in SOURCE_TABLES.items():
+        if name not in sources:
+            continue
+        attributes = sources[name].drop_duplicates(on)
+        if name in dims:
+            # Atribut lama dibuang dulu agar penggabungan ulang (saat append) tidak menggandakan kolom
+            dims[name] = dims[name][[on]].merge(attributes, on=on, how="left")
+        else:
+            dims[name] = attributes.reset_index(drop=True)
+    return dims
+
+
+def write_dimensions(dims, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, table in dims.items():
+        table.to_parquet(os.path.join(directory, f"{name}.parquet"), engine="pyarrow", index=False)
+
+
+def read_dimension(directory, name, columns=None):
+    return pd.read_parquet(os.path.join(directory, f"{name}.parquet"), engine="pyarrow", columns=columns)
+
+
+def label(frame, key_column, dimension, columns=None):
+    """Gabungkan atribut dimensi ke hasil agregat berdasarkan kolom kunci surrogate-nya."""
+    attributes = dimension if columns is None else dimension[columns]
+    keys = frame[key_column].to_numpy(dtype="int64")
+    labels = attributes.iloc[keys].reset_index(drop=True)
+    labels.index = frame.index
+    return pd.concat([frame, labels], axis=1)
@@ -0,0 +1,148 @@
+"""Sketch jumlah nilai unik (distinct count) per sel filter sidebar.
+
+Jumlah order dan pelanggan unik tidak bisa dijumlahkan dari sel cube: satu
+order dengan beberapa item bisa jatuh di beberapa kategori produk atau
+metode pembayaran. Karena itu saat ingest disimpan tiga tabel per sel filter
+(hari pembelian, kategori produk, metode pembayaran, status pesanan),
+seperti cuboid di `cube.py`:
+
+- `orders`: id order yang muncul di sel (hash 64-bit order_id, seperti id
+  kata di `terms.py`);
+- `customers`: kode pelanggan (kunci surrogate dari `schema.py`) beserta
+  jumlah baris dan jumlah order-nya di sel;
+- `hll`: register HyperLogLog (2^`P` register) id order dalam bentuk jarang,
+  satu baris per register yang tidak nol.
+
+Jumlah unik eksak untuk filter apa pun diperoleh dengan menggabungkan
+(union) id dari sel yang lolos filter; kode pelanggan yang rapat digabung
+lewat `np.bincount` seperti bitmap. Perkiraan HLL cukup mengambil maksimum
+per register. Ketiganya tidak membaca baris mentah dan dapat digabung per
+batch ingest maupun saat order ditambahkan.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+import cube
+import filters
+import instrument
+
+# Presisi HyperLogLog: 2^P register, galat baku sekitar 1.04 / sqrt(2^P) (~0.8%)
+P = 14
+REGISTERS = 1 << P
+
+# Nama tabel -> (kolom id, measure dan fungsi penggabungnya)
+TABLES = {
+    "orders": ("order_hash", {"rows": "sum"}),
+    "customers": ("customer_code", {"rows": "sum", "order_rows": "sum"}),
+    "hll": ("register", {"rank": "max"}),
+}
+
+
+def hll_registers(hashes):
+    """(indeks register, rank) HyperLogLog dari hash uint64."""
+    index = (hashes >> np.uint64(64 - P)).astype("int64")
+    rest = (hashes & np.uint64((1 << (64 - P)) - 1)).astype("float64")
+    # Panjang bit sisa hash lewat eksponen frexp (eksak karena nilainya < 2^53)
+    _, length = np.frexp(rest)
+    return index, (64 - P - length + 1).astype("int8")
+
+
+def hll_estimate(registers):
+    """Perkiraan jumlah unik dari register HyperLogLog rapat, dengan linear counting untuk jumlah kecil."""
+    m = registers.size
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.ldexp(1.0, -registers.astype("int64")).sum()
+    zeros = np.count_nonzero(registers == 0)
+    if raw <= 2.5 * m and zeros:
+        return m * np.log(m / zeros)
+    return raw
+
+
+def _cells(dims, name, ids, measures):
+    id_column, how = TABLES[name]
+    frame = dims.assign(**{id_column: ids}, **measures)
+    keys = cube.FILTER_DIMS + [id_column]
+    return frame.groupby(keys, observed=True, dropna=False, sort=False).agg(how).reset_index()
+
+
+def build_sketches(df):
+    """Tabel sketch per sel filter dari frame order (setelah `schema.update_dimensions`)."""
+    dims = pd.DataFrame({
+        "purchase_day": df["order_purchase_timestamp"].dt.normalize(),
+        "product_category_name": df["product_category_name"],
+        "payment_type": df["payment_type"],
+        "order_status": df["order_status"],
+    }, index=df.index)
+    has_order = df["order_id"].notna()
+    hashes = pd.util.hash_array(df.loc[has_order, "order_id"].to_numpy(dtype=object))
+    register, rank = hll_registers(hashes)
+    has_customer = df["customer_code"].notna()
+    return {
+        "orders": _cells(dims[has_order], "orders", hashes.view("int64"), {"rows": 1}),
+        "customers": _cells(dims[has_customer], "customers", df.loc[has_customer, "customer_code"],
+                            {"rows": 1, "order_rows": has_order[has_customer].astype("int64")}),
+        "hll": _cells(dims[has_order], "hll", register, {"rank": rank}),
+    }
+
+
+def merge_sketches(sketches, other):
+    """Gabungkan dua kumpulan sketch (misalnya per batch ingest)."""
+    merged = {}
+    for name, (id_column, how) in TABLES.items():
+        keys = cube.FILTER_DIMS + [id_column]
+        cells = pd.concat([sketches[name], other[name]], ignore_index=True)
+        for col in keys:
+            if isinstance(sketches[name][col].dtype, pd.CategoricalDtype):
+                cells[col] = cells[col].astype("category")
+        merged[name] = cells.groupby(keys, observed=True, dropna=False, sort=False).agg(how).reset_index()
+    return merged
+
+
+def _select(cells, date_range, selections):
+    instrument.add_rows(len(cells))
+    return filters.apply_mask(cells, filters.compile_mask(cells, date_range, selections, date_column="purchase_day"))
+
+
+def distinct_orders(sketches, date_range=None, selections=None):
+    """Jumlah order unik (eksak) pada filter aktif, setara `df["order_id"].nunique()`."""
+    return len(pd.unique(_select(sketches["orders"], date_range, selections)["order_hash"].to_numpy()))
+
+
+def estimate_orders(sketches, date_range=None, selections=None):
+    """Perkiraan HyperLogLog jumlah order unik pada filter aktif."""
+    cells = _select(sketches["hll"], date_range, selections)
+    registers = np.zeros(REGISTERS, dtype="int8")
+    np.maximum.at(registers, cells["register"].to_numpy(dtype="int64"), cells["rank"].to_numpy(dtype="int8"))
+    return hll_estimate(registers)
+
+
+def customer_orders(sketches, date_range=None, selections=None):
+    """Jumlah order per pelanggan pada filter aktif, setara `df.groupby("customer_code")["order_id"].count()`."""
+    cells = _select(sketches["customers"], date_range, selections)
+    codes = cells["customer_code"].to_numpy(dtype="int64")
+    present = np.bincount(codes) > 0
+    counts = np.bincount(codes, weights=cells["order_rows"].to_numpy(dtype="float64"))
+    return pd.Series(counts[present].astype("int64"), index=pd.Index(np.flatnonzero(present), name="customer_code"),
+                     name="order_id")
+
+
+def customer_months(sketches, date_range=None, selections=None):
+    """(kode pelanggan, bulan sejak 1970, jumlah baris) per sel pelanggan yang lolos filter."""
+    cells = _select(sketches["customers"], date_range, selections)
+    months = cells["purchase_day"].to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+    valid = ~np.isnat(months)
+    return (cells["customer_code"].to_numpy(dtype="int64")[valid], months[valid].astype("int64"),
+            cells["rows"].to_numpy(dtype="int64")[valid])
+
+
+def write_sketches(sketches, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, cells in sketches.items():
+        cells.to_parquet(os.path.join(directory, f"{name}.parquet"), engine="pyarrow", index=False)
+
+
+def read_sketches(directory):
+    return {name: pd.read_parquet(os.path.join(directory, f"{name}.parquet"), engine="pyarrow")
+            for name in TABLES}
@@ -0,0 +1,367 @@
+"""Mode eksekusi streaming (out-of-core) untuk riwayat order yang lebih besar dari RAM.
+
+Aktifkan dengan `DASHBOARD_EXECUTION_MODE=streaming` (lihat `config.py`).
+Pada mode ini dashboard tidak memuat seluruh data hasil filter sebagai satu
+DataFrame. Setiap agregat yang masih membutuhkan baris mentah didefinisikan
+sebagai map-reduce (`Aggregate`): `partial` dihitung per batch dari iterator
+row group Parquet (filter sidebar di-pushdown ke pembaca), hasil parsial
+digabung dengan `combine`, dan `finalize` menghasilkan nilai yang sama dengan
+perhitungan pandas di mode memory. Memori yang dipakai sebanding dengan
+ukuran hasil agregat, bukan jumlah baris.
+
+Validasi bahwa hasil mode streaming sama dengan mode memory:
+
+    python dashboard/streaming.py --validate
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import binning
+import config
+import filters
+import ingest
+import instrument
+import rfm
+import rollup
+import sketches
+import terms
+import validation
+
+# Kolom turunan yang dihitung dari kolom mentah bila tidak disimpan di store
+# (kolom turunan pengiriman sudah dihitung saat ingest, lihat ingest.derive_columns)
+DERIVED_COLUMNS = {
+    "review_creation_day": (["review_creation_date"], lambda df: df["review_creation_date"].dt.date),
+}
+
+
+def source_columns(names):
+    columns = []
+    for name in names:
+        for column in DERIVED_COLUMNS[name][0] if name in DERIVED_COLUMNS else [name]:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def column(df, name):
+    if name in df.columns or name not in DERIVED_COLUMNS:
+        return df[name]
+    return DERIVED_COLUMNS[name][1](df)
+
+
+def iter_frames(columns, date_range=None, selections=None, batch_rows=None):
+    """Iterasi batch DataFrame dari store Parquet dengan filter di-pushdown.
+
+    Selalu menghasilkan minimal satu frame (mungkin kosong) agar setiap
+    agregat punya hasil parsial.
+    """
+    dataset = ds.dataset(ingest.store_path(ingest.ORDERS_DIR), format="parquet", partitioning="hive")
+    predicates = filters.arrow_filters(date_range, selections)
+    expression = pq.filters_to_expression(predicates) if predicates else None
+    empty = True
+    for batch in dataset.to_batches(columns=columns, filter=expression, batch_size=batch_rows or config.BATCH_ROWS):
+        if batch.num_rows:
+            empty = False
+            instrument.add_rows(batch.num_rows)
+            yield batch.to_pandas()
+    if empty:
+        yield dataset.schema.empty_table().select(columns).to_pandas()
+
+
+class Aggregate:
+    """Agregat map-reduce: `partial` per batch, `combine` antar batch, `finalize` di akhir."""
+    inputs = []
+
+    @property
+    def columns(self):
+        return source_columns(self.inputs)
+
+    @property
+    def cache_key(self):
+        """Identitas agregat (jenis dan parameternya), dipakai sebagai kunci cache."""
+        return repr((type(self).__name__, sorted(vars(self).items())))
+
+    def partial(self, df):
+        raise NotImplementedError
+
+    def combine(self, left, right):
+        return left.add(right, fill_value=0)
+
+    def finalize(self, acc):
+        return acc
+
+    def compute(self, df):
+        """Mode memory: seluruh frame diperlakukan sebagai satu batch."""
+        instrument.add_rows(len(df))
+        return self.finalize(self.partial(df))
+
+    def stream(self, frames):
+        """Mode streaming: `frames` adalah fungsi tanpa argumen yang menghasilkan iterator batch."""
+        acc = None
+        for frame in frames():
+            part = self.partial(frame)
+            acc = part if acc is None else self.combine(acc, part)
+        return self.finalize(acc)
+
+
+class Mean(Aggregate):
+    """Rata-rata satu kolom, setara `df[value].mean()`."""
+
+    def __init__(self, value):
+        self.inputs = [value]
+
+    def partial(self, df):
+        values = column(df, self.inputs[0])
+        return pd.Series({"sum": values.astype("float64").sum(), "count": values.count()})
+
+    def finalize(self, acc):
+        return acc["sum"] / acc["count"] if acc["count"] else np.nan
+
+
+class GroupMean(Aggregate):
+    """Rata-rata per grup, setara `df.groupby(keys)[value].mean()`."""
+
+    def __init__(self, keys, value):
+        self.keys, self.value = list(keys), value
+        self.inputs = self.keys + [value]
+
+    def partial(self, df):
+        keys = [column(df, key).rename(key) for key in self.keys]
+        values = column(df, self.value).astype("float64")
+        return values.groupby(keys).agg(["sum", "count"])
+
+    def finalize(self, acc):
+        return (acc["sum"] / acc["count"].where(acc["count"] != 0)).rename(self.value).sort_index()
+
+
+class GroupSize(Aggregate):
+    """Jumlah baris per grup, setara `df.groupby(keys).size()`."""
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.inputs = self.keys
+
+    def partial(self, df):
+        return df.groupby(self.keys).size()
+
+    def finalize(self, acc):
+        return acc.astype("int64")
+
+
+class Histogram(Aggregate):
+    """Histogram dengan tepi bin sama seperti `sns.histplot(values, bins=n)`.
+
+    Mode streaming membaca data dua kali: pertama untuk min/max, kedua untuk
+    menghitung isi bin. Hasilnya (counts, edges).
+    """
+
+    def __init__(self, value, bins):
+        self.value, self.bins = value, bins
+        self.inputs = [value]
+
+    def _values(self, df):
+        values = column(df, self.value).to_numpy(dtype="float64", na_value=np.nan)
+        return values[np.isfinite(values)]
+
+    def compute(self, df):
+        instrument.add_rows(len(df))
+        values = self._values(df)
+        return np.histogram(values, bins=np.histogram_bin_edges(values, self.bins))
+
+    def stream(self, frames):
+        low, high = np.inf, -np.inf
+        for frame in frames():
+            values = self._values(frame)
+            if values.size:
+                low, high = min(low, values.min()), max(high, values.max())
+        if low > high:
+            return np.histogram(np.array([]), bins=self.bins)
+        edges = np.histogram_bin_edges(np.array([low, high]), self.bins)
+        counts = np.zeros(self.bins, dtype="int64")
+        for frame in frames():
+            counts += np.histogram(self._values(frame), bins=edges)[0]
+        return counts, edges
+
+
+class CustomerTrend(Aggregate):
+    """Jumlah pelanggan baru dan lama per bulan.
+
+    Pelanggan baru pada suatu bulan adalah pelanggan yang pembelian pertamanya
+    (di seluruh riwayat, dari indeks pelanggan yang dibangun saat ingest) jatuh
+    di bulan itu; pelanggan lama punya order lain di bulan itu. Hanya order
+    yang lolos filter sidebar yang dihitung. Hasil parsial berupa jumlah baris
+    per kunci int64 (kode pelanggan, bulan), sehingga tidak perlu mengurutkan
+    data maupun menghitung `nunique`.
+    """
+    inputs = ["customer_code", "order_purchase_timestamp"]
+
+    # Kunci = kode pelanggan * MONTH_SLOTS + bulan sejak 1970
+    MONTH_SLOTS = 1 << 12
+
+    def partial(self, df):
+        codes = df["customer_code"].to_numpy(dtype="int64", na_value=-1)
+        months = df["order_purchase_timestamp"].to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+        valid = (codes >= 0) & ~np.isnat(months)
+        return self.counts(codes[valid], months[valid].astype("int64"))
+
+    @classmethod
+    def counts(cls, codes, months, rows=None):
+        """Hasil parsial dari kode pelanggan, bulan sejak 1970, dan jumlah baris (default 1 per elemen)."""
+        keys = pd.Series(codes * cls.MONTH_SLOTS + months, dtype="int64")
+        if rows is None:
+            return keys.value_counts(sort=False)
+        return pd.Series(rows, dtype="int64").groupby(keys.to_numpy(), sort=False).sum()
+
+    def finalize(self, acc):
+        keys, rows = acc.index.to_numpy(dtype="int64"), acc.to_numpy()
+        codes, months = np.divmod(keys, self.MONTH_SLOTS)
+        # Bulan pembelian pertama setiap pelanggan, diindeks dengan kode pelanggan
+        first_purchase = ingest.read_dimension("customers", columns=["first_purchase"])["first_purchase"]
+        first_month = first_purchase.to_numpy(dtype="datetime64[ns]").astype("datetime64[M]").astype("int64")
+        is_first = months == first_month[codes]
+        is_existing = ~is_first | (rows > 1)
+
+        # Jumlah pelanggan per bulan lewat bincount (posisi = bulan - bulan terawal)
+        offset = months.min() if months.size else 0
+        position = months - offset
+        span = position.max() + 1 if months.size else 0
+        trend = pd.DataFrame({
+            "existing_customers": np.bincount(position[is_existing], minlength=span),
+            "new_customers": np.bincount(position[is_first], minlength=span),
+        }, index=np.arange(span) + offset)
+        # Hanya bulan yang punya order setelah filter
+        trend = trend[np.bincount(position, minlength=span) > 0]
+        months = trend.index.to_numpy()
+        trend.index = pd.PeriodIndex.from_fields(year=months // 12 + 1970, month=months % 12 + 1, freq="M")
+        return trend.rename_axis("purchase_month").reset_index()
+
+
+class RFMState(Aggregate):
+    """State RFM per pelanggan (lihat `rfm.py`)."""
+    inputs = ["customer_code", "order_purchase_timestamp", "order_id", "payment_value"]
+
+    def partial(self, df):
+        return rfm.build_state(df)
+
+    def combine(self, left, right):
+        return rfm.merge_states(left, right)
+
+
+def run(aggregate, date_range=None, selections=None, batch_rows=None):
+    """Hitung agregat secara streaming dari store Parquet untuk filter sidebar yang aktif."""
+    return aggregate.stream(lambda: iter_frames(aggregate.columns, date_range, selections, batch_rows))
+
+
+def _reference(df, first_purchase):
+    """Perhitungan acuan di memori, langsung dari kolom mentah.
+
+    `first_purchase` adalah pembelian pertama setiap pelanggan di seluruh riwayat.
+    """
+    df = df.copy()
+    df["delivery_duration"] = (df["order_delivered_customer_date"] - df["order_purchase_timestamp"]).dt.days
+    df["delay_days"] = (df["order_delivered_customer_date"] - df["order_estimated_delivery_date"]).dt.days
+    df["review_creation_day"] = df["review_creation_date"].dt.date
+
+    trend = df.sort_values("order_purchase_timestamp")
+    first_month = trend["customer_unique_id"].map(first_purchase).dt.to_period("M")
+    trend["is_new_customer"] = (~trend.duplicated(subset=["customer_unique_id"], keep="first")
+                                & (trend["order_purchase_timestamp"].dt.to_period("M") == first_month))
+    trend["purchase_month"] = trend["order_purchase_timestamp"].dt.to_period("M")
+    trend = trend.groupby(["purchase_month", "is_new_customer"])["customer_unique_id"].nunique().unstack()
+
+    # Frekuensi seluruh kosakata, lalu 100 teratas (seri dipecah menurut abjad)
+    from sklearn.feature_extraction.text import CountVectorizer
+    vectorizer = CountVectorizer()
+    counts = vectorizer.fit_transform(df["review_comment_message"].dropna()).sum(axis=0).A1
+    vocabulary = pd.DataFrame({"term": vectorizer.get_feature_names_out(), "count": counts})
+    terms = sorted(vocabulary.sort_values(["count", "term"], ascending=[False, True]).head(100)["term"])
+
+    delay = df["delay_days"].dropna().to_numpy(dtype="float64")
+    return {
+        "total_orders": df["order_id"].nunique(),
+        "geo_delivery": df.groupby(["customer_lat", "customer_lng"])["delivery_duration"].mean(),
+        "geo_transactions": df.groupby(["customer_lat", "customer_lng"]).size(),
+        "median_orders": df.groupby("customer_unique_id")["order_id"].count().median(),
+        "new_customers": trend.get(True, pd.Series(dtype="float64")).sum(),
+        "existing_customers": trend.get(False, pd.Series(dtype="float64")).sum(),
+        "review_trend": df.groupby("review_creation_day")["review_score"].mean(),
+        "review_trend_weekly": df.groupby(df["review_creation_date"].dt.to_period("W-SUN").dt.start_time)[
+            "review_score"].mean(),
+        "average_rating": df["review_score"].mean(),
+        "delay_histogram": np.histogram(delay, bins=np.histogram_bin_edges(delay, 30))[0],
+        "top_terms": terms,
+        "rfm_segments": rfm.segment_counts(rfm.build_state(df)),
+    }
+
+
+def _streamed(date_range, selections, batch_rows):
+    def stream(aggregate):
+        return run(aggregate, date_range, selections, batch_rows)
+
+    # KPI jumlah unik dibaca dari sketch per sel filter, seperti di dashboard
+    index = ingest.read_sketches()
+    # Tren review dibaca dari piramida rollup, seperti di dashboard
+    rollups = ingest.read_rollups()
+
+    def ratio(sums):
+        return (sums["review_score_sum"] / sums["review_score_count"]).dropna()
+
+    review_trend = ratio(rollup.query(rollups, "review", "day", date_range, selections))
+    review_trend.index = review_trend.index.date
+    trend = CustomerTrend()
+    trend = trend.finalize(trend.counts(*sketches.customer_months(index, date_range, selections)))
+    return {
+        "total_orders": sketches.distinct_orders(index, date_range, selections),
+        "geo_delivery": stream(GroupMean(["customer_lat", "customer_lng"], "delivery_duration")),
+        "geo_transactions": stream(GroupSize(["customer_lat", "customer_lng"])),
+        "median_orders": sketches.customer_orders(index, date_range, selections).median(),
+        "new_customers": trend["new_customers"].sum(),
+        "existing_customers": trend["existing_customers"].sum(),
+        "review_trend": review_trend,
+        "review_trend_weekly": ratio(rollup.query(rollups, "review", "week", date_range, selections)),
+        "average_rating": stream(Mean("review_score")),
+        "delay_histogram": binning.query(ingest.read_bins(), "delay_days", date_range, selections, 30)[0],
+        "top_terms": terms.top_terms(ingest.read_terms(), date_range, selections, 100),
+        "rfm_segments": rfm.segment_counts(stream(RFMState())),
+    }
+
+
+def validate(scenarios, batch_rows=1000):
+    """Bandingkan setiap KPI mode streaming dengan mode memory; True jika semuanya sama."""
+    ok = True
+    # Acuan dihitung dengan ID pelanggan asli, dipulihkan dari dimensi pelanggan
+    customer_ids = ingest.read_dimension("customers", columns=["customer_unique_id"])["customer_unique_id"].to_numpy()
+
+    def with_customer_ids(df):
+        codes = df["customer_code"].to_numpy(dtype="int64", na_value=-1)
+        df["customer_unique_id"] = np.where(codes >= 0, customer_ids[np.maximum(codes, 0)], None)
+        return df
+
+    history = with_customer_ids(ingest.read_orders(columns=["customer_code", "order_purchase_timestamp"]))
+    first_purchase = history.groupby("customer_unique_id")["order_purchase_timestamp"].min()
+    for name, (date_range, selections) in scenarios.items():
+        df = ingest.read_orders(filters=filters.arrow_filters(date_range))
+        df = with_customer_ids(filters.apply_mask(df, filters.compile_mask(df, selections=selections)))
+        expected = _reference(df, first_purchase)
+        actual = _streamed(date_range, selections, batch_rows)
+        for kpi in expected:
+            same = validation.same(expected[kpi], actual[kpi])
+            ok &= same
+            print(f"[{'OK' if same else 'BEDA'}] {name}: {kpi}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mode streaming dashboard.")
+    parser.add_argument("--validate", action="store_true", help="bandingkan hasil streaming dengan mode memory")
+    parser.add_argument("--batch-rows", type=int, default=1000, help="ukuran batch saat validasi")
+    args = parser.parse_args()
+
+    if args.validate:
+        ingest.ensure_store()
+        sys.exit(0 if validate(validation.scenarios(), args.batch_rows) else 1)
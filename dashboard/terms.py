@@ -0,0 +1,84 @@
+"""Indeks frekuensi kata ulasan untuk WordCloud.
+
+Teks ulasan ditokenisasi sekali saat ingest dengan aturan yang sama seperti
+`CountVectorizer` (huruf kecil, token `\\b\\w\\w+\\b`). Setiap kata diberi id
+hash int64, lalu jumlah kemunculannya disimpan sebagai tabel panjang yang
+jarang (sparse): satu baris per (dimensi filter sidebar, id kata), seperti
+cuboid di `cube.py`. Kata teratas untuk kombinasi filter apa pun diperoleh
+dengan menjumlahkan sel yang lolos filter per id kata, tanpa membaca atau
+mentokenisasi ulang teks ulasan. Tabel kosakata memetakan id kembali ke kata.
+"""
+import os
+
+import pandas as pd
+
+import cube
+
+# Pola token default CountVectorizer
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+MEASURES = ["term_count"]
+
+
+def tokenize(messages):
+    """Token setiap pesan, satu baris per kemunculan dengan index baris pesan asalnya."""
+    return messages.dropna().astype(str).str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+
+
+def term_ids(tokens):
+    """Id kata: hash 64-bit dari teks kata."""
+    return pd.util.hash_array(tokens.to_numpy(dtype=object)).view("int64")
+
+
+def build_terms(df):
+    """Hitung jumlah kemunculan kata per sel filter dari frame order."""
+    tokens = tokenize(df["review_comment_message"])
+    columns = ["order_purchase_timestamp", "product_category_name", "payment_type", "order_status"]
+    rows = df.loc[tokens.index, columns].reset_index(drop=True)
+    ids = term_ids(tokens)
+    frame = pd.DataFrame({
+        "purchase_day": rows["order_purchase_timestamp"].dt.normalize(),
+        "product_category_name": rows["product_category_name"],
+        "payment_type": rows["payment_type"],
+        "order_status": rows["order_status"],
+        "term_id": ids,
+        "term_count": 1,
+    })
+    keys = cube.FILTER_DIMS + ["term_id"]
+    cells = frame.groupby(keys, observed=True, dropna=False, sort=False)[MEASURES].sum().reset_index()
+    vocabulary = pd.DataFrame({"term_id": ids, "term": tokens.to_numpy(dtype=object)}).drop_duplicates("term_id")
+    return {"cells": cells, "vocabulary": vocabulary.reset_index(drop=True)}
+
+
+def merge_terms(terms, other):
+    """Gabungkan dua indeks kata (misalnya per batch ingest) dengan menjumlahkan sel yang sama."""
+    keys = cube.FILTER_DIMS + ["term_id"]
+    cells = pd.concat([terms["cells"], other["cells"]], ignore_index=True)
+    for col in keys:
+        if isinstance(terms["cells"][col].dtype, pd.CategoricalDtype):
+            cells[col] = cells[col].astype("category")
+    cells = cells.groupby(keys, observed=True, dropna=False, sort=False)[MEASURES].sum().reset_index()
+    vocabulary = pd.concat([terms["vocabulary"], other["vocabulary"]], ignore_index=True).drop_duplicates("term_id")
+    return {"cells": cells, "vocabulary": vocabulary.reset_index(drop=True)}
+
+
+def top_terms(terms, date_range=None, selections=None, k=100, backend=None):
+    """`k` kata paling sering muncul pada filter aktif (urut abjad), setara `CountVectorizer(max_features=k)`."""
+    counts = cube.query(terms["cells"], date_range, selections, by="term_id", measures=MEASURES,
+                        backend=backend)["term_count"]
+    counts = counts[counts > 0]
+    words = terms["vocabulary"].set_index("term_id")["term"].reindex(counts.index)
+    # Frekuensi menurun, seri dipecah menurut abjad
+    ranked = pd.DataFrame({"term": words.to_numpy(), "count": counts.to_numpy()})
+    top = ranked.sort_values(["count", "term"], ascending=[False, True], kind="mergesort").head(k)
+    return sorted(top["term"])
+
+
+def write_terms(terms, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, table in terms.items():
+        table.to_parquet(os.path.join(directory, f"{name}.parquet"), engine="pyarrow", index=False)
+
+
+def read_terms(directory):
+    return {name: pd.read_parquet(os.path.join(directory, f"{name}.parquet"), engine="pyarrow")
+            for name in ["cells", "vocabulary"]}
@@ -0,0 +1,191 @@
+"""Pipeline terjemahan kosakata ulasan, dijalankan offline dengan cache SQLite.
+
+Kosakata ulasan pelanggan diterjemahkan sekali secara batch, lalu disimpan
+di cache SQLite dengan kunci hash dari (bahasa sumber, bahasa tujuan, kata).
+Saat dashboard dirender, WordCloud hanya membaca cache ini (`lookup`) sehingga
+tidak ada panggilan jaringan di jalur render. Kata yang belum ada di cache
+ditampilkan apa adanya.
+
+Isi cache (backend: google, dictionary, identity):
+
+    python dashboard/translate.py --backend google --terms 2000
+    python dashboard/translate.py --backend dictionary --dictionary kamus.csv
+
+Backend `dictionary` membaca CSV dua kolom (kata, terjemahan) atau JSON
+berisi objek {kata: terjemahan} sehingga bisa dipakai di host tanpa internet.
+"""
+import argparse
+import contextlib
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.environ.get("DASHBOARD_TRANSLATION_CACHE", os.path.join(BASE_DIR, "translation_cache.sqlite"))
+SOURCE_LANGUAGE = "auto"
+TARGET_LANGUAGE = "en"
+
+# Batas karakter per permintaan Google Translate
+GOOGLE_MAX_CHARS = 4500
+
+
+def term_key(term, source=SOURCE_LANGUAGE, target=TARGET_LANGUAGE):
+    return hashlib.sha1(f"{source}|{target}|{term}".encode("utf-8")).hexdigest()
+
+
+class IdentityBackend:
+    """Backend stub: kata dikembalikan tanpa diterjemahkan."""
+    name = "identity"
+
+    def translate_batch(self, terms):
+        return list(terms)
+
+
+class DictionaryBackend:
+    """Backend kamus lokal dari file CSV (kata, terjemahan) atau JSON."""
+    name = "dictionary"
+
+    def __init__(self, path):
+        if path.endswith(".json"):
+            with open(path, encoding="utf-8") as f:
+                self.mapping = json.load(f)
+        else:
+            with open(path, encoding="utf-8-sig", newline="") as f:
+                self.mapping = {row[0]: row[1] for row in csv.reader(f) if len(row) >= 2}
+
+    def translate_batch(self, terms):
+        return [self.mapping.get(term, term) for term in terms]
+
+
+class GoogleBackend:
+    """Backend Google Translate (deep_translator); hanya dipakai saat mengisi cache."""
+    name = "google"
+
+    def __init__(self, source=SOURCE_LANGUAGE, target=TARGET_LANGUAGE):
+        from deep_translator import GoogleTranslator
+        self.translator = GoogleTranslator(source=source, target=target)
+
+    def _chunks(self, terms):
+        chunk, size = [], 0
+        for term in terms:
+            if chunk and size + len(term) + 1 > GOOGLE_MAX_CHARS:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(term)
+            size += len(term) + 1
+        if chunk:
+            yield chunk
+
+    def translate_batch(self, terms):
+        translations = []
+        for chunk in self._chunks(terms):
+            # Satu permintaan per chunk: kata dipisah baris baru lalu dipecah kembali
+            lines = self.translator.translate("\n".join(chunk)).split("\n")
+            if len(lines) != len(chunk):
+                lines = self.translator.translate_batch(chunk)
+            translations.extend(line.strip() for line in lines)
+        return translations
+
+
+BACKENDS = {
+    "identity": IdentityBackend,
+    "dictionary": DictionaryBackend,
+    "google": GoogleBackend,
+}
+
+
+def get_backend(name, **options):
+    return BACKENDS[name](**options)
+
+
+class TranslationCache:
+    """Cache terjemahan persisten di SQLite, dikunci dengan hash kata."""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS translations ("
+                    "key TEXT PRIMARY KEY, term TEXT, translation TEXT, backend TEXT)"
+                )
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, terms, source=SOURCE_LANGUAGE, target=TARGET_LANGUAGE):
+        """Terjemahan yang sudah ada di cache, sebagai dict kata -> terjemahan."""
+        if not os.path.exists(self.path):
+            return {}
+        keys = {term_key(term, source, target): term for term in terms}
+        found = {}
+        with self._connect() as conn:
+            key_list = list(keys)
+            for start in range(0, len(key_list), 500):
+                batch = key_list[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(f"SELECT key, translation FROM translations WHERE key IN ({placeholders})", batch)
+                for key, translation in rows:
+                    found[keys[key]] = translation
+        return found
+
+    def put_many(self, translations, backend, source=SOURCE_LANGUAGE, target=TARGET_LANGUAGE):
+        rows = [(term_key(term, source, target), term, translation, backend)
+                for term, translation in translations.items()]
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)", rows)
+
+
+def translate_terms(terms, backend, cache=None, batch_size=500):
+    """Terjemahkan kata yang belum ada di cache secara batch, lalu simpan ke cache."""
+    cache = cache or TranslationCache()
+    cached = cache.get_many(terms)
+    missing = [term for term in dict.fromkeys(terms) if term not in cached]
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        translated = dict(zip(batch, backend.translate_batch(batch)))
+        cache.put_many(translated, backend.name)
+        cached.update(translated)
+    return cached
+
+
+def lookup(terms, cache=None):
+    """Terjemahan dari cache saja (tanpa jaringan); kata yang belum ada dikembalikan apa adanya.
+
+    Mengembalikan (daftar terjemahan sesuai urutan `terms`, jumlah kata yang tidak ada di cache).
+    """
+    cached = (cache or TranslationCache()).get_many(terms)
+    return [cached.get(term, term) for term in terms], sum(term not in cached for term in terms)
+
+
+def review_vocabulary(messages, size):
+    """Kata paling sering muncul di ulasan (tokenisasi sama dengan WordCloud di dashboard)."""
+    from sklearn.feature_extraction.text import CountVectorizer
+    vectorizer = CountVectorizer(max_features=size)
+    vectorizer.fit(messages)
+    return list(vectorizer.get_feature_names_out())
+
+
+if __name__ == "__main__":
+    import ingest
+
+    parser = argparse.ArgumentParser(description="Isi cache terjemahan kosakata ulasan pelanggan.")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="google")
+    parser.add_argument("--dictionary", help="file CSV/JSON untuk backend dictionary")
+    parser.add_argument("--terms", type=int, default=2000, help="jumlah kata paling sering yang diterjemahkan")
+    args = parser.parse_args()
+
+    options = {"path": args.dictionary} if args.backend == "dictionary" else {}
+    backend = get_backend(args.backend, **options)
+
+    ingest.ensure_store()
+    messages = ingest.read_orders(columns=["review_comment_message"])["review_comment_message"].dropna()
+    terms = review_vocabulary(messages, args.terms)
+    translate_terms(terms, backend)
+    print(f"{len(terms)} kata tersimpan di {CACHE_PATH}")
@@ -0,0 +1,49 @@
+"""Skenario filter dan pembanding hasil untuk pemeriksaan kesamaan hasil.
+
+Dipakai oleh `streaming.py --validate` (mode streaming vs mode memory) dan
+`backends.py --verify` (DuckDB/Polars vs pandas).
+"""
+import numpy as np
+import pandas as pd
+
+import ingest
+
+
+def scenarios():
+    """Skenario filter sidebar dari store aktif: {nama: (date_range, selections)}."""
+    start, end = ingest.purchase_date_range()
+    middle = start + (end - start) / 2
+    categories = ingest.read_orders(columns=["product_category_name"])["product_category_name"].dropna().unique()
+    return {
+        "semua data": (None, {}),
+        "setengah rentang tanggal": ((start, middle), {}),
+        "filter kategori & pembayaran": ((middle, end), {
+            "product_category_name": list(categories[:3]),
+            "payment_type": ["credit_card"],
+        }),
+    }
+
+
+def same(expected, actual):
+    """True jika `actual` sama dengan `expected` (dict, DataFrame, Series, list/array, atau skalar).
+
+    Angka dibandingkan dengan toleransi `np.isclose`; tipe data dan jenis
+    index (kategori atau bukan) tidak dibandingkan.
+    """
+    if isinstance(expected, dict):
+        return all(same(expected[key], actual[key]) for key in expected)
+    if isinstance(expected, pd.DataFrame):
+        try:
+            pd.testing.assert_frame_equal(expected, actual, check_dtype=False, check_categorical=False,
+                                          check_index_type=False)
+        except AssertionError:
+            return False
+        return True
+    if isinstance(expected, pd.Series):
+        expected, actual = expected.sort_index(), actual.sort_index()
+        if not expected.index.equals(actual.index):
+            return False
+        return np.allclose(expected.to_numpy(dtype="float64"), actual.to_numpy(dtype="float64"), equal_nan=True)
+    if isinstance(expected, (list, np.ndarray)):
+        return np.array_equal(np.asarray(expected), np.asarray(actual))
+    return bool(np.isclose(expected, actual, equal_nan=True))
@@ -0,0 +1,24 @@
+"""Modul halaman dashboard, satu modul per halaman.
+
+Modul halaman baru diimpor saat halamannya pertama kali dibuka, sehingga
+dependensi berat milik satu halaman (folium untuk peta, wordcloud, seaborn)
+tidak ikut dimuat saat proses Streamlit mulai atau saat halaman lain
+dirender. Setiap modul menyediakan `render(page)`; `page` berisi status
+rerun dari `dashboard.py` (filter aktif, cube, fungsi bantu render).
+Waktu impor per halaman dapat diukur dengan `python benchmarks/imports.py`.
+"""
+import importlib
+
+# Label di selectbox navigasi -> nama modul halaman
+PAGES = {
+    "🚚 Pengiriman": "delivery",
+    "👤 Pelanggan": "customers",
+    "🛍️ Produk dan Penjualan": "products",
+    "💳 Pembayaran": "payments",
+    "📈 Analisis RFM": "segments",
+}
+
+
+def load(page):
+    """Modul halaman untuk label `page`, diimpor saat pertama kali dibutuhkan."""
+    return importlib.import_module(f"{__name__}.{PAGES[page]}")
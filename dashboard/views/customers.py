@@ -0,0 +1,152 @@
+"""Halaman Pelanggan: transaksi, sebaran lokasi, dan kepuasan berdasarkan ulasan."""
+import hashlib
+
+import folium
+import seaborn as sns
+import streamlit as st
+from folium.plugins import HeatMap
+from wordcloud import WordCloud
+
+import analytics
+import config
+import figures
+import loaders
+import rollup
+import translate
+
+
+def render(page):
+    st.header("Analisis Pelanggan")
+    st.write("Menampilkan kepuasan pelanggan berdasarkan ulasan dan tren transaksi.")
+    tab1, tab2 = st.tabs(['Transaksi', 'Kepuasan Pelanggan'])
+    with tab1:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            with st.container():
+                # Hitung median jumlah order per pelanggan
+                median_orders = analytics.median_orders_per_customer(loaders.load_sketches(page.data_version), **page.view)
+                st.metric(label="Median Order per Pelanggan", value=f"{median_orders:.2f}")
+        
+        with col2:
+            with st.container():
+                # Hitung jumlah pelanggan baru (order pertama) dan lama setiap bulan
+                customer_trend = analytics.customer_trend(loaders.load_sketches(page.data_version), **page.view)
+
+                # Hitung total pelanggan baru dan lama
+                total_new_customers = customer_trend["new_customers"].sum()
+                total_existing_customers = customer_trend["existing_customers"].sum()
+
+                st.metric(label="Jumlah Pelanggan Baru", value=f"{total_new_customers:,}")
+        
+        with col3:
+            with st.container():
+                st.metric(label="Jumlah Pelanggan Lama", value=f"{total_existing_customers:,}")
+
+        with st.container():
+            # Kelompokkan lokasi pelanggan ke sel grid sesuai zoom peta, lalu hitung jumlah transaksi di setiap sel
+            customer_geo = analytics.customer_heatmap(page.kpi_cube, zoom=5, **page.view)
+
+            # Buat peta dengan pusat di Brasil
+            m = folium.Map(location=[-14.2350, -51.9253], zoom_start=5, control_scale=True)
+
+            # Tambahkan heatmap berdasarkan jumlah transaksi di setiap lokasi
+            HeatMap(data=customer_geo, 
+                    radius=10, blur=15, max_zoom=1).add_to(m)
+
+            # Tambahkan Judul ke Peta
+            title_html = '''
+                <h3 align="center" style="font-size:16px"><b>Peta Sebaran Pelanggan Berdasarkan Jumlah Transaksi</b></h3>
+            '''
+            m.get_root().html.add_child(folium.Element(title_html))
+
+            # Tambahkan Legend (Keterangan)
+            legend_html = '''
+            <div style="
+                position: fixed;
+                bottom: 20px; left: 20px; width: 300px; height: 100px; 
+                background-color: white; z-index:9999; font-size:14px;
+                border-radius: 5px; padding: 10px; box-shadow: 2px 2px 5px rgba(0,0,0,0.3);">
+                <b>Legenda</b><br>
+                🔴 = Kepadatan transaksi tinggi<br>
+                🟡 = Kepadatan transaksi sedang<br>
+                🔵 = Kepadatan transaksi rendah
+            </div>
+            '''
+            m.get_root().html.add_child(folium.Element(legend_html))
+
+            # Tampilkan di Streamlit
+            st.subheader("Peta Sebaran Pelanggan Berdasarkan Jumlah Transaksi")
+            page.show_map("customer_map", m)
+
+    with tab2:
+        col1, col2 = st.columns(2)
+        with col1:
+            with st.container():
+                # Hitung rata-rata review score per hari (tanggal review) dan rata-rata keseluruhan
+                # Resolusi (hari/minggu/bulan) dipilih dari rentang tanggal, titiknya dibatasi anggaran tren
+                review_trend, level, overall_mean = analytics.review_trend(
+                    loaders.load_rollups(page.data_version), page.kpi_cube, points=config.TREND_POINTS, **page.view)
+                title = f"Tren Kepuasan Pelanggan Berdasarkan Ulasan (Per {rollup.LEVEL_LABELS[level]})"
+
+                # Tampilkan di Streamlit
+                st.subheader(title)
+
+                # Plot Line Chart di Streamlit
+                def draw():
+                    fig, ax = figures.subplots(figsize=(15, 6))
+                    sns.lineplot(x=review_trend.index, y=review_trend.values, marker='o', markersize=4, color='blue',
+                                 label=f'Mean Review Score per {level.title()}', ax=ax)
+
+                    # Tambahkan garis rata-rata keseluruhan
+                    ax.axhline(y=overall_mean, color='red', linestyle='dashed', label='Overall Mean Review Score')
+
+                    # Tambahkan label
+                    ax.set_xlabel("Tanggal")
+                    ax.set_ylabel("Review Score")
+                    ax.set_title(title)
+                    fig.autofmt_xdate(rotation=45)
+                    ax.legend()
+                    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+                    return fig
+
+                # Tampilkan plot di Streamlit
+                page.show_figure("review_trend", draw)
+
+        with col2:
+            with st.container():
+                # Hitung rata-rata rating pelanggan
+                average_rating = overall_mean
+
+                # Tampilkan metrik di Streamlit
+                st.metric(label="Rata-rata Rating Pelanggan", value=f"{average_rating:.2f}")
+
+        with st.container():
+            # Ambil 100 kata paling sering muncul di ulasan
+            top_terms = analytics.review_terms(loaders.load_terms(page.data_version), size=100, **page.view)
+
+            # Pastikan ada ulasan yang tidak kosong
+            if top_terms:
+                # Terjemahkan kata-kata paling sering muncul dari cache terjemahan (tanpa jaringan)
+                translated_terms, untranslated = translate.lookup(top_terms)
+                translated_text = " ".join(translated_terms)
+
+                # Tampilkan di Streamlit
+                st.subheader("WordCloud dari Ulasan Pelanggan (Diterjemahkan ke Bahasa Inggris)")
+
+                def draw():
+                    # Layout WordCloud ikut di-cache bersama gambarnya
+                    wordcloud = WordCloud(width=800, height=400, background_color="white", colormap="viridis", max_words=200).generate(translated_text)
+                    fig, ax = figures.subplots(figsize=(10, 5))
+                    ax.imshow(wordcloud, interpolation="bilinear")
+                    ax.axis("off")
+                    ax.set_title("WordCloud of Customer Reviews (Translated to English)")
+
+                    return fig
+                # Terjemahan ikut menjadi kunci cache gambar: WordCloud dirender ulang setelah cache terjemahan terisi
+                page.show_figure("wordcloud", draw, extra=hashlib.sha1(translated_text.encode("utf-8")).hexdigest())
+                if untranslated:
+                    st.caption(f"{untranslated} kata belum ada di cache terjemahan dan ditampilkan tanpa diterjemahkan. "
+                               "Jalankan `python dashboard/translate.py` untuk mengisi cache.")
+            else:
+                st.warning("Tidak ada data review yang tersedia untuk WordCloud.")
@@ -0,0 +1,199 @@
+"""Halaman Pengiriman: waktu pengiriman, keterlambatan, dan sebarannya."""
+import folium
+import seaborn as sns
+import streamlit as st
+from folium.plugins import HeatMap
+
+import analytics
+import figures
+import loaders
+
+
+def render(page):
+    st.header("Analisis Pengiriman")
+    st.write("Menampilkan analisis keterlambatan pengiriman, distribusi wilayah, dan hubungan dengan rating pelanggan.")
+    
+    tab1, tab2 = st.tabs(['Waktu Pengiriman', 'Keterlambatan Pengiriman'])
+    with tab1:
+        col1, col2, col3 = st.columns(3)
+        st.subheader("Persebaran Waktu Pengiriman")
+
+        # Rata-rata waktu pengiriman, total pesanan, rata-rata nilai pesanan, dan persentase keterlambatan
+        delivery_kpis = analytics.delivery_kpis(page.kpi_cube, loaders.load_sketches(page.data_version), **page.view)
+
+        with col1:
+            with st.container():
+                st.metric(label="Rata-rata Waktu Pengiriman", value=f"{delivery_kpis['average_delivery_days']:.2f} hari")
+        
+        with col2:
+            with st.container():
+                st.metric(label="Total Pesanan", value=f"{delivery_kpis['total_orders']:,}")
+        
+        with col3:
+            with st.container():
+                st.metric(label="Rata-rata Nilai Pesanan", value=f"{delivery_kpis['average_order_value']:,.2f} RBL")
+
+        with st.container():
+                
+            ## Visualisasi waktu pengiriman
+            # Kelompokkan lokasi pelanggan ke sel grid sesuai zoom peta, lalu hitung rata-rata durasi pengiriman per sel
+            customer_geo_delivery = analytics.delivery_heatmap(page.kpi_cube, zoom=5, **page.view)
+
+            # Buat peta dengan pusat di Brasil
+            m = folium.Map(location=[-14.2350, -51.9253], zoom_start=5, control_scale=True)  # Brasil sebagai pusat peta
+
+            # Tambahkan heatmap berdasarkan rata-rata waktu pengiriman di setiap lokasi
+            HeatMap(
+                data=customer_geo_delivery, 
+                radius=5, blur=12, max_zoom=5,
+                gradient={0.2: "blue", 0.4: "green", 0.6: "yellow", 0.8: "orange", 1: "red"}  # Custom warna
+            ).add_to(m)
+
+            # Tampilkan peta
+            page.show_map("delivery_map", m)
+
+            with st.expander("ℹ️ Keterangan Peta"):
+                st.write("Peta ini menunjukkan rata-rata waktu pengiriman berdasarkan lokasi pelanggan. Area dengan warna lebih hijau menunjukkan waktu pengiriman yang lebih cepat, sedangkan area dengan warna lebih biru atau putih menunjukkan waktu pengiriman yang lebih lama. Pola ini dapat membantu memahami efektivitas logistik di berbagai wilayah.")
+
+    with tab2:
+        col1, col2, col3 = st.columns([1, 0.05, 1])
+        with col1:
+            # Gunakan st.container() dengan shadow melalui CSS
+            with st.container():
+                st.metric(label="Persentase Keterlambatan", value=f"{delivery_kpis['late_percentage']:.2f}%")
+
+
+            with st.container():
+                # Seller dengan persentase keterlambatan tertinggi di antara seller dengan lebih dari 100 order
+                top_sellers = analytics.seller_late_ranking(page.kpi_cube, loaders.load_dimension("sellers", page.data_version),
+                                                            min_orders=100, top=5, **page.view)
+
+                # Tampilkan di Streamlit
+                st.subheader("Top 5 Seller dengan Keterlambatan Pengiriman Tertinggi")
+
+                # Plot Bar Chart di Streamlit
+                def draw():
+                    fig, ax = figures.subplots(figsize=(6, 9))
+                    sns.barplot(x="late_percentage", y="seller_id", data=top_sellers, palette="Reds_r", ax=ax)
+
+                    # Tambahkan label
+                    ax.set_xlabel("Persentase Keterlambatan (%)")
+                    ax.set_ylabel("Seller ID")
+                    ax.set_title("Top 5 Seller dengan Keterlambatan Pengiriman Tertinggi")
+                    ax.grid(axis="x", linestyle="--", alpha=0.7)
+
+                    return fig
+
+                # Tampilkan plot di Streamlit
+                page.show_figure("seller_late", draw)
+
+            with st.container():
+                # Histogram selisih tanggal terima dan estimasi (hari) dan kurva KDE-nya, dari bin halus yang dihitung saat ingest
+                delay_counts, delay_edges, delay_kde = analytics.delay_histogram(loaders.load_bins(page.data_version), bins=30, **page.view)
+                st.subheader("Distribusi Keterlambatan")
+                def draw():
+                    fig, ax = figures.subplots()
+                    sns.histplot(x=(delay_edges[:-1] + delay_edges[1:]) / 2, weights=delay_counts, bins=delay_edges.tolist(),
+                                 color="C0", ax=ax)
+                    ax.plot(*delay_kde, color="C0")
+                    return fig
+                page.show_figure("delay_histogram", draw)
+        
+        with col2:
+            st.markdown('<div class="column-divider"></div>', unsafe_allow_html=True)
+
+        with col3:
+            with st.container():
+                # Hitung rata-rata durasi pengiriman berdasarkan review score
+                review_delivery_avg = analytics.review_delivery(page.kpi_cube, **page.view)
+
+                # Tampilkan di Streamlit
+                st.subheader("Rata-rata Durasi Pengiriman untuk Setiap Review Score")
+
+                # Plot Bar Chart di Streamlit
+                def draw():
+                    fig, ax = figures.subplots(figsize=(10, 5))
+                    sns.barplot(x=review_delivery_avg.index, y=review_delivery_avg.values, palette="coolwarm", ax=ax)
+
+                    # Tambahkan label
+                    ax.set_xlabel("Review Score")
+                    ax.set_ylabel("Rata-rata Durasi Pengiriman (Hari)")
+                    ax.set_title("Rata-rata Durasi Pengiriman untuk Setiap Review Score")
+                    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+                    return fig
+
+                # Tampilkan plot di Streamlit
+                page.show_figure("review_delivery", draw)
+            
+            with st.container():
+                # Hitung persentase keterlambatan per hari pengiriman (urut Senin-Minggu)
+                late_by_day = analytics.late_by_day(page.kpi_cube, **page.view)
+
+                # Tampilkan di Streamlit
+                st.subheader("Persentase Keterlambatan Pengiriman per Hari")
+
+                # Plot Bar Chart di Streamlit
+                def draw():
+                    fig, ax = figures.subplots(figsize=(10, 5))
+                    sns.barplot(x="delivery_day", y="late_percentage", data=late_by_day, palette="Blues_r", ax=ax)
+
+                    # Tambahkan label
+                    ax.set_xlabel("Hari dalam Seminggu")
+                    ax.set_ylabel("Persentase Keterlambatan (%)")
+                    ax.set_title("Persentase Keterlambatan Pengiriman per Hari")
+                    ax.grid(axis="y", linestyle="--", alpha=0.7)
+
+                    return fig
+
+                # Tampilkan plot di Streamlit
+                page.show_figure("late_by_day", draw)
+
+            with st.container():
+                # Buat dataframe agregasi rata-rata rating berdasarkan keterlambatan
+                late_review_avg = analytics.late_review(page.kpi_cube, **page.view)
+
+                # Tampilkan di Streamlit
+                st.subheader("Pengaruh Keterlambatan terhadap Rating Ulasan")
+
+                # Plot Bar Chart di Streamlit
+                def draw():
+                    fig, ax = figures.subplots(figsize=(8, 5))
+                    sns.barplot(x=late_review_avg["late_delivery"], y=late_review_avg["review_score"], palette="coolwarm", ax=ax)
+
+                    # Tambahkan label
+                    ax.set_xticks([0, 1])
+                    ax.set_xticklabels(["Tepat Waktu", "Terlambat"])
+                    ax.set_xlabel("Status Pengiriman")
+                    ax.set_ylabel("Rata-rata Review Score")
+                    ax.set_title("Pengaruh Keterlambatan terhadap Rating Ulasan")
+                    ax.set_ylim(0, 5)  # Batas rating 1-5
+                    ax.grid(axis="y", linestyle="--", alpha=0.7)
+
+                    return fig
+
+                # Tampilkan plot di Streamlit
+                page.show_figure("late_review", draw)
+
+        with st.container():
+            # Hitung keterlambatan berdasarkan kategori ongkos kirim (0-10, 10-20, 20-50, 50-100, 100+)
+            freight_late = analytics.freight_late(page.kpi_cube, **page.view)
+
+            # Tampilkan di Streamlit
+            st.subheader("Hubungan antara Ongkos Kirim dan Tingkat Keterlambatan")
+
+            # Plot Line Chart di Streamlit
+            def draw():
+                fig, ax = figures.subplots(figsize=(10, 5))
+                sns.lineplot(x=freight_late["freight_category"], y=freight_late["late_percentage"], marker="o", linestyle="-", color="red", ax=ax)
+
+                # Tambahkan label
+                ax.set_xlabel("Kategori Ongkos Kirim (BRL)")
+                ax.set_ylabel("Persentase Keterlambatan (%)")
+                ax.set_title("Hubungan antara Ongkos Kirim dan Tingkat Keterlambatan")
+                ax.grid(axis="y", linestyle="--", alpha=0.7)
+
+                return fig
+
+            # Tampilkan plot di Streamlit
+            page.show_figure("freight_late", draw)
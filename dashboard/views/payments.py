@@ -0,0 +1,73 @@
+"""Halaman Pembayaran: metode pembayaran, waktu proses, dan pembatalan."""
+import seaborn as sns
+import streamlit as st
+
+import analytics
+import figures
+
+
+def render(page):
+    st.header("Analisis Pembayaran")
+    st.write("Menampilkan metode pembayaran paling sering digunakan.")
+
+    # Jumlah pesanan, pembatalan, dan rata-rata durasi proses pembayaran (menit) per metode
+    payment_stats = analytics.payment_stats(page.kpi_cube, **page.view)
+
+    # Buat dictionary untuk memastikan metrik tetap ada meskipun ada metode pembayaran yang hilang
+    payment_methods = ["credit_card", "boleto", "voucher", "debit_card"]
+    avg_times = payment_stats["payment_processing_time"].reindex(payment_methods, fill_value=0).to_dict()
+
+    # Buat 4 kolom untuk menampilkan metrik secara bersebelahan
+    st.subheader("Rata-rata Waktu Proses Pembayaran Berdasarkan Metode Pembayaran")
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(label="Credit Card", value=f"{avg_times['credit_card']:.2f} menit")
+
+    with col2:
+        st.metric(label="Boleto", value=f"{avg_times['boleto']:.2f} menit")
+
+    with col3:
+        st.metric(label="Voucher", value=f"{avg_times['voucher']:.2f} menit")
+
+    with col4:
+        st.metric(label="Debit Card", value=f"{avg_times['debit_card']:.2f} menit")
+
+
+    # Hitung jumlah penggunaan setiap metode pembayaran
+    payment_methods = payment_stats["total_orders"].sort_values(ascending=False)
+
+    # Persentase pembatalan per metode pembayaran
+    cancellation_rate = payment_stats.rename_axis("payment_type").reset_index()
+
+    # Buat dua kolom di Streamlit
+    st.subheader("Distribusi Metode Pembayaran & Tingkat Pembatalan")
+
+    col1, col2 = st.columns(2)
+
+    # Visualisasi: Bar Chart Metode Pembayaran
+    with col1:
+        st.subheader("Distribusi Metode Pembayaran")
+        def draw():
+            fig, ax = figures.subplots(figsize=(6, 5))
+            sns.barplot(x=payment_methods.index, y=payment_methods.values, palette="pastel", ax=ax)
+            ax.set_xlabel("Metode Pembayaran")
+            ax.set_ylabel("Jumlah Penggunaan")
+            ax.set_title("Metode Pembayaran yang Paling Sering Digunakan")
+            ax.grid(axis='y', linestyle='--', alpha=0.7)
+            return fig
+        page.show_figure("payment_methods", draw)
+
+    # Visualisasi: Tingkat Pembatalan per Metode Pembayaran
+    with col2:
+        st.subheader("Tingkat Pembatalan Pesanan")
+        def draw():
+            fig, ax = figures.subplots(figsize=(6, 5))
+            sns.barplot(x="payment_type", y="cancellation_rate", data=cancellation_rate, palette="coolwarm", ax=ax)
+            ax.set_xlabel("Metode Pembayaran")
+            ax.set_ylabel("Persentase Pembatalan (%)")
+            ax.set_title("Tingkat Pembatalan Berdasarkan Metode Pembayaran")
+            ax.grid(axis="y", linestyle="--", alpha=0.7)
+            return fig
+        page.show_figure("cancellation_rate", draw)
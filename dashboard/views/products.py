@@ -0,0 +1,141 @@
+"""Halaman Produk dan Penjualan: kategori, harga, dan pola waktu pembelian."""
+import seaborn as sns
+import streamlit as st
+
+import analytics
+import config
+import figures
+import loaders
+import rollup
+
+
+def render(page):
+    st.header("Analisis Produk dan Penjualan")
+    st.write("Menampilkan produk terlaris dan pola pembelian pelanggan.")
+    
+    # Hitung jumlah total produk yang terjual berdasarkan kategori
+    product_sales = analytics.product_sales(page.kpi_cube, **page.view)
+
+    # Ambil 10 kategori dengan penjualan tertinggi
+    top_product_sales = product_sales.nlargest(10)
+
+    # Ambil 10 kategori dengan penjualan terendah
+    bottom_product_sales = product_sales.nsmallest(10)
+
+    col1, col2 = st.columns(2)
+
+    # Visualisasi: Kategori dengan Penjualan Tertinggi
+    with col1:
+        st.subheader("Penjualan Tertinggi")
+        def draw():
+            fig, ax = figures.subplots(figsize=(6, 6))
+            sns.barplot(x=top_product_sales.values, y=top_product_sales.index, palette="crest", ax=ax)
+            ax.set_xlabel("Jumlah Produk Terjual")
+            ax.set_ylabel("Kategori Produk")
+            ax.set_title("10 Kategori Produk dengan Penjualan Tertinggi")
+            ax.grid(axis='x', linestyle='--', alpha=0.7)
+            return fig
+        page.show_figure("top_categories", draw)
+
+    # Visualisasi: Kategori dengan Penjualan Terendah
+    with col2:
+        st.subheader("Penjualan Terendah")
+        def draw():
+            fig, ax = figures.subplots(figsize=(6, 6))
+            sns.barplot(x=bottom_product_sales.values, y=bottom_product_sales.index, palette="flare", ax=ax)
+            ax.set_xlabel("Jumlah Produk Terjual")
+            ax.set_ylabel("Kategori Produk")
+            ax.set_title("10 Kategori Produk dengan Penjualan Terendah")
+            ax.grid(axis='x', linestyle='--', alpha=0.7)
+            return fig
+        page.show_figure("bottom_categories", draw)
+
+    # Hitung rata-rata harga produk dan rata-rata produk terjual per hari
+    product_kpis = analytics.product_kpis(page.kpi_cube, **page.view)
+
+    # Buat dua kolom di Streamlit
+    st.subheader("Distribusi Harga Produk & Rata-rata Harga Produk")
+    col1, col2 = st.columns([2, 1])  # Kolom kiri lebih besar untuk plot
+
+    # Visualisasi: Distribusi Harga Produk
+    with col1:
+        # Histogram harga dan kurva KDE-nya, dari bin halus yang dihitung saat ingest
+        price_counts, price_edges, price_kde = analytics.price_histogram(loaders.load_bins(page.data_version), bins=100, **page.view)
+        st.subheader("Distribusi Harga Produk")
+        def draw():
+            fig, ax = figures.subplots(figsize=(8, 6))
+            sns.histplot(x=(price_edges[:-1] + price_edges[1:]) / 2, weights=price_counts, bins=price_edges.tolist(),
+                         color="blue", ax=ax)
+            ax.plot(*price_kde, color="blue")
+            ax.set_xlabel("Harga Produk (BRL)")
+            ax.set_ylabel("Jumlah Produk Terjual")
+            ax.set_title("Distribusi Harga Produk yang Paling Sering Dibeli")
+            ax.grid(axis='y', linestyle='--', alpha=0.7)
+            return fig
+        page.show_figure("price_histogram", draw)
+
+    # Metrik Rata-rata Harga Produk
+    with col2:
+        st.subheader("Rata-rata Harga Produk")
+        st.metric(label="Rata-rata Harga Produk", value=f"{product_kpis['average_price']:.2f} RBL")
+
+        with st.container():
+            st.metric(label="Rata-rata Produk Terjual per Hari", value=f"{product_kpis['average_daily_sales']:.2f}")
+
+
+    # Hitung jumlah pesanan per jam
+    hourly_orders = analytics.hourly_orders(page.kpi_cube, **page.view)
+
+    # Hitung jumlah pesanan per hari dalam seminggu (urut Senin-Minggu)
+    daily_orders = analytics.daily_orders(page.kpi_cube, **page.view)
+
+    # Buat dua kolom di Streamlit
+    st.subheader("Pola Pembelian Pelanggan Berdasarkan Waktu")
+    col1, col2 = st.columns(2)
+
+    # Plot Line Chart (Pesanan per Jam)
+    with col1:
+        st.subheader("Pesanan per Jam")
+        def draw():
+            fig, ax = figures.subplots(figsize=(6, 5))
+            sns.lineplot(x="purchase_hour", y="order_id", data=hourly_orders, marker="o", linestyle="-", color="blue", ax=ax)
+            ax.set_xlabel("Jam dalam Sehari")
+            ax.set_ylabel("Jumlah Pesanan")
+            ax.set_title("Pola Pembelian Pelanggan Berdasarkan Jam dalam Sehari")
+            ax.grid(axis="y", linestyle="--", alpha=0.7)
+            ax.set_xticks(range(0, 24))  # Pastikan semua jam tampil
+            return fig
+        page.show_figure("hourly_orders", draw)
+
+    # Plot Bar Chart (Pesanan per Hari)
+    with col2:
+        st.subheader("Pesanan per Hari")
+        def draw():
+            fig, ax = figures.subplots(figsize=(6, 5))
+            sns.barplot(x="purchase_day", y="order_id", data=daily_orders, palette="Blues_r", ax=ax)
+            ax.set_xlabel("Hari dalam Seminggu")
+            ax.set_ylabel("Jumlah Pesanan")
+            ax.set_title("Pola Pembelian Pelanggan Berdasarkan Hari dalam Seminggu")
+            ax.grid(axis="y", linestyle="--", alpha=0.7)
+            return fig
+        page.show_figure("daily_orders", draw)
+
+    # Tren jumlah pesanan dan pendapatan; resolusi dipilih dari rentang tanggal, titiknya dibatasi anggaran tren
+    sales_trend, level = analytics.sales_trend(loaders.load_rollups(page.data_version), points=config.TREND_POINTS,
+                                               **page.view)
+    title = f"Tren Jumlah Pesanan dan Pendapatan (Per {rollup.LEVEL_LABELS[level]})"
+    st.subheader(title)
+    def draw():
+        fig, ax = figures.subplots(figsize=(15, 5))
+        ax.plot(sales_trend.index, sales_trend["order_count"], color="blue", label="Jumlah Pesanan")
+        ax.set_xlabel("Tanggal Pembelian")
+        ax.set_ylabel("Jumlah Pesanan")
+        revenue_ax = ax.twinx()
+        revenue_ax.plot(sales_trend.index, sales_trend["payment_value_sum"], color="orange", label="Pendapatan (BRL)")
+        revenue_ax.set_ylabel("Pendapatan (BRL)")
+        ax.set_title(title)
+        ax.grid(axis="y", linestyle="--", alpha=0.7)
+        fig.legend(loc="upper left")
+        fig.autofmt_xdate(rotation=45)
+        return fig
+    page.show_figure("sales_trend", draw)
@@ -0,0 +1,55 @@
+"""Halaman Analisis RFM: segmentasi pelanggan."""
+import seaborn as sns
+import streamlit as st
+
+import analytics
+import figures
+import loaders
+
+
+def render(page):
+    st.header("Analisis RFM")
+    st.write("Menampilkan segmentasi pelanggan berdasarkan analisis RFM.")
+
+    # State per pelanggan (pembelian terakhir, jumlah transaksi, total belanja).
+    # Tanpa filter aktif, state seluruh riwayat yang disimpan saat ingest langsung dipakai.
+    rfm_state = loaders.load_rfm_state(page.data_version) if page.selected_date == (page.min_date, page.max_date) and not any(page.selections.values()) else None
+
+    # Hitung skor RFM lalu jumlah pelanggan per segmen
+    segment_counts = analytics.rfm_segments(page.aggregate, state=rfm_state)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(label="Total Champions", value=f"{segment_counts.get('Champions', 0):,}")
+    with col2:
+        st.metric(label="Total Loyal Customers", value=f"{segment_counts.get('Loyal', 0):,}")
+    with col3:
+        st.metric(label="Total At Risk", value=f"{segment_counts.get('At Risk', 0):,}")
+    with col4:
+        st.metric(label="Total Lost Customers", value=f"{segment_counts.get('Lost Customers', 0):,}")
+
+    # Buat dua kolom untuk visualisasi
+    st.subheader("Distribusi Segmen Pelanggan Berdasarkan RFM")
+
+    col1, col2 = st.columns(2)
+
+    # Visualisasi Bar Chart
+    with col1:
+        def draw():
+            fig, ax = figures.subplots(figsize=(8, 5))
+            sns.barplot(x=segment_counts.index, y=segment_counts.values, palette="coolwarm", ax=ax)
+            ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha="right")
+            ax.set_xlabel("Customer Segment")
+            ax.set_ylabel("Number of Customers")
+            ax.set_title("Customer Segmentation based on RFM Analysis")
+            ax.grid(axis="y", linestyle="--", alpha=0.7)
+            return fig
+        page.show_figure("rfm_segments_bar", draw)
+
+    # Visualisasi Pie Chart
+    with col2:
+        def draw():
+            fig, ax = figures.subplots(figsize=(5, 5))
+            ax.pie(segment_counts, labels=segment_counts.index, autopct='%1.1f%%', colors=sns.color_palette("coolwarm", len(segment_counts)))
+            ax.set_title("Customer Segmentation Distribution")
+            return fig
+        page.show_figure("rfm_segments_pie", draw)
@@ -0,0 +1,15 @@
+"""Fixture bersama: modul dashboard diimpor seperti saat `streamlit run dashboard/dashboard.py`."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "dashboard"))
+
+
+@pytest.fixture(scope="session")
+def store():
+    """Store Parquet dari data sampel bawaan (`dashboard/main_data.csv`), dibangun bila belum ada."""
+    import ingest
+    ingest.ensure_store()
+    return ingest.data_version()
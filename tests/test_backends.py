@@ -0,0 +1,10 @@
+import pytest
+
+import backends
+import validation
+
+
+@pytest.mark.parametrize("name", ["duckdb", "polars"])
+def test_verify_matches_pandas(store, name):
+    pytest.importorskip(name)
+    assert backends.verify(validation.scenarios(), [name])
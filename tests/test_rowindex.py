@@ -0,0 +1,11 @@
+import pytest
+
+import datacache
+import rowindex
+
+
+@pytest.mark.parametrize("max_bytes", [32 * 1024 * 1024, 64 * 1024])
+def test_verify_matches_compiled_mask(store, max_bytes):
+    index = rowindex.RowIndex(datacache.MappedOrders.open(store), max_bytes)
+    assert rowindex.verify(index, 100)
+    assert index.size <= max_bytes
@@ -0,0 +1,10 @@
+import streaming
+import validation
+
+
+def test_validate_matches_memory_mode(store):
+    assert streaming.validate(validation.scenarios())
+
+
+def test_validate_with_small_batches(store):
+    assert streaming.validate(validation.scenarios(), batch_rows=250)